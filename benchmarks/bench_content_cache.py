@@ -0,0 +1,39 @@
+"""
+Data-point extraction with and without the response body cache, on a capture
+where a share of the responses repeat a few polling/config bodies.
+
+    python -m benchmarks.bench_content_cache [entries] [repeated_share]
+"""
+import random
+import sys
+import time
+
+from benchmarks.synthetic_capture import build_capture
+from traffic_analizator.extractor import TrafficExtractor
+
+
+def main(entries: int = 5000, repeated_share: float = 0.6) -> None:
+    har = build_capture(entries, items_per_response=20)
+    rng = random.Random(3)
+    bodies = [entry.response.content for entry in har.log.entries[:8]]
+    for entry in har.log.entries[8:]:
+        if rng.random() < repeated_share:
+            entry.response.content = rng.choice(bodies).model_copy()
+
+    timings = {}
+    for size in (0, 256):
+        extractor = TrafficExtractor(har, content_cache_size=size)
+        started = time.perf_counter()
+        points = extractor.extract_all()
+        timings[size] = time.perf_counter() - started
+        if extractor.content_cache is not None:
+            print(extractor.content_cache.stats.to_str())
+        print(f"cache size {size}: {timings[size]:.2f}s, {len(points[1])} response points")
+    print(f"speedup: {timings[0] / timings[256]:.2f}x")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.6,
+    )
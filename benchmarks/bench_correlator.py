@@ -0,0 +1,45 @@
+"""
+CONTAINS-match lookup: linear scan over all response points vs Aho–Corasick.
+
+    python -m benchmarks.bench_correlator [entries]
+"""
+import sys
+import time
+
+from benchmarks.synthetic_capture import build_capture
+from traffic_analizator.correlator import TrafficCorrelator
+from traffic_analizator.extractor import TrafficExtractor
+
+
+def _linear_contains(req_point, response_points, min_value_length):
+    for resp_point in response_points:
+        if resp_point.response_index < req_point.request_index \
+                and len(resp_point.value) >= min_value_length \
+                and resp_point.value in req_point.value and resp_point.value != req_point.value:
+            return resp_point
+    return None
+
+
+def main(entries: int = 5000) -> None:
+    har = build_capture(entries)
+    request_points, response_points = TrafficExtractor(har).extract_all()
+    correlator = TrafficCorrelator()
+    queries = [p for p in request_points if len(p.value) >= correlator.min_value_length]
+    print(f"entries: {entries}, request points: {len(queries)}, response points: {len(response_points)}")
+
+    started = time.perf_counter()
+    contains_index = correlator._build_contains_index(request_points, response_points)
+    built = time.perf_counter() - started
+    found = sum(correlator._find_contains_source(p, contains_index) is not None for p in queries)
+    automaton = time.perf_counter() - started
+    print(f"aho-corasick: {automaton:.2f}s (build {built:.2f}s), {found} matches")
+
+    sample = queries[::max(1, len(queries) // 100)]
+    started = time.perf_counter()
+    linear_found = sum(_linear_contains(p, response_points, correlator.min_value_length) is not None for p in sample)
+    linear = (time.perf_counter() - started) * len(queries) / len(sample)
+    print(f"linear scan:  ~{linear:.2f}s (extrapolated from {len(sample)} lookups, {linear_found} matches)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,53 @@
+"""
+Correlation on a capture whose requests echo response values percent-encoded,
+Base64-wrapped and HTML-escaped: matches per encoding and search time.
+
+    python -m benchmarks.bench_encoded [entries]
+"""
+import base64
+import html
+import random
+import sys
+import time
+from collections import Counter
+from urllib.parse import quote
+
+from benchmarks.synthetic_capture import build_capture
+from traffic_analizator.correlator import TrafficCorrelator
+from traffic_analizator.extractor import TrafficExtractor
+from traffic_builder.har_parsers.pydantic_models import Record
+
+
+ENCODERS = (
+    lambda value: quote(value, safe=""),
+    lambda value: base64.b64encode(value.encode()).decode(),
+    html.escape,
+)
+
+
+def main(entries: int = 5000) -> None:
+    har = build_capture(entries)
+    request_points, response_points = TrafficExtractor(har).extract_all()
+    rng = random.Random(7)
+
+    # Sampled response values get characters every encoding changes; the next request echoes them encoded.
+    tokens = [p for p in response_points if len(p.value) >= 12 and p.value.isalnum()]
+    for index, point in enumerate(rng.sample(tokens, min(len(tokens), 3000))):
+        point.value = f"{point.value}/+&{index}"
+        target = har.log.entries[min(len(har.log.entries) - 1, point.response_index + 1)]
+        encode = ENCODERS[index % len(ENCODERS)]
+        target.request.headers.append(Record(name=f"X-Echo-{index}", value=encode(point.value)))
+
+    request_points, _ = TrafficExtractor(har).extract_all()
+    started = time.perf_counter()
+    correlations, unresolved = TrafficCorrelator().find_correlations(request_points, response_points)
+    seconds = time.perf_counter() - started
+
+    print(f"entries: {entries}, request points: {len(request_points)}, response points: {len(response_points)}")
+    encodings = Counter(c.encoding.value for c in correlations if c.encoding is not None)
+    print(f"correlations: {len(correlations)}, by encoding: {dict(sorted(encodings.items()))}, unresolved: {len(unresolved)}")
+    print(f"search: {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,36 @@
+"""
+Sequential vs process-pool data-point extraction on a capture with large JSON
+API responses.
+
+    python -m benchmarks.bench_extractor [entries] [items_per_response] [workers]
+"""
+import os
+import sys
+import time
+
+from benchmarks.synthetic_capture import build_capture
+from traffic_analizator.extractor import TrafficExtractor
+
+
+def main(entries: int = 1000, items_per_response: int = 100, workers: int | None = None) -> None:
+    har = build_capture(entries, items_per_response=items_per_response)
+    extractor = TrafficExtractor(har)
+    workers = workers or os.cpu_count() or 1
+    print(f"entries: {entries}, items per response: {items_per_response}, cpus: {os.cpu_count()}")
+
+    started = time.perf_counter()
+    sequential = extractor.extract_all()
+    sequential_seconds = time.perf_counter() - started
+    print(f"sequential:  {sequential_seconds:.2f}s, {len(sequential[0])} request / {len(sequential[1])} response points")
+
+    started = time.perf_counter()
+    parallel = extractor.extract_all(max_workers=workers)
+    parallel_seconds = time.perf_counter() - started
+    print(f"{workers} workers: {parallel_seconds:.2f}s ({sequential_seconds / parallel_seconds:.1f}x)")
+
+    assert parallel == sequential
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args)
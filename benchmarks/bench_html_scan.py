@@ -0,0 +1,90 @@
+"""
+HTML data-point extraction: four regex sweeps with O(n²) dedup (previous
+implementation) vs the single-pass scanner, on large pages.
+
+    python -m benchmarks.bench_html_scan [page_kib]
+"""
+import random
+import re
+import sys
+import time
+
+from traffic_analizator.extractor import TrafficExtractor
+
+
+def build_page(size_kib: int = 2048, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    token = lambda: ''.join(rng.choice('abcdef0123456789') for _ in range(24))
+    parts = [
+        '<html><head>',
+        f'<meta name="csrf-token" content="{token()}">',
+        '<meta name="viewport" content="width=device-width">',
+        f'<script>window.config = {{"apiToken": "{token()}", "locale": "en"}};</script>',
+        f'</head><body data-requesttoken="{token()}">',
+    ]
+    size = sum(map(len, parts))
+    row = 0
+    while size < size_kib * 1024:
+        row += 1
+        if row % 2:
+            chunk = f'<tr><td>{row}</td><td><input type="hidden" name="row{row}" value="{token()}"/></td>'
+        else:
+            chunk = f'<tr><td>{row}</td><td><input value="{token()}" type="text" name="qty{row}"></td>'
+        chunk += f'<td class="cell"><a href="/items/{row}" data-id="{row}">Item {row}</a></td></tr>\n'
+        parts.append(chunk)
+        size += len(chunk)
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def _four_sweeps(text: str) -> list[tuple[str, str]]:
+    points: list[tuple[str, str]] = []
+    input_pattern = re.compile(
+        r'<input[^>]*name=["\']([^"\']+)["\'][^>]*value=["\']([^"\']*)["\'][^>]*/?>', re.IGNORECASE
+    )
+    for match in input_pattern.finditer(text):
+        name, value = match.groups()
+        if value:
+            points.append((name, value))
+    input_pattern_reverse = re.compile(
+        r'<input[^>]*value=["\']([^"\']+)["\'][^>]*name=["\']([^"\']+)["\'][^>]*/?>', re.IGNORECASE
+    )
+    for match in input_pattern_reverse.finditer(text):
+        value, name = match.groups()
+        if value and not any(p == (name, value) for p in points):
+            points.append((name, value))
+    meta_pattern = re.compile(
+        r'<meta[^>]*name=["\']([^"\']+)["\'][^>]*content=["\']([^"\']+)["\'][^>]*/?>', re.IGNORECASE
+    )
+    for match in meta_pattern.finditer(text):
+        name, content = match.groups()
+        if "csrf" in name.lower() or "token" in name.lower():
+            points.append((name, content))
+    data_attr_pattern = re.compile(r'data-(token|csrf|requesttoken|session)=["\']([^"\']+)["\']', re.IGNORECASE)
+    for match in data_attr_pattern.finditer(text):
+        name, value = match.groups()
+        points.append((f"data-{name}", value))
+    return points
+
+
+def main(page_kib: int = 2048) -> None:
+    text = build_page(page_kib)
+    extractor = TrafficExtractor()
+
+    started = time.perf_counter()
+    reference = _four_sweeps(text)
+    old_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    points = extractor._extract_from_html(text, 0, "/page", 200)
+    new_seconds = time.perf_counter() - started
+
+    print(f"page: {len(text) / 2 ** 20:.1f} MiB, {len(reference)} points (four sweeps), {len(points)} points (single pass)")
+    print(f"four sweeps: {old_seconds:.2f}s")
+    print(f"single pass: {new_seconds:.3f}s ({old_seconds / new_seconds:.0f}x)")
+
+    assert set(reference) <= {(p.name, p.value) for p in points}
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2048)
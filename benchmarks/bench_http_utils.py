@@ -0,0 +1,90 @@
+"""
+Cached vs uncached query/Set-Cookie parsing on a repetitive capture.
+
+    python -m benchmarks.bench_http_utils [entries]
+"""
+import random
+import sys
+import time
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+from traffic_builder import http_utils
+from traffic_builder.har_parsers.pydantic_models import Cookie, Record
+
+
+def _uncached_query_string(url: str) -> list[Record]:
+    parsed = urlparse(url)
+    if not parsed.query:
+        return []
+    return [
+        Record(name=name, value=value)
+        for name, values in parse_qs(parsed.query).items()
+        for value in values
+    ]
+
+
+def _uncached_cookies(headers) -> list[Cookie]:
+    cookies = []
+    for header in headers:
+        if header.name.lower() != 'set-cookie':
+            continue
+        parts = header.value.split(';')
+        name, sep, value = parts[0].strip().partition('=')
+        if not sep:
+            continue
+        attrs = {'name': name.strip(), 'value': value.strip(), 'path': '/', 'domain': '',
+                 'http_only': False, 'secure': False}
+        for part in parts[1:]:
+            part = part.strip().lower()
+            if part == 'httponly':
+                attrs['http_only'] = True
+            elif part == 'secure':
+                attrs['secure'] = True
+            elif part.startswith('path='):
+                attrs['path'] = part.split('=', 1)[1]
+            elif part.startswith('domain='):
+                attrs['domain'] = part.split('=', 1)[1]
+        cookies.append(Cookie(**attrs))
+    return cookies
+
+
+def build_capture(entries: int, seed: int = 1) -> list[tuple[str, list]]:
+    rng = random.Random(seed)
+    urls = [
+        f"https://shop.example.com/api/v1/items/{i}?page={i % 7}&sort=price&lang=en&session=abc{i % 13}"
+        for i in range(300)
+    ]
+    cookie_headers = [
+        [SimpleNamespace(name="Set-Cookie", value=f"sid=token{i}; Path=/; Domain=.example.com; HttpOnly; Secure"),
+         SimpleNamespace(name="Set-Cookie", value=f"pref=v{i % 5}; Path=/app"),
+         SimpleNamespace(name="Content-Type", value="application/json")]
+        for i in range(50)
+    ]
+    return [(rng.choice(urls), rng.choice(cookie_headers)) for _ in range(entries)]
+
+
+def _run(capture, parse_query, parse_cookies) -> float:
+    start = time.perf_counter()
+    for url, headers in capture:
+        parse_query(url)
+        parse_cookies(headers)
+    return time.perf_counter() - start
+
+
+def main(entries: int = 100_000) -> None:
+    capture = build_capture(entries)
+    http_utils.clear_caches()
+
+    uncached = _run(capture, _uncached_query_string, _uncached_cookies)
+    cached = _run(capture, http_utils.parse_query_string, http_utils.parse_cookies_from_headers)
+
+    print(f"entries:  {entries}")
+    print(f"uncached: {uncached:.3f}s")
+    print(f"cached:   {cached:.3f}s ({uncached / cached:.1f}x)")
+    for name, info in http_utils.cache_info().items():
+        print(f"{name}: hits={info.hits} misses={info.misses} size={info.currsize}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
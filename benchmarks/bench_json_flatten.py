@@ -0,0 +1,84 @@
+"""
+JSON response flattening: recursive string-building flattener (previous
+implementation) vs the explicit-stack flattener that extends JSONPath strings
+segment by segment.
+
+    python -m benchmarks.bench_json_flatten [records]
+"""
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from traffic_analizator.extractor import TrafficExtractor
+from traffic_analizator.extractors import JsonExtractorHint
+from traffic_analizator.models import DataLocation, ResponseDataPoint
+
+
+def build_document(records: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    return json.dumps({"data": {"records": [
+        {
+            "id": f"r{rng.randrange(10 ** 9)}", "name": f"record {i}", "price": rng.randint(1, 1000),
+            "tags": ["a", "b", "c"], "active": i % 2 == 0,
+            "owner": {"id": rng.randrange(10 ** 6), "name": "owner", "links": {"self": f"/owners/{i}", "avatar": None}},
+            "meta": {"created": "2024-01-01T10:00:00Z", "version": rng.randint(1, 9),
+                     "history": [{"at": "2024-01-01", "by": rng.randrange(100)} for _ in range(3)]},
+        }
+        for i in range(records)
+    ]}})
+
+
+def _recursive_flatten(data, path, points, index, url, status_code):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            _recursive_flatten(value, f"{path}.{key}", points, index, url, status_code)
+    elif isinstance(data, list):
+        for i, item in enumerate(data):
+            _recursive_flatten(item, f"{path}[{i}]", points, index, url, status_code)
+    elif data is not None:
+        points.append(ResponseDataPoint(
+            response_index=index, url=url, status_code=status_code, location=DataLocation.RESPONSE_JSON,
+            name=path.split(".")[-1].split("[")[0], value=str(data), extractor_hint=JsonExtractorHint(json_path=path),
+        ))
+
+
+def _measure(label, flatten):
+    started = time.perf_counter()
+    points = flatten()
+    seconds = time.perf_counter() - started
+    del points
+    tracemalloc.start()
+    points = flatten()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label}: {seconds:.2f}s, retained {retained / 2 ** 20:.0f} MiB, peak {peak / 2 ** 20:.0f} MiB")
+    return points, seconds
+
+
+def main(records: int = 25000) -> None:
+    text = build_document(records)
+    url = "https://app.example.com/api/records"
+    extractor = TrafficExtractor(pause_gc=True)
+
+    def recursive():
+        points = []
+        _recursive_flatten(json.loads(text), "$", points, 0, url, 200)
+        return points
+
+    old_points, old_seconds = _measure("recursive", recursive)
+    print(f"document: {len(text) / 2 ** 20:.1f} MiB, {len(old_points)} leaves")
+    del old_points
+    new_points, new_seconds = _measure(
+        "iterative", lambda: extractor._try_extract_json_response(text, 0, url, 200)
+    )
+    print(f"speedup: {old_seconds / new_seconds:.1f}x")
+
+    reference = recursive()
+    assert [(p.name, p.value, p.extractor_hint.json_path) for p in new_points] == \
+        [(p.name, p.value, p.extractor_hint.json_path) for p in reference]
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 25000)
@@ -0,0 +1,71 @@
+"""
+Memory held by extracted data points: slotted point classes vs the previous
+`__dict__`-backed dataclasses, measured with tracemalloc.
+
+    python -m benchmarks.bench_point_memory [entries]
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+
+from benchmarks.synthetic_capture import build_capture
+from traffic_analizator.extractor import TrafficExtractor
+from traffic_analizator.extractors import ExtractorHint
+from traffic_analizator.models import DataLocation
+
+
+@dataclass
+class DictRequestDataPoint:
+    request_index: int
+    url: str
+    method: str
+    location: DataLocation
+    name: str
+    value: str
+    json_path: str | None = None
+
+
+@dataclass
+class DictResponseDataPoint:
+    response_index: int
+    url: str
+    status_code: int
+    location: DataLocation
+    name: str | None
+    value: str
+    extractor_hint: ExtractorHint
+
+
+def traced(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(entries: int = 3000) -> None:
+    har = build_capture(entries)
+    request_points, response_points = TrafficExtractor(har, content_cache_size=0).extract_all()
+    count = len(request_points) + len(response_points)
+
+    fields = lambda point: point.__reduce__()[1]
+    # The first traced run also counts one-off allocations of the interpreter.
+    traced(lambda: [type(p)(*fields(p)) for p in response_points])
+    _, dict_size = traced(lambda: (
+        [DictRequestDataPoint(*fields(p)) for p in request_points],
+        [DictResponseDataPoint(*fields(p)) for p in response_points],
+    ))
+    _, slot_size = traced(lambda: (
+        [type(p)(*fields(p)) for p in request_points],
+        [type(p)(*fields(p)) for p in response_points],
+    ))
+
+    print(f"entries: {entries}, points: {count}")
+    print(f"__dict__ points: {dict_size / 2 ** 20:.1f} MiB ({dict_size / count:.0f} B/point)")
+    print(f"slotted points:  {slot_size / 2 ** 20:.1f} MiB ({slot_size / count:.0f} B/point)")
+    print(f"saved: {1 - slot_size / dict_size:.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
@@ -0,0 +1,32 @@
+"""
+Analysis (extraction + correlation search) with and without the response
+value prefilter.
+
+    python -m benchmarks.bench_prefilter [entries]
+"""
+import sys
+
+from benchmarks.synthetic_capture import build_capture
+from traffic_analizator.analyzer import TrafficAnalyzer
+from traffic_analizator.prefilter import ValuePrefilter
+
+
+def main(entries: int = 5000) -> None:
+    har = build_capture(entries)
+
+    plain = TrafficAnalyzer().analyze(har)
+    filtered = TrafficAnalyzer(prefilter=ValuePrefilter()).analyze(har)
+
+    print(f"entries: {entries}")
+    print(filtered.prefilter.to_str())
+    for label, report in (("without prefilter", plain), ("with prefilter", filtered)):
+        print(
+            f"{label}: extract {report.extraction_seconds:.2f}s + correlate {report.correlation_seconds:.2f}s, "
+            f"{len(report.response_data_points)} response points, {len(report.correlations)} correlations"
+        )
+    seconds = lambda report: report.extraction_seconds + report.correlation_seconds
+    print(f"speedup: {seconds(plain) / seconds(filtered):.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,37 @@
+"""
+Streaming correlation over a long capture (one entry per second) with no
+window and with a time window: run time and index size at the end.
+
+    python -m benchmarks.bench_windows [entries] [time_window_seconds]
+"""
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.synthetic_capture import build_capture
+from traffic_analizator.streaming import StreamingCorrelator
+
+
+def main(entries: int = 5000, time_window: float = 300) -> None:
+    har = build_capture(entries)
+    started = datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+    for index, entry in enumerate(har.log.entries):
+        entry.started_date_time = (started + timedelta(seconds=index)).isoformat().replace("+00:00", "Z")
+
+    print(f"entries: {entries}")
+    for label, window in (("no window", None), (f"time_window={time_window:g}s", time_window)):
+        correlator = StreamingCorrelator(time_window=window)
+        begin = time.perf_counter()
+        correlations = sum(len(correlator.feed(entry)[0]) for entry in har.log.entries)
+        seconds = time.perf_counter() - begin
+        print(
+            f"{label}: {seconds:.2f}s, {correlations} correlations, "
+            f"{correlator.unresolved_count} unresolved, {len(correlator.index)} indexed values"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 300,
+    )
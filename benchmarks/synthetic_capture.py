@@ -0,0 +1,75 @@
+"""
+Synthetic HAR captures for benchmarks: a login that issues a session token,
+JSON API calls echoing ids and the token, and HTML pages with hidden inputs.
+"""
+import json
+import random
+
+from traffic_builder.har_parsers.pydantic_models import (
+    Cache, Content, Creator, Entry, HarFile, Log, PostData, Record, Request, Response, Timings,
+)
+
+
+def _token(rng: random.Random, length: int = 24) -> str:
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(length))
+
+
+def _entry(method: str, url: str, headers: list[Record], body: str | None, mime_type: str, text: str) -> Entry:
+    return Entry(
+        started_date_time="2024-01-01T10:00:00Z",
+        time=10,
+        request=Request(
+            method=method,
+            url=url,
+            headers=headers,
+            post_data=PostData(mime_type="application/json", text=body) if body is not None else None,
+        ),
+        response=Response(
+            status=200,
+            status_text="OK",
+            headers=[Record(name="Content-Type", value=mime_type)],
+            content=Content(size=len(text), mime_type=mime_type, text=text),
+        ),
+        cache=Cache(),
+        timings=Timings(send=1, wait=5, receive=4),
+    )
+
+
+def build_capture(entries: int = 5000, items_per_response: int = 20, seed: int = 1) -> HarFile:
+    rng = random.Random(seed)
+    session = _token(rng)
+    result = [_entry(
+        "POST", "https://app.example.com/api/login", [], '{"user": "demo"}',
+        "application/json", json.dumps({"session": session, "user": {"id": 1, "name": "demo"}}),
+    )]
+    recent_ids: list[str] = []
+
+    for index in range(1, entries):
+        headers = [
+            Record(name="Authorization", value=f"Bearer {session}"),
+            Record(name="X-Request-Id", value=_token(rng, 20)),
+        ]
+        if index % 10 == 0:
+            csrf = _token(rng, 32)
+            inputs = "".join(
+                f'<input type="hidden" name="field{i}" value="{_token(rng, 12)}"/>' for i in range(items_per_response)
+            )
+            html = f'<html><body><form><input type="hidden" name="csrf" value="{csrf}"/>{inputs}</form></body></html>'
+            result.append(_entry("GET", f"https://app.example.com/page/{index}", headers, None, "text/html", html))
+            continue
+
+        items = [
+            {"id": _token(rng, 16), "name": f"item {i}", "price": rng.randint(1, 1000), "tags": ["a", "b"],
+             "owner": {"id": _token(rng, 12), "links": {"self": f"/items/{i}"}}}
+            for i in range(items_per_response)
+        ]
+        recent_ids.extend(item["id"] for item in items[:3])
+        echoed = rng.choice(recent_ids)
+        url = f"https://app.example.com/api/items?ref={echoed}&page={index % 5}&ids=x{rng.choice(recent_ids)}y"
+        body = json.dumps({"item": echoed, "session": session}) if index % 3 == 0 else None
+        result.append(_entry(
+            "POST" if body else "GET", url, headers, body,
+            "application/json", json.dumps({"items": items, "total": len(items)}),
+        ))
+
+    return HarFile(log=Log(version="1.2", creator=Creator(name="bench", version="1"), entries=result))
@@ -10,16 +10,17 @@ from jmx_builder.utility.console import print_path, print_paths, print_tree
 from jmx_builder.utility.jmx_builder_parser_export import get_configured_parser
 from jmx_builder.utility.search import search_element, search_elements
 from jmx_builder.parsers.tree_parser import TreeParser 
-from payloads.har_saz_payloads import SazGroupingMode, add_har_to_scope, add_saz_to_scope
+from payloads.har_saz_payloads import SazGroupingMode, add_har_to_scope, add_saz_file_to_scope
 from tests import test_structure_agent
 from tests import test_correlation
 from tests.test_correlation import t2
 from tests.test_correlation_input import t3
 from traffic_analizator.analyzer import TrafficAnalyzer
+from traffic_analizator.batch import analyze_batch
 from traffic_builder.converters_to_har.jtl_to_har_conterter import convert_jtl_to_har, save_har
 from traffic_builder.converters_to_har.saz_to_har_converter import convert_saz_to_har
 from traffic_builder.har_parsers.har_parser import parse_har
-from traffic_builder.saz_parser.saz_parser import parse_saz 
+from traffic_builder.traffic_filter import TrafficFilter, filter_har
 
 
 def remove_suffix(
@@ -137,7 +138,8 @@ def har_injection(
         verbose: bool, 
         output: str | None, 
         scope: str | None,
-        har_path: str
+        har_path: str,
+        filter_traffic: bool = False
         ) -> int:
     
     try:
@@ -151,6 +153,9 @@ def har_injection(
             SLog.log(f"There is no element {scope}")
             exit(1)
         har = parse_har(har_path)
+        if filter_traffic:
+            har, filter_report = filter_har(har)
+            SLog.log(filter_report.to_str())
         add_har_to_scope(scope_e, har)
         new_content = test_plan.to_xml()
         
@@ -185,8 +190,7 @@ def saz_injection(
             SLog.log(f"There is no element {scope}")
             exit(1)
             
-        saz = parse_saz(saz_path)
-        add_saz_to_scope(scope_e, saz, group_mode)
+        add_saz_file_to_scope(scope_e, saz_path, group_mode)
         new_content = test_plan.to_xml()
         
         out = output if output else file_path
@@ -335,8 +339,12 @@ def analyze(
     filepath: str,
     verbose: bool,
     output: str,
+    filter_traffic: bool = False,
 ):
     har = parse_har(filepath)
+    if filter_traffic:
+        har, filter_report = filter_har(har)
+        SLog.log(filter_report.to_str())
     analyzer : TrafficAnalyzer = TrafficAnalyzer(ignore_cookies=True, min_value_length=3)
     report = analyzer.analyze(har)
     report_str = report.to_str()
@@ -348,6 +356,27 @@ def analyze(
         SLog.log(report_str)
     SLog.log(f'Logfile saved as {out}')
 
+def batch_analyze(
+    sources: str,
+    verbose: bool,
+    output: str | None,
+    filter_traffic: bool = False,
+):
+    analyzer = TrafficAnalyzer(ignore_cookies=True, min_value_length=3)
+    out = output if output else f"./batch_{datetime.datetime.now():%Y%m%d_%H%M%S}"
+    summary = analyze_batch(
+        sources,
+        analyzer=analyzer,
+        traffic_filter=TrafficFilter() if filter_traffic else None,
+        output_dir=out,
+    )
+    if verbose:
+        for result in summary.results:
+            if result.report is not None:
+                SLog.log(result.report.to_str())
+    SLog.log(summary.to_str())
+    SLog.log(f'Reports saved to {out}')
+
 def get_scenario_steps(
     filepath: str,
     verbose: bool,
@@ -417,6 +446,8 @@ if __name__ == "__main__":
     args_parser.add_argument('-s', '--scope', help='Name of the element in the tree')
     args_parser.add_argument('-a', '--analyze', help='Analyze har file. Use -o flag to set output file')
     args_parser.add_argument('-hi', '--har_injection', help='Link to har file to injection in TestPlan tree. Use -s to set scope root.')
+    args_parser.add_argument('-b', '--batch', help='Directory or glob of har/saz/jtl files to analyze concurrently. Use -o to set output directory')
+    args_parser.add_argument('-f', '--filter', help='Drop static resources and duplicate requests from har before analysis/injection', action='store_true')
     args_parser.add_argument('-g', '--jmeter-path', help='Path to JMeter executable (jmeter, jmeter.sh, jmeter.bat)')
     args_parser.add_argument('-fd' '--find_disabled', help='Finds disabled objects')
     args_parser.add_argument('-et' '--enable_timers', help='Enable all timers and their parent')
@@ -442,7 +473,7 @@ if __name__ == "__main__":
         if not args.input:
             SLog.log('Error: --input is required for comparison')
             exit(1)
-        validating_overiting(args.output, lambda: har_injection(args.input, args.verbose, args.output, args.scope, args.har_injection))
+        validating_overiting(args.output, lambda: har_injection(args.input, args.verbose, args.output, args.scope, args.har_injection, args.filter))
         exit(0)
 
     if (args.prefix):
@@ -463,7 +494,11 @@ if __name__ == "__main__":
         if not args.input:
             SLog.log('Error: --input is required for comparison')
             exit(1)
-        analyze(args.input, args.verbose, args.output)
+        analyze(args.input, args.verbose, args.output, args.filter)
+        exit(0)
+
+    if (args.batch):
+        batch_analyze(args.batch, args.verbose, args.output, args.filter)
         exit(0)
 
     args_parser.print_help()
\ No newline at end of file
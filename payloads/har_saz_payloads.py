@@ -1,8 +1,11 @@
 from jmx_builder.models.tree import HTTPSamplerProxy, HeaderManager, TransactionController, TreeElement
-from traffic_builder.converters_to_har.saz_to_har_converter import convert_saz_to_har
+from traffic_builder.http_utils import parse_query_string
 from traffic_builder.har_parsers.pydantic_models import Entry, HarFile
-from traffic_builder.saz_parser.models import SazArchive
+from traffic_builder.saz_parser.models import SazArchive, SazSession, SessionFilter
+from traffic_builder.saz_parser.saz_parser import iter_saz
 from urllib.parse import urlparse
+from pathlib import Path
+from typing import Iterable
 from enum import Enum
 
 
@@ -63,42 +66,95 @@ class SazGroupingMode(Enum):
     BY_COLOR_CHANGE = "by_color_change"
 
 
+def create_header_manager_from_saz(session: SazSession) -> HeaderManager:
+    header_manager = HeaderManager.create_default()
+    
+    for header in session.request.headers:
+        header_manager.add_header(header.name, header.value)
+    
+    return header_manager
+
+
+def create_http_sampler_from_saz(session: SazSession) -> HTTPSamplerProxy:
+    request_line = session.request.request_line
+    parsed_url = urlparse(request_line.url)
+    
+    protocol = parsed_url.scheme
+    domain = parsed_url.hostname or ""
+    port = parsed_url.port or ""
+    path = parsed_url.path or "/"
+    
+    testname = f"{request_line.method} {path}"
+    
+    sampler = HTTPSamplerProxy.create_default(testname=testname)
+    sampler.set_protocol(protocol)
+    sampler.set_domain(domain)
+    sampler.set_port(port)
+    sampler.set_path(path)
+    sampler.set_method_raw(request_line.method)
+    
+    for query_param in parse_query_string(request_line.url):
+        sampler.add_argument(query_param.name, query_param.value)
+    
+    return sampler
+
+
+def _session_color(session: SazSession) -> str | None:
+    for flag in session.metadata.flags:
+        if flag.name == "ui-color":
+            return flag.value
+    return None
+
+
+def _create_saz_sampler(session: SazSession) -> HTTPSamplerProxy:
+    http_sampler = create_http_sampler_from_saz(session)
+    http_sampler.add_child(create_header_manager_from_saz(session))
+    return http_sampler
+
+
 def add_saz_to_scope(
     root: TreeElement,
     saz_archive: SazArchive,
     grouping_mode: SazGroupingMode = SazGroupingMode.NO_GROUPING
 ) -> None:
-    har_file = convert_saz_to_har(saz_archive)
+    _add_saz_sessions(root, saz_archive.sessions, grouping_mode)
+
+
+def add_saz_file_to_scope(
+    root: TreeElement,
+    saz_path: str | Path,
+    grouping_mode: SazGroupingMode = SazGroupingMode.NO_GROUPING,
+    filter: SessionFilter | None = None
+) -> None:
+    _add_saz_sessions(root, iter_saz(saz_path, filter), grouping_mode)
+
+
+def _add_saz_sessions(
+    root: TreeElement,
+    sessions: Iterable[SazSession],
+    grouping_mode: SazGroupingMode | str
+) -> None:
+    grouping_mode = SazGroupingMode(grouping_mode)
     
     if grouping_mode == SazGroupingMode.NO_GROUPING:
-        add_har_to_scope(root, har_file)
-        return
-    
-    color_map = {}
-    for i, session in enumerate(saz_archive.sessions):
-        color = None
-        for flag in session.metadata.flags:
-            if flag.name == "ui-color":
-                color = flag.value
-                break
-        color_map[i] = color
-    
-    if grouping_mode == SazGroupingMode.BY_UNIQUE_COLORS:
-        _add_saz_by_unique_colors(root, har_file, color_map)
+        for session in sessions:
+            root.add_child(_create_saz_sampler(session))
+    elif grouping_mode == SazGroupingMode.BY_UNIQUE_COLORS:
+        _add_saz_by_unique_colors(root, sessions)
     elif grouping_mode == SazGroupingMode.BY_COLOR_CHANGE:
-        _add_saz_by_color_change(root, har_file, color_map)
+        _add_saz_by_color_change(root, sessions)
 
 
-def _add_saz_by_unique_colors(root: TreeElement, har_file: HarFile, color_map: dict) -> None:
+def _add_saz_by_unique_colors(root: TreeElement, sessions: Iterable[SazSession]) -> None:
     color_groups = {}
     
-    for i, entry in enumerate(har_file.log.entries):
-        color = color_map.get(i)
+    for session in sessions:
+        color = _session_color(session)
         if color not in color_groups:
             color_groups[color] = []
-        color_groups[color].append(entry)
+        color_groups[color].append(_create_saz_sampler(session))
     
-    for color, entries in color_groups.items():
+    for color, samplers in color_groups.items():
         if color is None:
             tc_name = "No Color"
         else:
@@ -106,48 +162,35 @@ def _add_saz_by_unique_colors(root: TreeElement, har_file: HarFile, color_map: d
         
         tc = TransactionController.create_default(tc_name)
         
-        for entry in entries:
-            http_sampler = create_http_sampler_from_har(entry)
-            header_manager = create_header_manager_from_har(entry)
-            http_sampler.add_child(header_manager)
+        for http_sampler in samplers:
             tc.add_child(http_sampler)
         
         root.add_child(tc)
 
 
-def _add_saz_by_color_change(root: TreeElement, har_file: HarFile, color_map: dict) -> None:
-    if not har_file.log.entries:
-        return
-    
-    current_color = color_map.get(0)
-    tc_counter = 1
-    
-    if current_color is None:
-        tc_name = f"Transaction Controller {tc_counter} (No Color)"
-    else:
-        tc_name = f"Transaction Controller {tc_counter} ({current_color})"
-    
-    tc = TransactionController.create_default(tc_name)
+def _color_change_tc_name(tc_counter: int, color: str | None) -> str:
+    if color is None:
+        return f"Transaction Controller {tc_counter} (No Color)"
+    return f"Transaction Controller {tc_counter} ({color})"
+
+
+def _add_saz_by_color_change(root: TreeElement, sessions: Iterable[SazSession]) -> None:
+    tc = None
+    tc_counter = 0
+    current_color = None
     
-    for i, entry in enumerate(har_file.log.entries):
-        color = color_map.get(i)
+    for session in sessions:
+        color = _session_color(session)
         
-        if color != current_color:
-            root.add_child(tc)
+        if tc is None or color != current_color:
+            if tc is not None:
+                root.add_child(tc)
             
             tc_counter += 1
             current_color = color
-            
-            if current_color is None:
-                tc_name = f"Transaction Controller {tc_counter} (No Color)"
-            else:
-                tc_name = f"Transaction Controller {tc_counter} ({current_color})"
-            
-            tc = TransactionController.create_default(tc_name)
+            tc = TransactionController.create_default(_color_change_tc_name(tc_counter, current_color))
         
-        http_sampler = create_http_sampler_from_har(entry)
-        header_manager = create_header_manager_from_har(entry)
-        http_sampler.add_child(header_manager)
-        tc.add_child(http_sampler)
+        tc.add_child(_create_saz_sampler(session))
     
-    root.add_child(tc)
\ No newline at end of file
+    if tc is not None:
+        root.add_child(tc)
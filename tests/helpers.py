@@ -0,0 +1,88 @@
+"""
+Capture builders shared by the tests: small SAZ and HAR files on disk and
+an in-memory HAR with JSON and HTML responses.
+"""
+import json
+import random
+import zipfile
+
+from traffic_builder.har_parsers.pydantic_models import (
+    Cache, Content, Creator, Entry, HarFile, Log, Record, Request, Response, Timings,
+)
+
+
+TIMERS = ' '.join(
+    f'{name}="2024-01-01T10:00:0{i % 10}.0000000+00:00"'
+    for i, name in enumerate([
+        'ClientConnected', 'ClientBeginRequest', 'GotRequestHeaders', 'ClientDoneRequest',
+        'ServerConnected', 'FiddlerBeginRequest', 'ServerGotRequest', 'ServerBeginResponse',
+        'GotResponseHeaders', 'ServerDoneResponse', 'ClientBeginResponse', 'ClientDoneResponse',
+    ])
+)
+
+
+def write_saz(path, sessions):
+    with zipfile.ZipFile(path, 'w') as zf:
+        for sid, (method, url, status, color, body, *response_headers) in enumerate(sessions, 1):
+            flags = f'<SessionFlag N="ui-color" V="{color}" />' if color else ''
+            zf.writestr(
+                f'raw/{sid:03d}_m.xml',
+                f'<Session SID="{sid}" BitFlags="0"><SessionTimers {TIMERS} />'
+                f'<PipeInfo CltReuse="false" Reused="false" /><SessionFlags>{flags}</SessionFlags></Session>'
+            )
+            zf.writestr(f'raw/{sid:03d}_c.txt', f'{method} {url} HTTP/1.1\r\nHost: example.com\r\n\r\n')
+            zf.writestr(
+                f'raw/{sid:03d}_s.txt',
+                f'HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n'.encode()
+                + ''.join(f'{header}\r\n' for header in response_headers).encode() + b'\r\n' + body
+            )
+
+
+def write_har(path, token):
+    def entry(url, request_headers, response_text):
+        return {
+            "startedDateTime": "2024-01-01T10:00:00Z", "time": 1,
+            "request": {"method": "GET", "url": url, "headers": request_headers},
+            "response": {"status": 200, "statusText": "OK",
+                         "content": {"size": len(response_text), "mimeType": "application/json", "text": response_text}},
+            "cache": {}, "timings": {"send": 0, "wait": 0, "receive": 0},
+        }
+
+    entries = [
+        entry("https://app.example.com/login", [], json.dumps({"token": token})),
+        entry("https://app.example.com/logo.png", [], ""),
+        entry("https://app.example.com/data", [{"name": "X-Token", "value": token}], "{}"),
+    ]
+    path.write_text(json.dumps({"log": {"version": "1.2", "creator": {"name": "t", "version": "1"}, "entries": entries}}))
+
+
+def build_capture(entries: int, items_per_response: int, seed: int = 1) -> HarFile:
+    """A login issuing a token, JSON item lists echoing earlier ids, and an HTML form every tenth entry."""
+    rng = random.Random(seed)
+
+    def token(length: int) -> str:
+        return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789") for _ in range(length))
+
+    def entry(url: str, headers: list[Record], mime_type: str, text: str) -> Entry:
+        return Entry(
+            started_date_time="2024-01-01T10:00:00Z", time=10,
+            request=Request(method="GET", url=url, headers=headers),
+            response=Response(status=200, status_text="OK", content=Content(size=len(text), mime_type=mime_type, text=text)),
+            cache=Cache(), timings=Timings(send=1, wait=5, receive=4),
+        )
+
+    session = token(24)
+    result = [entry("https://app.example.com/api/login", [], "application/json", json.dumps({"session": session}))]
+    ids = [session]
+    for index in range(1, entries):
+        headers = [Record(name="Authorization", value=f"Bearer {session}")]
+        if index % 10 == 0:
+            inputs = "".join(f'<input type="hidden" name="field{i}" value="{token(12)}"/>' for i in range(items_per_response))
+            result.append(entry(f"https://app.example.com/page/{index}", headers, "text/html", f"<form>{inputs}</form>"))
+            continue
+        items = [{"id": token(16), "name": f"item {i}", "owner": {"id": token(12)}} for i in range(items_per_response)]
+        url = f"https://app.example.com/api/items?ref={rng.choice(ids)}&page={index % 5}"
+        ids.extend(item["id"] for item in items[:2])
+        result.append(entry(url, headers, "application/json", json.dumps({"items": items, "total": len(items)})))
+
+    return HarFile(log=Log(version="1.2", creator=Creator(name="test", version="1"), entries=result))
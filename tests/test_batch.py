@@ -0,0 +1,43 @@
+from tests.helpers import write_har, write_saz
+from traffic_analizator.batch import analyze_batch, collect_capture_paths, report_paths
+from traffic_builder.traffic_filter import TrafficFilter
+
+
+def test_analyze_batch_reports_per_file_and_summary(tmp_path):
+    captures = tmp_path / 'captures'
+    captures.mkdir()
+    write_har(captures / 'journey1.har', 'a1b2c3d4e5')
+    write_har(captures / 'journey2.har', 'f6g7h8i9j0')
+    write_saz(captures / 'journey3.saz', [('GET', 'http://example.com/a', 200, None, b'{"a": 1}')])
+    (captures / 'broken.har').write_text('{')
+    (captures / 'notes.txt').write_text('skip me')
+
+    assert [p.name for p in collect_capture_paths(captures)] == ['broken.har', 'journey1.har', 'journey2.har', 'journey3.saz']
+
+    summary = analyze_batch(captures, traffic_filter=TrafficFilter(), max_workers=2, output_dir=tmp_path / 'reports')
+
+    assert [r.path.name for r in summary.results] == ['broken.har', 'journey1.har', 'journey2.har', 'journey3.saz']
+    assert [r.path.name for r in summary.failed] == ['broken.har']
+    assert [r.entries for r in summary.results] == [0, 2, 2, 1]
+    assert all(len(r.report.correlations) == 1 for r in summary.results[1:3])
+    assert summary.total_entries == 5 and summary.workers == 2
+    assert all(r.filter_report is not None and r.filter_seconds > 0 for r in summary.results[1:])
+    assert (tmp_path / 'reports' / 'journey1.har.log').exists()
+    assert 'entries/s' in (tmp_path / 'reports' / 'summary.log').read_text()
+
+
+def test_batch_reports_of_same_named_captures_do_not_collide(tmp_path):
+    for journey, token in (('login', 'a1b2c3d4e5'), ('checkout', 'f6g7h8i9j0')):
+        (tmp_path / journey).mkdir()
+        write_har(tmp_path / journey / 'capture.har', token)
+    write_har(tmp_path / 'login' / 'summary.har', 'k1l2m3n4o5')
+    paths = collect_capture_paths([tmp_path / 'login', tmp_path / 'checkout'])
+
+    assert [str(p) for p in report_paths(paths)] == ['login/capture.har.log', 'login/summary.har.log', 'checkout/capture.har.log']
+    assert [str(p) for p in report_paths([tmp_path / 'a.har', tmp_path / 'a.har'])] == ['a.har.log', 'a.har.2.log']
+
+    analyze_batch(paths, max_workers=1, output_dir=tmp_path / 'reports')
+
+    assert 'a1b2c3d4e5' in (tmp_path / 'reports' / 'login' / 'capture.har.log').read_text(encoding='utf-8')
+    assert 'f6g7h8i9j0' in (tmp_path / 'reports' / 'checkout' / 'capture.har.log').read_text(encoding='utf-8')
+    assert 'BATCH ANALYSIS SUMMARY' in (tmp_path / 'reports' / 'summary.log').read_text(encoding='utf-8')
@@ -0,0 +1,86 @@
+import random
+
+from traffic_analizator.aho_corasick import AhoCorasick
+from traffic_analizator.correlator import TrafficCorrelator
+from traffic_analizator.extractors import HeaderExtractorHint
+from traffic_analizator.models import DataLocation, MatchType, RequestDataPoint, ResponseDataPoint, SourcePolicy
+
+
+def linear_contains_source(req_point, response_points, min_value_length, search_window):
+    min_index = 0 if search_window is None else max(0, req_point.request_index - search_window)
+    for resp_point in response_points:
+        if min_index <= resp_point.response_index < req_point.request_index \
+                and len(resp_point.value) >= min_value_length \
+                and resp_point.value in req_point.value and resp_point.value != req_point.value:
+            return resp_point
+    return None
+
+
+def random_value(rng, length):
+    return ''.join(rng.choice('abc') for _ in range(length))
+
+
+def test_aho_corasick_finds_every_contained_pattern():
+    rng = random.Random(7)
+    patterns = [random_value(rng, rng.randint(1, 6)) for _ in range(200)]
+    matcher = AhoCorasick(patterns)
+    for _ in range(200):
+        text = random_value(rng, rng.randint(0, 30))
+        assert {matcher.patterns[i] for i in matcher.find_all(text)} == {p for p in patterns if p in text}
+
+
+def test_contains_match_agrees_with_linear_scan():
+    rng = random.Random(11)
+    response_points = [
+        ResponseDataPoint(
+            response_index=index, url=f"/r{index}", status_code=200, location=DataLocation.RESPONSE_HEADER,
+            name="h", value=random_value(rng, rng.randint(3, 8)), extractor_hint=HeaderExtractorHint(header_name="h"),
+        )
+        for index in range(60) for _ in range(rng.randint(0, 3))
+    ]
+    request_points = [
+        RequestDataPoint(
+            request_index=rng.randint(0, 60), url="/q", method="GET", location=DataLocation.QUERY_PARAM,
+            name="q", value=random_value(rng, rng.randint(4, 20)),
+        )
+        for _ in range(400)
+    ]
+
+    for search_window in (None, 5):
+        correlator = TrafficCorrelator(min_value_length=4, search_window=search_window)
+        contains_index = correlator._build_contains_index(request_points, response_points)
+        for req_point in request_points:
+            correlation = correlator._find_contains_source(req_point, contains_index)
+            expected = linear_contains_source(req_point, response_points, 4, search_window)
+            assert (correlation.response_point if correlation else None) is expected
+            if correlation:
+                assert correlation.match_type == MatchType.CONTAINS
+
+
+def test_exact_match_source_policy_with_search_window():
+    def response(index, value):
+        return ResponseDataPoint(
+            response_index=index, url=f"/r{index}", status_code=200, location=DataLocation.RESPONSE_HEADER,
+            name="h", value=value, extractor_hint=HeaderExtractorHint(header_name="h"),
+        )
+
+    def request(index, value):
+        return RequestDataPoint(
+            request_index=index, url="/q", method="GET", location=DataLocation.HEADER, name="X-Token", value=value,
+        )
+
+    # The token is echoed by every third response, twice by response 30.
+    response_points = [response(i, "token-1") for i in range(0, 60, 3)] + [response(30, "token-1")]
+    requests = [request(0, "token-1"), request(31, "token-1"), request(60, "token-1")]
+
+    def sources(policy, search_window=None):
+        correlator = TrafficCorrelator(search_window=search_window, source_policy=policy)
+        correlations, unresolved = correlator.find_correlations(requests, response_points)
+        assert [r.request_index for r in unresolved] == [0]
+        return [c.response_point for c in correlations]
+
+    assert [p.response_index for p in sources(SourcePolicy.FIRST)] == [0, 0]
+    assert [p.response_index for p in sources(SourcePolicy.FIRST, search_window=10)] == [21, 51]
+    nearest = sources("nearest", search_window=10)
+    assert [p.response_index for p in nearest] == [30, 57]
+    assert nearest[0] is response_points[10]
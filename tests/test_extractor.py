@@ -0,0 +1,121 @@
+import copy
+import pickle
+import re
+from dataclasses import replace
+
+from tests.helpers import build_capture
+from traffic_analizator.extractor import PARALLEL_CHUNK_SIZE, TrafficExtractor
+from traffic_analizator.extractors import (
+    CookieExtractorHint, HeaderExtractorHint, JsonExtractorHint, RegexExtractorHint, render_json_path,
+)
+from traffic_analizator.models import DataLocation
+from traffic_builder.har_parsers.pydantic_models import (
+    Cache, Content, Creator, Entry, HarFile, Log, Record, Request, Response, Timings,
+)
+
+
+def test_parallel_extraction_keeps_entry_order():
+    har = build_capture(entries=PARALLEL_CHUNK_SIZE * 3 + 5, items_per_response=3)
+    extractor = TrafficExtractor(har)
+
+    request_points, response_points = extractor.extract_all()
+    assert extractor.extract_all(max_workers=2) == (request_points, response_points)
+    assert [p.response_index for p in response_points] == sorted(p.response_index for p in response_points)
+    assert pickle.loads(pickle.dumps(response_points)) == response_points
+
+
+def test_json_flattening_paths_and_names():
+    text = '{"a": {"b.c": [1, {"d": null, "e": true}], "f": [[2]]}, "g": "x"}'
+    points = TrafficExtractor()._try_extract_json_response(text, 0, "/u", 200)
+
+    assert [(p.name, p.value) for p in points] == [("b.c", "1"), ("e", "True"), ("f", "2"), ("g", "x")]
+    assert [p.extractor_hint.json_path for p in points] == ["$.a.b.c[0]", "$.a.b.c[1].e", "$.a.f[0][0]", "$.g"]
+    assert TrafficExtractor()._try_extract_json_response("[7]", 0, "/u", 200)[0].name == "$"
+
+    request_points = TrafficExtractor()._try_extract_json(text, 0, "/u", "POST", is_request=True)
+    assert request_points[0].path == ("a", "b.c", 0)
+    assert [p.json_path for p in request_points] == ["$.a.b.c[0]", "$.a.b.c[1].e", "$.a.f[0][0]", "$.g"]
+
+
+def test_html_scanner_collects_tokens_in_one_pass():
+    html = (
+        '<html><head><meta name="csrf-token" content="m1e2t3a4"><meta content="c0nt3nt" name="api_token">'
+        '<meta name="viewport" content="width=device-width">'
+        '<script>var cfg = {"sessionToken": "s3ss10n", locale: "en"}; window.nonce = \'n0nc3v4l\';</script>'
+        '</head><body DATA-CSRF="d4t4c5rf">'
+        '<input type="hidden" name="a" value="v1"/><INPUT value="v2" NAME="b"><input name="a" value="v1">'
+        '<input name="empty" value=""><input name="c" data-token="t0k3n" value="v3">'
+        '</body></html>'
+    )
+    points = TrafficExtractor()._extract_from_html(html, 0, "/u", 200)
+
+    assert [(p.name, p.value) for p in points] == [
+        ("csrf-token", "m1e2t3a4"), ("api_token", "c0nt3nt"),
+        ("sessionToken", "s3ss10n"), ("nonce", "n0nc3v4l"),
+        ("data-CSRF", "d4t4c5rf"),
+        ("a", "v1"), ("b", "v2"), ("c", "v3"), ("data-token", "t0k3n"),
+    ]
+    assert points[5].extractor_hint.pattern == 'name="a"[^>]*value="([^"]*)"'
+    assert re.search(points[2].extractor_hint.pattern, html).group(1) == "s3ss10n"
+
+
+def test_content_cache_restamps_repeated_bodies():
+    har = build_capture(entries=40, items_per_response=3)
+    body = har.log.entries[0].response.content
+    for entry in har.log.entries[::2]:
+        entry.response.content = body.model_copy()
+
+    cached = TrafficExtractor(har)
+    assert cached.extract_all() == TrafficExtractor(har, content_cache_size=0).extract_all()
+
+    _, response_points = cached.extract_all()
+    first, repeated = (
+        [p for p in response_points if p.response_index == index and p.location is DataLocation.RESPONSE_JSON]
+        for index in (0, 2)
+    )
+    assert [p.value for p in first] == [p.value for p in repeated]
+    assert repeated[0].url == har.log.entries[2].request.url
+    assert repeated[0].extractor_hint is not first[0].extractor_hint
+    assert cached.content_cache.stats.hits >= 19
+
+    fresh = TrafficExtractor(har)
+    _, response_points = fresh.extract_all()
+    for point in response_points:
+        point.extractor_hint.variable_name = "edited"
+    _, response_points = fresh.extract_all()
+    assert all(p.extractor_hint.variable_name is None for p in response_points)
+
+
+def test_points_are_slotted_and_share_strings():
+    def entry(token):
+        # Fresh string objects, as parsed from separate HAR entries.
+        url, name = "".join(["https://app.example.com/", "poll"]), "".join(["X-", "Token"])
+        return Entry(
+            started_date_time="2024-01-01T10:00:00Z", time=1,
+            request=Request(method="GET", url=url, headers=[Record(name=name, value=token)]),
+            response=Response(status=200, status_text="OK", content=Content(size=0, mime_type="text/plain")),
+            cache=Cache(), timings=Timings(send=0, wait=0, receive=0),
+        )
+
+    har = HarFile(log=Log(version="1.2", creator=Creator(name="t", version="1"), entries=[entry("t-1"), entry("t-2")]))
+    first, second = TrafficExtractor(har).extract_all()[0]
+
+    assert not hasattr(first, "__dict__")
+    assert first.url is second.url and first.name is second.name
+
+
+def test_hints_copy_replace_and_pickle():
+    hints = [
+        JsonExtractorHint(json_path="$.a[0].id", match_nr=2),
+        RegexExtractorHint(variable_name="v", pattern="id=(\\d+)", group=2),
+        HeaderExtractorHint(header_name="X-Token"),
+        CookieExtractorHint(cookie_name="sid"),
+    ]
+
+    assert pickle.loads(pickle.dumps(hints)) == hints
+    assert replace(hints[0], variable_name="id").json_path == "$.a[0].id"
+    assert JsonExtractorHint(json_path=render_json_path(("a", 0, "id")), match_nr=2) == hints[0]
+
+    copied = copy.copy(hints[1])
+    copied.variable_name = "other"
+    assert copied.pattern == hints[1].pattern and hints[1].variable_name == "v"
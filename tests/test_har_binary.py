@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from traffic_builder.converters_to_har.saz_to_har_converter import convert_saz_to_har, save_har
+from traffic_builder.har_parsers.har_binary import (
+    HarBinaryReader, HarBinaryWriter, binary_to_har, binary_to_jtl, binary_to_saz, har_to_binary, saz_to_binary,
+)
+from traffic_builder.har_parsers.har_parser import parse_har
+from traffic_builder.har_parsers.pydantic_models import Creator, Page, PageTimings
+from traffic_builder.jtl_parser.csv_jtl_parser import load_csv_jtl
+from traffic_builder.saz_parser.saz_parser import parse_saz
+from tests.helpers import write_saz
+
+
+SESSIONS = [
+    ('GET', 'http://example.com/a?x=1', 200, 'Red', '{"token": "абв"}'.encode()),
+    ('POST', 'http://example.com/b', 302, None, b''),
+    ('GET', 'http://example.com/c', 500, 'Blue', b'<html>error</html>'),
+]
+
+
+def test_har_binary_round_trip_and_random_access(tmp_path):
+    write_saz(tmp_path / 'capture.saz', SESSIONS)
+    har = convert_saz_to_har(parse_saz(tmp_path / 'capture.saz'))
+    har.log.pages = [
+        Page(
+            started_date_time=har.log.entries[0].started_date_time,
+            id='page_1',
+            title='Главная',
+            page_timings=PageTimings(on_content_load=120, on_load=340),
+        ),
+    ]
+    har.log.comment = 'login flow'
+    for entry in har.log.entries:
+        entry.pageref = 'page_1'
+    save_har(har, tmp_path / 'capture.har')
+
+    assert har_to_binary(tmp_path / 'capture.har', tmp_path / 'capture.harb') == 3
+
+    with HarBinaryReader(tmp_path / 'capture.harb') as reader:
+        assert len(reader) == 3
+        assert reader[2] == har.log.entries[2]
+        assert reader[-3] == har.log.entries[0]
+        assert reader.entry(0, include_bodies=False).response.content.text == ''
+        assert reader.to_har_file() == parse_har(tmp_path / 'capture.har')
+        with pytest.raises(IndexError):
+            reader.entry(3)
+
+    binary_to_har(tmp_path / 'capture.harb', tmp_path / 'back.har')
+    assert json.loads((tmp_path / 'back.har').read_text()) == json.loads((tmp_path / 'capture.har').read_text())
+
+
+def test_har_binary_converts_to_saz_and_jtl(tmp_path):
+    write_saz(tmp_path / 'capture.saz', SESSIONS)
+    saz_to_binary(tmp_path / 'capture.saz', tmp_path / 'capture.harb')
+
+    assert binary_to_saz(tmp_path / 'capture.harb', tmp_path / 'back.saz') == 3
+    original = parse_saz(tmp_path / 'capture.saz').sessions
+    restored = parse_saz(tmp_path / 'back.saz').sessions
+    assert [(s.request.request_line.url, s.response.status_line.status_code, bytes(s.response.body)) for s in restored] == \
+        [(s.request.request_line.url, s.response.status_line.status_code, bytes(s.response.body)) for s in original]
+    har_timers = ('client_begin_request', 'fiddler_begin_request', 'server_got_request', 'server_begin_response')
+    assert [[getattr(s.metadata.timers, t) for t in har_timers] for s in restored] == \
+        [[getattr(s.metadata.timers, t) for t in har_timers] for s in original]
+
+    assert binary_to_jtl(tmp_path / 'capture.harb', tmp_path / 'capture.jtl') == 3
+    results = load_csv_jtl(tmp_path / 'capture.jtl')
+    assert [results.sample(i).response_code for i in range(3)] == ['200', '302', '500']
+    assert [results.sample(i).success for i in range(3)] == [True, True, False]
+
+
+def test_har_binary_writer_removes_partial_file_on_error(tmp_path):
+    write_saz(tmp_path / 'capture.saz', SESSIONS)
+    entries = convert_saz_to_har(parse_saz(tmp_path / 'capture.saz')).log.entries
+
+    with pytest.raises(RuntimeError):
+        with HarBinaryWriter(tmp_path / 'capture.harb', Creator(name='test', version='1')) as writer:
+            writer.write(entries[0])
+            raise RuntimeError('capture interrupted')
+
+    assert not (tmp_path / 'capture.harb').exists()
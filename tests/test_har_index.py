@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from traffic_builder.har_parsers.har_index import HarIndex, default_index_path
+from traffic_builder.har_parsers.har_parser import parse_har
+
+
+def make_entry(i, text):
+    return {
+        "startedDateTime": "2024-01-01T10:00:00Z",
+        "time": i,
+        "request": {"method": "GET", "url": f"http://example.com/{i}?q=[{{\"]", "headers": []},
+        "response": {"status": 200, "statusText": "OK", "content": {"size": len(text), "mimeType": "text/plain", "text": text}},
+        "cache": {},
+        "timings": {"send": 0, "wait": i, "receive": 0},
+    }
+
+
+def test_har_index_reads_single_entries_and_persists(tmp_path):
+    har_path = tmp_path / 'capture.har'
+    texts = ['{"entries": [1]}', 'Привет, мир', 'a\\"b]}', '']
+    har = {"log": {
+        "version": "1.2",
+        "creator": {"name": "test", "version": "1", "entries": {"not": "these"}},
+        "pages": [],
+        "entries": [make_entry(i, text) for i, text in enumerate(texts)],
+    }}
+    har_path.write_text(json.dumps(har, indent=2, ensure_ascii=False), encoding='utf-8')
+    expected = parse_har(har_path).log.entries
+
+    with HarIndex(har_path) as index:
+        assert len(index) == 4
+        assert [index[i] for i in range(4)] == expected
+        assert index[-1] == expected[-1]
+    assert default_index_path(har_path).exists()
+
+    # The persisted index is reused while the HAR is unchanged.
+    stamp = default_index_path(har_path).read_bytes()
+    assert HarIndex(har_path, persist=False)[1].response.content.text == 'Привет, мир'
+    assert default_index_path(har_path).read_bytes() == stamp
+
+    # Any change to the HAR invalidates the index.
+    har["log"]["entries"] = har["log"]["entries"][:2]
+    har_path.write_text(json.dumps(har), encoding='utf-8')
+    assert len(HarIndex(har_path)) == 2
+
+
+def test_har_index_rejects_truncated_entries(tmp_path):
+    har_path = tmp_path / 'capture.har'
+    text = json.dumps({"log": {"version": "1.2", "entries": [make_entry(0, 'x'), make_entry(1, 'y ]}')]}})
+    har_path.write_text(text[:text.index('y ]}') + 2], encoding='utf-8')
+
+    with pytest.raises(ValueError, match="truncated"):
+        HarIndex(har_path, persist=False)
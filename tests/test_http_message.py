@@ -0,0 +1,47 @@
+import gzip
+
+from traffic_builder.saz_parser.http_message import decode_body, parse_request, parse_response
+
+
+def test_binary_body_is_preserved():
+    body = bytes(range(256)) * 4
+    raw = b'POST http://example.com/upload HTTP/1.1\r\nHost: example.com\r\nContent-Length: 1024\r\n\r\n' + body
+
+    request = parse_request(raw)
+
+    assert request.request_line.method == 'POST'
+    assert request.request_line.url == 'http://example.com/upload'
+    assert [h.name for h in request.headers] == ['Host', 'Content-Length']
+    assert isinstance(request.body, memoryview)
+    assert request.body == body
+
+
+def test_chunked_gzip_body_is_decoded_on_demand():
+    payload = b'{"token": "abc123"}'
+    compressed = gzip.compress(payload)
+    chunked = (
+        f'{len(compressed[:10]):x}\r\n'.encode() + compressed[:10] + b'\r\n'
+        + f'{len(compressed[10:]):x}\r\n'.encode() + compressed[10:] + b'\r\n'
+        + b'0\r\n\r\n'
+    )
+    raw = (
+        b'HTTP/1.1 200 OK\r\n'
+        b'Content-Type: application/json\r\n'
+        b'Transfer-Encoding: chunked\r\n'
+        b'Content-Encoding: gzip\r\n\r\n'
+    ) + chunked
+
+    response = parse_response(raw)
+
+    assert response.status_line.status_code == 200
+    assert response.status_line.status_text == 'OK'
+    assert response.body == chunked
+    assert decode_body(response.headers, response.body) == (payload, len(compressed))
+
+
+def test_message_without_body():
+    response = parse_response(b'HTTP/1.1 304 Not Modified\r\nETag: "x"\r\n\r\n')
+
+    assert response.status_line.status_code == 304
+    assert len(response.body) == 0
+    assert decode_body(response.headers, response.body) == (b'', 0)
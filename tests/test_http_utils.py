@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+
+from traffic_builder import http_utils
+
+
+def test_cached_parsing_returns_fresh_models():
+    http_utils.clear_caches()
+    url = "https://example.com/a?x=1&x=2&=etag"
+
+    first = http_utils.parse_query_string(url)
+    second = http_utils.parse_query_string(url)
+
+    assert [(r.name, r.value) for r in first] == [("x", "1"), ("x", "2"), ("etag", "")]
+    assert first == second and first[0] is not second[0]
+    assert http_utils.cache_info()["query_string"].hits == 1
+
+
+def test_set_cookie_attributes():
+    headers = [
+        SimpleNamespace(name="Set-Cookie", value="sid=abc=1; Path=/app; Domain=.example.com; HttpOnly; Secure"),
+        SimpleNamespace(name="set-cookie", value="broken"),
+        SimpleNamespace(name="Content-Type", value="text/html"),
+    ]
+
+    cookies = http_utils.parse_cookies_from_headers(headers)
+
+    assert len(cookies) == 1
+    assert cookies[0].model_dump(by_alias=True, include={"name", "value", "path", "domain", "http_only", "secure"}) == {
+        "name": "sid", "value": "abc=1", "path": "/app", "domain": ".example.com", "httpOnly": True, "secure": True,
+    }
@@ -0,0 +1,199 @@
+from traffic_builder.jtl_parser.csv_jtl_parser import iter_csv_jtl, load_csv_jtl
+from traffic_builder.jtl_parser.jtl_parser import _ResponseDataStripper, iter_jtl, parse_jtl
+
+
+def write_xml_jtl(path, samples):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', '<testResults version="1.2">']
+    for ts, elapsed, label, success, body in samples:
+        lines.append(
+            f'<httpSample t="{elapsed}" lt="{elapsed // 2}" ts="{ts}" s="{str(success).lower()}" lb="{label}" rc="200" hn="node1">'
+            f'<responseData class="java.lang.String">{body}</responseData>'
+            f'<java.net.URL>http://example.com/{label}</java.net.URL>'
+            '</httpSample>'
+        )
+    lines.append('</testResults>')
+    path.write_text('\n'.join(lines), encoding='utf-8')
+
+
+def test_iter_jtl_skips_response_data_across_chunk_boundaries(tmp_path, monkeypatch):
+    jtl_path = tmp_path / 'results.jtl'
+    write_xml_jtl(jtl_path, [
+        (1000 + i, 10 + i, f'L{i % 3}', i % 4 != 0, '&lt;html&gt;' * (i * 50))
+        for i in range(40)
+    ])
+    monkeypatch.setattr(_ResponseDataStripper, 'CHUNK_SIZE', 7)
+
+    samples = list(iter_jtl(jtl_path))
+
+    assert [s.timestamp for s in samples] == [1000 + i for i in range(40)]
+    assert all(s.response_data == '' for s in samples)
+    assert samples[5].url == 'http://example.com/L2'
+    assert parse_jtl(jtl_path).version == '1.2'
+    assert list(iter_jtl(jtl_path, include_response_data=True))[3].response_data.startswith('<html>')
+
+
+CSV_HEADER = 'timeStamp,elapsed,label,responseCode,responseMessage,threadName,dataType,success,failureMessage,bytes,sentBytes,grpThreads,allThreads,URL,Latency,IdleTime,Connect'
+
+
+def write_csv_jtl(path, rows, header=True):
+    lines = [CSV_HEADER] if header else []
+    for ts, elapsed, label, success in rows:
+        lines.append(
+            f'{ts},{elapsed},"{label}",{200 if success else 500},OK,TG 1-1,text,{str(success).lower()},'
+            f'{"" if success else "Assertion failed"},100,50,1,1,http://example.com/x,{elapsed // 2},0,3'
+        )
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def test_load_csv_jtl_builds_columns_and_samples(tmp_path):
+    rows = [(1000 + i, 10 * i, 'Search, items' if i % 2 else 'Login', i != 3) for i in range(25)]
+    with_header = tmp_path / 'with_header.csv'
+    without_header = tmp_path / 'without_header.csv'
+    write_csv_jtl(with_header, rows)
+    write_csv_jtl(without_header, rows, header=False)
+
+    results = load_csv_jtl(with_header, chunk_size=4)
+
+    assert len(results) == 25
+    assert list(results.elapsed) == [10 * i for i in range(25)]
+    assert list(results.success).count(False) == 1
+    assert sorted(set(results.label.values) - {''}) == ['Login', 'Search, items']
+
+    sample = results.sample(3)
+    assert sample.label == 'Search, items'
+    assert sample.success is False
+    assert sample.latency == 15
+    assert sample.assertion_results[0].failure_message == 'Assertion failed'
+
+    streamed = list(iter_csv_jtl(without_header, chunk_size=7))
+    assert [s.timestamp for s in streamed] == [s.timestamp for s in results]
+
+
+def test_result_store_aggregate_matches_exact_statistics(tmp_path):
+    import numpy as np
+    from traffic_builder.jtl_parser.result_store import ResultStore, load_result_store
+
+    rng = np.random.default_rng(7)
+    elapsed = rng.integers(1, 5000, size=2000)
+    rows = [(1000 + i * 5, int(e), 'A' if i % 3 else 'B', i % 10 != 0) for i, e in enumerate(elapsed)]
+    csv_path = tmp_path / 'results.csv'
+    write_csv_jtl(csv_path, rows)
+
+    store = load_result_store(csv_path)
+    stats = {s.label: s for s in store.aggregate()}
+
+    b = np.sort(elapsed[::3])
+    assert stats['B'].count == len(b)
+    assert stats['B'].percentiles[90] == b[int(np.ceil(len(b) * 0.9)) - 1]
+    assert stats['B'].mean == b.mean()
+    assert stats['TOTAL'].count == 2000
+    assert stats['TOTAL'].error_percent == 10.0
+    assert store.throughput_windows(1000).counts.sum() == 2000
+
+    from_samples = ResultStore.from_samples(load_csv_jtl(csv_path))
+    assert {s.label: s.percentiles for s in from_samples.aggregate()} == {l: s.percentiles for l, s in stats.items()}
+
+
+
+def test_result_store_from_csv_matches_xml_store(tmp_path):
+    from traffic_builder.jtl_parser.result_store import load_result_store
+
+    rows = [(1000 + i * 300, 10 + i, ['Login', 'Search', 'Logout'][i % 3], i % 5 != 0) for i in range(30)]
+    write_csv_jtl(tmp_path / 'results.csv', rows)
+    write_xml_jtl(tmp_path / 'results.jtl', [(ts, elapsed, label, success, '') for ts, elapsed, label, success in rows])
+
+    csv_store = load_result_store(tmp_path / 'results.csv')
+    xml_store = load_result_store(tmp_path / 'results.jtl')
+
+    assert csv_store.labels == xml_store.labels == ['Login', 'Search', 'Logout']
+    csv_windows, xml_windows = csv_store.throughput_windows(1000), xml_store.throughput_windows(1000)
+    assert csv_windows.labels == xml_windows.labels
+    assert (csv_windows.counts == xml_windows.counts).all() and (csv_windows.errors == xml_windows.errors).all()
+    assert [(s.label, s.count, s.error_count, s.percentiles) for s in csv_store.aggregate()] == \
+        [(s.label, s.count, s.error_count, s.percentiles) for s in xml_store.aggregate()]
+    assert csv_store.select('Search').labels == ['Search'] and len(csv_store.select('Search')) == 10
+
+def test_merge_jtl_orders_samples_across_generators(tmp_path):
+    from traffic_builder.jtl_parser.jtl_merge import merge_jtl, merge_jtl_to_file
+
+    write_xml_jtl(tmp_path / 'gen1.jtl', [(1000 + i * 3, 5, 'A', True, '') for i in range(10)])
+    write_csv_jtl(tmp_path / 'gen2.csv', [(1001 + i * 2, 5, 'B', True) for i in range(10)])
+    write_csv_jtl(tmp_path / 'gen3.csv', [(1010 - i if i < 3 else 1010 + i * 5, 5, 'C', True) for i in range(10)])
+    paths = [tmp_path / 'gen1.jtl', tmp_path / 'gen2.csv', tmp_path / 'gen3.csv']
+
+    merged = list(merge_jtl(paths, reorder_window_ms=10))
+
+    assert len(merged) == 30
+    assert [s.timestamp for s in merged] == sorted(s.timestamp for s in merged)
+    assert {s.hostname for s in merged} == {'node1', 'gen2', 'gen3'}
+
+    output = tmp_path / 'merged.csv'
+    assert merge_jtl_to_file(paths, output, hostnames=['g1', 'g2', 'g3'], reorder_window_ms=10) == 30
+    assert sorted(set(load_csv_jtl(output).hostname.values) - {''}) == ['g1', 'g2', 'g3']
+
+
+
+def test_merge_jtl_reorders_samples_written_on_completion(tmp_path):
+    from traffic_builder.jtl_parser.jtl_merge import merge_jtl
+
+    # (start, elapsed) pairs written in completion order, as JMeter does.
+    samples = [(1000 + i * 50, 2000 if i % 7 == 0 else 20 + i) for i in range(40)]
+    samples.sort(key=lambda sample: sample[0] + sample[1])
+    write_xml_jtl(tmp_path / 'gen1.jtl', [(ts, elapsed, 'A', True, '') for ts, elapsed in samples])
+    write_csv_jtl(tmp_path / 'gen2.csv', [(1010 + i * 40, 5, 'B', True) for i in range(40)])
+    paths = [tmp_path / 'gen1.jtl', tmp_path / 'gen2.csv']
+
+    merged = [s.timestamp for s in merge_jtl(paths)]
+    assert merged == sorted(merged) and len(merged) == 80
+
+    unbuffered = [s.timestamp for s in merge_jtl(paths, reorder_window_ms=0)]
+    assert unbuffered != sorted(unbuffered)
+
+def test_convert_jtl_file_to_har_streams_entries(tmp_path):
+    from traffic_builder.converters_to_har.jtl_to_har_conterter import convert_jtl_file_to_har, convert_jtl_to_har
+    from traffic_builder.har_parsers.har_parser import parse_har
+    from traffic_builder.har_parsers.har_writer import HarWriter
+
+    jtl_path = tmp_path / 'results.jtl'
+    write_xml_jtl(jtl_path, [(1000 + i * 10, 20 + i, f'L{i}', i != 2, f'body {i}') for i in range(5)])
+
+    assert convert_jtl_file_to_har(jtl_path, tmp_path / 'results.har', include_response_data=True) == 5
+
+    har = parse_har(tmp_path / 'results.har')
+    assert har.log.creator.name == 'JMeter' and har.log.browser.name == 'JMeter'
+    assert len(har.log.entries) == 5
+    assert [e.request.url for e in har.log.entries] == [f'http://example.com/L{i}' for i in range(5)]
+    assert [e.response.content.text for e in har.log.entries] == [f'body {i}' for i in range(5)]
+    assert [e.time for e in har.log.entries] == [20.0 + i for i in range(5)]
+    in_memory = convert_jtl_to_har(parse_jtl(jtl_path)).log.entries
+    assert [e.started_date_time for e in har.log.entries] == [e.started_date_time for e in in_memory]
+
+    csv_path = tmp_path / 'results.csv'
+    write_csv_jtl(csv_path, [(1000, 10, 'Login', True), (1005, 30, 'Search', False)])
+    assert convert_jtl_file_to_har(csv_path, tmp_path / 'csv.har') == 2
+    assert [e.response.status for e in parse_har(tmp_path / 'csv.har').log.entries] == [200, 500]
+
+    write_xml_jtl(tmp_path / 'empty.jtl', [])
+    assert convert_jtl_file_to_har(tmp_path / 'empty.jtl', tmp_path / 'empty.har') == 0
+    assert parse_har(tmp_path / 'empty.har').log.entries == []
+
+    with HarWriter(tmp_path / 'compact.har', har.log.creator, indent=None) as writer:
+        writer.write_all(har.log.entries)
+    assert parse_har(tmp_path / 'compact.har').log.entries == har.log.entries
+
+
+def test_har_writer_removes_partial_file_on_error(tmp_path):
+    import pytest
+    from traffic_builder.converters_to_har.jtl_to_har_conterter import iter_har_entries
+    from traffic_builder.har_parsers.har_writer import HarWriter
+    from traffic_builder.har_parsers.pydantic_models import Creator
+
+    write_xml_jtl(tmp_path / 'results.jtl', [(1000, 20, 'L0', True, '')])
+    entry = next(iter_har_entries(iter_jtl(tmp_path / 'results.jtl')))
+
+    with pytest.raises(RuntimeError):
+        with HarWriter(tmp_path / 'results.har', Creator(name='test', version='1')) as writer:
+            writer.write(entry)
+            raise RuntimeError('capture interrupted')
+
+    assert not (tmp_path / 'results.har').exists()
@@ -0,0 +1,43 @@
+import json
+
+from traffic_analizator.analyzer import TrafficAnalyzer
+from traffic_analizator.prefilter import ValuePrefilter, char_entropy
+from traffic_builder.har_parsers.har_parser import parse_har
+from tests.helpers import write_har
+
+
+def test_prefilter_rejection_reasons():
+    prefilter = ValuePrefilter(max_length=64)
+
+    assert prefilter.rejection_reason("abc") == "short"
+    assert prefilter.rejection_reason("x" * 65) == "long"
+    assert prefilter.rejection_reason("False") == "static"
+    assert prefilter.rejection_reason("2024-01-01T10:00:00.123Z") == "timestamp"
+    assert prefilter.rejection_reason("0000") == "entropy"
+    assert prefilter.rejection_reason("aaaaaaab") == "entropy"
+    assert prefilter.rejection_reason("1024") is None
+    assert prefilter.rejection_reason("f3a9c1d2e8b7") is None
+    assert char_entropy("abab") == 1.0
+
+    derived = TrafficAnalyzer(min_value_length=3, prefilter=ValuePrefilter()).prefilter
+    assert derived.min_length == 3 and derived.rejection_reason("a1b") is None
+    assert TrafficAnalyzer(min_value_length=3, prefilter=ValuePrefilter(min_length=6)).prefilter.min_length == 6
+
+
+def test_analyzer_reports_pruned_values(tmp_path):
+    write_har(tmp_path / "capture.har", "tok-8c1f2e")
+    data = json.loads((tmp_path / "capture.har").read_text())
+    data["log"]["entries"][0]["response"]["content"]["text"] = json.dumps(
+        {"token": "tok-8c1f2e", "ok": True, "updated": "2024-01-01", "code": "0000"}
+    )
+    (tmp_path / "capture.har").write_text(json.dumps(data))
+    har = parse_har(tmp_path / "capture.har")
+
+    plain = TrafficAnalyzer().analyze(har)
+    report = TrafficAnalyzer(prefilter=ValuePrefilter()).analyze(har)
+
+    assert report.prefilter.pruned == {"static": 1, "timestamp": 1, "entropy": 1}
+    assert report.prefilter.kept == 1 and len(report.response_data_points) == 1
+    assert [c.response_point.value for c in report.correlations] == \
+        [c.response_point.value for c in plain.correlations] == ["tok-8c1f2e"]
+    assert plain.prefilter is None
@@ -0,0 +1,84 @@
+import numpy as np
+
+from traffic_builder.jtl_parser.models import HttpSample
+from traffic_builder.jtl_parser.quantile_sketch import LatencySketches, QuantileSketch
+
+
+PERCENTILES = (1, 10, 25, 50, 75, 90, 95, 99, 99.9)
+
+
+def assert_within_relative_error(sketch: QuantileSketch, values: np.ndarray, accuracy: float):
+    for p in PERCENTILES:
+        exact = np.percentile(values, p, method='inverted_cdf')
+        estimate = sketch.quantile(p / 100.0)
+        assert abs(estimate - exact) <= accuracy * exact + 1e-9, (p, exact, estimate)
+
+
+def test_sketch_error_bound_on_synthetic_latencies():
+    rng = np.random.default_rng(42)
+    datasets = [
+        rng.lognormal(mean=5.0, sigma=1.2, size=200_000).round(),
+        rng.exponential(scale=300.0, size=100_000).round() + 1,
+        np.concatenate([rng.normal(80, 5, 50_000), rng.normal(2500, 300, 5_000)]).clip(1).round(),
+    ]
+
+    for accuracy in (0.01, 0.02):
+        for values in datasets:
+            sketch = QuantileSketch(relative_accuracy=accuracy)
+            sketch.add_many(values)
+
+            assert sketch.count == len(values)
+            assert sketch.mean == values.mean()
+            assert_within_relative_error(sketch, values, accuracy)
+
+
+def test_scalar_and_bulk_insertion_agree():
+    values = np.random.default_rng(1).integers(0, 10_000, size=5_000)
+    bulk = QuantileSketch()
+    bulk.add_many(values)
+    scalar = QuantileSketch()
+    for value in values.tolist():
+        scalar.add(value)
+
+    assert bulk.to_dict() == scalar.to_dict()
+
+
+def test_merged_node_sketches_match_single_sketch_after_serialization(tmp_path):
+    rng = np.random.default_rng(3)
+    nodes = []
+    all_values = {'Login': [], 'Search': []}
+
+    for node in range(3):
+        sketches = LatencySketches(window_ms=10_000)
+        for i in range(20_000):
+            label = 'Login' if i % 4 == 0 else 'Search'
+            elapsed = int(rng.lognormal(4 + node * 0.5, 0.8)) + 1
+            all_values[label].append(elapsed)
+            sketches.add(HttpSample(ts=1_000_000 + i * 7, t=elapsed, lb=label, s=True))
+        path = tmp_path / f'node{node}.json'
+        sketches.save(path)
+        nodes.append(path)
+
+    merged = LatencySketches.merge_files(nodes)
+
+    assert merged.labels() == ['Login', 'Search']
+    assert len(merged.by_window('Login')) == 14
+    for label, sketch in merged.by_label().items():
+        assert sketch.count == len(all_values[label])
+        assert_within_relative_error(sketch, np.array(all_values[label]), merged.relative_accuracy)
+
+
+def test_add_columns_matches_per_sample_insertion():
+    rng = np.random.default_rng(5)
+    timestamps = np.sort(rng.integers(0, 300_000, size=10_000))
+    elapsed = rng.integers(1, 3_000, size=10_000)
+    codes = rng.integers(0, 3, size=10_000)
+    labels = ['A', 'B', 'C']
+
+    columnar = LatencySketches(window_ms=60_000)
+    columnar.add_columns(timestamps, elapsed, codes, labels)
+    per_sample = LatencySketches(window_ms=60_000)
+    for ts, value, code in zip(timestamps.tolist(), elapsed.tolist(), codes.tolist()):
+        per_sample.add(HttpSample(ts=ts, t=value, lb=labels[code], s=True))
+
+    assert columnar.to_dict() == per_sample.to_dict()
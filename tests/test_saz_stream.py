@@ -0,0 +1,106 @@
+import gzip
+import logging
+
+from tests.helpers import write_saz
+from traffic_builder.converters_to_har.saz_to_har_converter import iter_har_entries
+from traffic_builder.saz_parser import http_message, saz_parser
+from traffic_builder.saz_parser.models import SessionFilter
+from traffic_builder.saz_parser.saz_parser import iter_saz, parse_saz
+
+
+def test_iter_saz_applies_filters_before_loading(tmp_path, monkeypatch):
+    saz_path = tmp_path / 'capture.saz'
+    write_saz(saz_path, [
+        ('GET', 'http://example.com/a', 200, 'Red', b'{"a": 1}'),
+        ('POST', 'http://example.com/b', 200, 'Red', b'\x00\x01\x02'),
+        ('POST', 'http://example.com/c', 500, 'Blue', b''),
+        ('POST', 'http://example.com/d', 200, None, b''),
+    ])
+
+    sessions = list(iter_saz(saz_path, SessionFilter(methods=['post'], status_codes=[200], flags={'ui-color': 'Red'})))
+
+    assert [s.session_id for s in sessions] == [2]
+    assert sessions[0].response.body == b'\x00\x01\x02'
+    assert len(parse_saz(saz_path).sessions) == 4
+    assert [s.session_id for s in iter_saz(saz_path, SessionFilter(flags={'ui-color': None}))] == [1, 2, 3]
+
+    start_lines = []
+    monkeypatch.setattr(saz_parser, '_read_start_line', lambda zf, name: start_lines.append(name) or '')
+    assert [s.session_id for s in iter_saz(saz_path, SessionFilter(flags={'ui-color': 'Red'}))] == [1, 2]
+    assert start_lines == []
+
+
+def test_undecodable_bodies_are_kept_raw(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(http_message, 'brotli', None)
+    payload = b'{"token": "abc123"}'
+    compressed = gzip.compress(payload)
+    chunked = f'{len(compressed):x}\r\n'.encode() + compressed + b'\r\n0\r\n\r\n'
+    saz_path = tmp_path / 'capture.saz'
+    write_saz(saz_path, [
+        ('GET', 'http://example.com/br', 200, None, b'br-body', 'Content-Encoding: br'),
+        ('GET', 'http://example.com/gz', 200, None, b'not gzip at all', 'Content-Encoding: gzip'),
+        ('GET', 'http://example.com/cut', 200, None, b'ff\r\n{"a": 1', 'Transfer-Encoding: chunked'),
+        ('GET', 'http://example.com/ok', 200, None, chunked, 'Transfer-Encoding: chunked', 'Content-Encoding: gzip'),
+    ])
+
+    with caplog.at_level(logging.WARNING):
+        entries = list(iter_har_entries(iter_saz(saz_path)))
+
+    assert [e.response.content.text for e in entries[:3]] == ['br-body', 'not gzip at all', 'ff\r\n{"a": 1']
+    assert [e.response.content.compression for e in entries[:3]] == [0, 0, 0]
+    assert len(caplog.records) == 3
+    assert entries[3].response.content.text == payload.decode()
+    assert entries[3].response.content.compression == len(payload) - len(compressed)
+
+
+def test_add_saz_file_to_scope_builds_samplers(tmp_path):
+    from jmx_builder.models.tree import HTTPSamplerProxy, HeaderManager, TransactionController
+    from payloads.har_saz_payloads import SazGroupingMode, add_saz_file_to_scope, create_http_sampler_from_saz
+    from traffic_builder.converters_to_har.saz_to_har_converter import convert_saz_file_to_har
+    from traffic_builder.har_parsers.har_parser import parse_har
+
+    saz_path = tmp_path / 'capture.saz'
+    write_saz(saz_path, [
+        ('GET', 'https://example.com:8443/search?q=abc&page=2', 200, 'Red', b'{"a": 1}'),
+        ('POST', 'http://example.com/login', 302, 'Red', b''),
+        ('GET', 'http://example.com/', 200, 'Blue', b''),
+        ('GET', 'http://example.com/logout', 200, 'Red', b''),
+    ])
+
+    sampler = create_http_sampler_from_saz(next(iter_saz(saz_path)))
+    assert sampler.testname == 'GET /search'
+    assert (sampler.protocol.value, sampler.domain.value, sampler.port.value, sampler.path.value) == \
+        ('https', 'example.com', 8443, '/search')
+    assert (sampler.get_argument_value('q'), sampler.get_argument_value('page')) == ('abc', '2')
+
+    root = TransactionController.create_default('root')
+    add_saz_file_to_scope(root, saz_path, filter=SessionFilter(methods=['GET']))
+    assert [child.testname for child in root.children] == ['GET /search', 'GET /', 'GET /logout']
+    assert all(isinstance(child, HTTPSamplerProxy) for child in root.children)
+    header_manager = root.children[1].children[0]
+    assert isinstance(header_manager, HeaderManager)
+    assert header_manager.get_header_value('Host') == 'example.com'
+
+    by_change = TransactionController.create_default('root')
+    add_saz_file_to_scope(by_change, saz_path, SazGroupingMode.BY_COLOR_CHANGE)
+    assert [(tc.testname, len(tc.children)) for tc in by_change.children] == [
+        ('Transaction Controller 1 (Red)', 2),
+        ('Transaction Controller 2 (Blue)', 1),
+        ('Transaction Controller 3 (Red)', 1),
+    ]
+
+    by_color = TransactionController.create_default('root')
+    add_saz_file_to_scope(by_color, saz_path, 'by_unique_colors')
+    assert [(tc.testname, len(tc.children)) for tc in by_color.children] == [('Red Requests', 3), ('Blue Requests', 1)]
+
+    assert convert_saz_file_to_har(saz_path, tmp_path / 'capture.har') == 4
+    har = parse_har(tmp_path / 'capture.har')
+    assert [(e.request.method, e.request.url, e.response.status) for e in har.log.entries] == [
+        ('GET', 'https://example.com:8443/search?q=abc&page=2', 200),
+        ('POST', 'http://example.com/login', 302),
+        ('GET', 'http://example.com/', 200),
+        ('GET', 'http://example.com/logout', 200),
+    ]
+    assert har.log.entries[0].response.content.text == '{"a": 1}'
+    assert convert_saz_file_to_har(saz_path, tmp_path / 'empty.har', filter=SessionFilter(methods=['PUT'])) == 0
+    assert parse_har(tmp_path / 'empty.har').log.entries == []
@@ -0,0 +1,150 @@
+import json
+import random
+
+from llm.models.structure import StructureOutput, TransactionDefinition
+from traffic_analizator.analyzer import TrafficAnalyzer
+from traffic_analizator.models import Encoding, MatchType
+from traffic_analizator.streaming import StreamingCorrelator, iter_correlations
+from traffic_builder.har_parsers.pydantic_models import (
+    Cache, Content, Creator, Entry, HarFile, Log, Record, Request, Response, Timings,
+)
+from traffic_builder.http_utils import parse_query_string
+
+
+def make_entry(url, request_headers, response_body, started="2024-01-01T10:00:00Z"):
+    return Entry(
+        started_date_time=started,
+        time=1,
+        request=Request(
+            method="GET", url=url, query_string=parse_query_string(url),
+            headers=[Record(name=n, value=v) for n, v in request_headers],
+        ),
+        response=Response(
+            status=200, status_text="OK",
+            content=Content(size=0, mime_type="application/json", text=json.dumps(response_body)),
+        ),
+        cache=Cache(),
+        timings=Timings(send=0, wait=0, receive=0),
+    )
+
+
+def correlation_key(correlation):
+    return (
+        correlation.request_point.request_index, correlation.request_point.name,
+        correlation.response_point.response_index, correlation.response_point.name,
+        correlation.match_type,
+    )
+
+
+def random_entries(rng, count):
+    seen: list[str] = []
+    entries = []
+    for index in range(count):
+        values = [f"v{rng.randrange(10 ** 6):06d}" for _ in range(rng.randint(0, 3))]
+        ref = rng.choice(seen) if seen else "none"
+        entries.append(make_entry(
+            f"https://app.example.com/p{index}?ref={ref}&ids=x{ref}y&list={ref};{rng.choice(seen or [ref])}",
+            [("X-Ref", rng.choice(seen))] if seen else [],
+            {"items": values},
+        ))
+        seen.extend(values)
+    return entries
+
+
+def test_streaming_correlator_matches_batch_analyzer():
+    entries = random_entries(random.Random(5), 80)
+    har = HarFile(log=Log(version="1.2", creator=Creator(name="t", version="1"), entries=entries))
+
+    for search_window in (None, 3):
+        for source_policy in ("first", "nearest"):
+            report = TrafficAnalyzer(search_window=search_window, source_policy=source_policy).analyze(har)
+            correlator = StreamingCorrelator(search_window=search_window, source_policy=source_policy)
+            correlations, unresolved = [], []
+            for entry in entries:
+                entry_correlations, entry_unresolved = correlator.feed(entry)
+                correlations.extend(entry_correlations)
+                unresolved.extend(entry_unresolved)
+
+            assert [correlation_key(c) for c in correlations] == [correlation_key(c) for c in report.correlations]
+            assert unresolved == report.unresolved
+            assert {c.match_type for c in correlations} == set(MatchType)
+
+
+def test_streaming_window_evicts_old_responses():
+    entries = [
+        make_entry("https://app.example.com/login", [], {"token": "secret-token"}),
+        make_entry("https://app.example.com/a", [], {}),
+        make_entry("https://app.example.com/b", [("X-Token", "secret-token")], {}),
+    ]
+
+    assert [c.response_point.response_index for c in iter_correlations(entries)] == [0]
+    assert list(iter_correlations(entries, search_window=1)) == []
+
+    correlator = StreamingCorrelator(search_window=1)
+    for entry in entries:
+        correlator.feed(entry)
+    assert "secret-token" not in correlator.index
+    assert correlator.unresolved_count == 1
+
+
+def test_time_and_transaction_windows():
+    def entry(second, body, token=None):
+        return make_entry(
+            f"https://app.example.com/s{second}", [("X-Token", token)] if token else [], body,
+            started=f"2024-01-01T10:00:{second:02d}Z",
+        )
+
+    entries = [
+        entry(0, {"token": "login-token"}),
+        entry(6, {"token": "other-token"}),
+        entry(20, {}, token="login-token"),
+        entry(25, {}, token="other-token"),
+    ]
+    har = HarFile(log=Log(version="1.2", creator=Creator(name="t", version="1"), entries=entries))
+    transactions = StructureOutput(transactions=[
+        TransactionDefinition(name="Login", start_index=0, end_index=0),
+        TransactionDefinition(name="Work", start_index=1, end_index=3),
+    ])
+
+    def sources(**windows):
+        report = TrafficAnalyzer(**windows).analyze(har)
+        streamed = list(TrafficAnalyzer(**windows).iter_correlations(entries))
+        assert [correlation_key(c) for c in streamed] == [correlation_key(c) for c in report.correlations]
+        return {c.request_point.request_index: c.response_point.response_index for c in report.correlations}
+
+    assert sources() == {2: 0, 3: 1}
+    assert sources(time_window=20) == {2: 0, 3: 1}
+    assert sources(time_window=19.5) == {3: 1}
+    assert sources(transactions=transactions) == {3: 1}
+    assert sources(transactions=transactions, transaction_window=1) == {2: 0, 3: 1}
+
+    # Start times are trimmed together with the indexed responses.
+    correlator = StreamingCorrelator(time_window=10)
+    for second in range(0, 600, 2):
+        started = f"2024-01-01T10:{second // 60:02d}:{second % 60:02d}Z"
+        correlator.feed(make_entry("https://app.example.com/poll", [], {}, started=started))
+    assert len(correlator.index._added) <= 6 and len(correlator._start_times) <= 12
+
+
+def test_encoded_values_are_exact_matches_with_encoding_tag():
+    entries = [
+        make_entry("https://app.example.com/login", [], {"token": "a/b+c=d", "user": "demo:s3cret"}),
+        make_entry("https://app.example.com/page", [], {"html": "x&amp;y=z1"}),
+        make_entry("https://app.example.com/a", [("X-Token", "a%2Fb%2Bc%3Dd"), ("Authorization", "ZGVtbzpzM2NyZXQ=")], {}),
+        make_entry("https://app.example.com/b", [("X-Value", "x&y=z1")], {}),
+    ]
+    har = HarFile(log=Log(version="1.2", creator=Creator(name="t", version="1"), entries=entries))
+    report = TrafficAnalyzer().analyze(har)
+
+    found = {
+        (c.request_point.name, c.response_point.name): (c.match_type, c.encoding) for c in report.correlations
+    }
+    assert found == {
+        ("X-Token", "token"): (MatchType.EXACT, Encoding.URL),
+        ("Authorization", "user"): (MatchType.EXACT, Encoding.BASE64),
+        ("X-Value", "html"): (MatchType.EXACT, Encoding.HTML_ENTITY),
+    }
+    streamed = list(iter_correlations(entries))
+    assert [(correlation_key(c), c.encoding) for c in streamed] == [
+        (correlation_key(c), c.encoding) for c in report.correlations
+    ]
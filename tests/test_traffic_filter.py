@@ -0,0 +1,43 @@
+from traffic_builder.har_parsers.pydantic_models import (
+    Cache, Content, Creator, Entry, HarFile, Log, PostData, Request, Response, Timings,
+)
+from traffic_builder.traffic_filter import TrafficFilter, filter_har
+
+
+def make_entry(method, url, mime_type="application/json", body=None):
+    return Entry(
+        started_date_time="2024-01-01T10:00:00Z",
+        time=1,
+        request=Request(
+            method=method, url=url,
+            post_data=PostData(mime_type="application/json", text=body) if body is not None else None,
+        ),
+        response=Response(status=200, status_text="OK", content=Content(size=0, mime_type=mime_type)),
+        cache=Cache(),
+        timings=Timings(send=0, wait=0, receive=0),
+    )
+
+
+def test_filter_har_drops_static_hosts_and_duplicates():
+    entries = [
+        make_entry("GET", "https://app.example.com/api/login"),
+        make_entry("GET", "https://app.example.com/logo"),
+        make_entry("GET", "https://cdn.example.com/app.js?v=1", mime_type="application/octet-stream"),
+        make_entry("GET", "https://app.example.com/img", mime_type="image/png; q=1"),
+        make_entry("POST", "https://app.example.com/api/data", body='{"a": 1}'),
+        make_entry("POST", "https://app.example.com/api/data", body='{"a": 1}'),
+        make_entry("POST", "https://app.example.com/api/data", body='{"a": 2}'),
+        make_entry("GET", "https://tracker.analytics.io/collect"),
+        make_entry("GET", "https://app.example.com/api/login"),
+    ]
+    har = HarFile(log=Log(version="1.2", creator=Creator(name="t", version="1"), entries=entries))
+
+    filtered, report = filter_har(har, TrafficFilter(deny_hosts=["*.analytics.io"]))
+
+    assert report.source_indexes == [0, 1, 4, 6]
+    assert filtered.log.entries == [entries[i] for i in report.source_indexes]
+    assert report.removed == {"extension": 1, "mime_type": 1, "duplicate": 2, "host": 1}
+    assert report.total == 9 and report.kept == 4 and report.removed_total == 5
+
+    _, report = filter_har(har, TrafficFilter(allow_hosts=["app.example.com"], deduplicate=False))
+    assert report.removed == {"extension": 1, "mime_type": 1, "host": 1}
@@ -0,0 +1,74 @@
+from collections import deque
+from typing import Iterable
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher. Built once over a set of patterns,
+    `find_all(text)` reports every pattern occurring in `text` in one pass
+    over the text, independent of the number of patterns.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: list[str] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._pattern_id: list[int] = [-1]
+        # Nearest node on the fail chain that ends a pattern (0 = none).
+        self._output_link: list[int] = [0]
+
+        for pattern in dict.fromkeys(patterns):
+            if pattern:
+                self._add(pattern)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _add(self, pattern: str) -> None:
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._pattern_id.append(-1)
+                self._output_link.append(0)
+            node = next_node
+        self._pattern_id[node] = len(self.patterns)
+        self.patterns.append(pattern)
+
+    def _build_links(self) -> None:
+        goto, fail, pattern_id, output_link = self._goto, self._fail, self._pattern_id, self._output_link
+        queue = deque(goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fallback = goto[state].get(char, 0)
+                fail[child] = fallback if fallback != child else 0
+                output_link[child] = fail[child] if pattern_id[fail[child]] >= 0 else output_link[fail[child]]
+
+    def find_all(self, text: str) -> set[int]:
+        """Ids (indexes into `patterns`) of all patterns contained in `text`."""
+        goto, fail, pattern_id, output_link = self._goto, self._fail, self._pattern_id, self._output_link
+        found: set[int] = set()
+        node = 0
+
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            match = node if pattern_id[node] >= 0 else output_link[node]
+            while match:
+                found.add(pattern_id[match])
+                match = output_link[match]
+
+        return found
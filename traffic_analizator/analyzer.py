@@ -1,8 +1,15 @@
-from traffic_builder.har_parsers.pydantic_models import HarFile
+import time
+from typing import Iterable, Iterator, Optional
 
-from .models import AnalysisReport
+from llm.models.structure import StructureOutput
+from traffic_builder.har_parsers.pydantic_models import Entry, HarFile
+
+from .models import AnalysisReport, Correlation, SourcePolicy
 from .extractor import TrafficExtractor
+from .content_cache import DEFAULT_CONTENT_CACHE_SIZE
 from .correlator import TrafficCorrelator
+from .prefilter import ValuePrefilter
+from .streaming import StreamingCorrelator
 
 
 class TrafficAnalyzer:
@@ -12,19 +19,47 @@ class TrafficAnalyzer:
         min_value_length: int = 4,
         search_window: int | None = None,
         ignore_cookies: bool = False,
+        source_policy: SourcePolicy = SourcePolicy.FIRST,
+        extract_workers: int | None = 1,
+        prefilter: Optional[ValuePrefilter] = None,
+        content_cache_size: int = DEFAULT_CONTENT_CACHE_SIZE,
+        time_window: float | None = None,
+        transactions: Optional[StructureOutput] = None,
+        transaction_window: int = 0,
     ):
         self.min_value_length = min_value_length
         self.search_window = search_window
         self.ignore_cookies = ignore_cookies
+        self.source_policy = source_policy
+        self.extract_workers = extract_workers
+        self.prefilter = prefilter.for_min_value_length(min_value_length) if prefilter is not None else None
+        self.content_cache_size = content_cache_size
+        self.time_window = time_window
+        self.transactions = transactions
+        self.transaction_window = transaction_window
     
     def analyze(self, har: HarFile) -> AnalysisReport:
-        extractor = TrafficExtractor(har, ignore_cookies=self.ignore_cookies)
-        request_points, response_points = extractor.extract_all()
+        started = time.perf_counter()
+        extractor = TrafficExtractor(
+            har,
+            ignore_cookies=self.ignore_cookies,
+            prefilter=self.prefilter,
+            content_cache_size=self.content_cache_size,
+        )
+        request_points, response_points = extractor.extract_all(max_workers=self.extract_workers)
+        extraction_seconds = time.perf_counter() - started
         
         correlator = TrafficCorrelator(
             min_value_length=self.min_value_length,
             search_window=self.search_window,
+            source_policy=self.source_policy,
+            time_window=self.time_window,
+            transactions=self.transactions,
+            transaction_window=self.transaction_window,
         )
+        started = time.perf_counter()
+        if self.time_window is not None:
+            correlator.add_entry_times(har.log.entries)
         correlations, unresolved = correlator.find_correlations(
             request_points, response_points
         )
@@ -34,9 +69,26 @@ class TrafficAnalyzer:
             response_data_points=response_points,
             correlations=correlations,
             unresolved=unresolved,
+            prefilter=extractor.prefilter_report,
+            content_cache=extractor.content_cache.stats if extractor.content_cache is not None else None,
+            extraction_seconds=extraction_seconds,
+            correlation_seconds=time.perf_counter() - started,
         )
         
         return report
+    
+    def iter_correlations(self, entries: Iterable[Entry]) -> Iterator[Correlation]:
+        correlator = StreamingCorrelator(
+            min_value_length=self.min_value_length,
+            search_window=self.search_window,
+            source_policy=self.source_policy,
+            ignore_cookies=self.ignore_cookies,
+            prefilter=self.prefilter,
+            time_window=self.time_window,
+            transactions=self.transactions,
+            transaction_window=self.transaction_window,
+        )
+        return correlator.iter_correlations(entries)
 
 
 def analyze_har(
@@ -44,10 +96,22 @@ def analyze_har(
     min_value_length: int = 4,
     search_window: int | None = None,
     ignore_cookies: bool = True,
+    source_policy: SourcePolicy = SourcePolicy.FIRST,
+    prefilter: Optional[ValuePrefilter] = None,
+    content_cache_size: int = DEFAULT_CONTENT_CACHE_SIZE,
+    time_window: float | None = None,
+    transactions: Optional[StructureOutput] = None,
+    transaction_window: int = 0,
 ) -> AnalysisReport:
     analyzer = TrafficAnalyzer(
         min_value_length=min_value_length,
         search_window=search_window,
         ignore_cookies=ignore_cookies,
+        source_policy=source_policy,
+        prefilter=prefilter,
+        content_cache_size=content_cache_size,
+        time_window=time_window,
+        transactions=transactions,
+        transaction_window=transaction_window,
     )
     return analyzer.analyze(har)
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+Batch analysis of many captures (one per user journey).
+
+Each file is loaded and analyzed in a worker process; the pool size bounds how
+many captures are parsed at once. Results come back per file with timings and
+are combined into a summary with the overall entries/second throughput.
+"""
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+from traffic_builder.capture_loader import is_capture_file, load_capture
+from traffic_builder.traffic_filter import FilterReport, TrafficFilter, filter_har
+
+from .analyzer import TrafficAnalyzer
+from .models import AnalysisReport
+
+
+SUMMARY_FILE_NAME = "summary.log"
+
+
+@dataclass
+class FileAnalysisResult:
+    path: Path
+    entries: int = 0
+    load_seconds: float = 0.0
+    filter_seconds: float = 0.0
+    analyze_seconds: float = 0.0
+    report: AnalysisReport | None = None
+    filter_report: FilterReport | None = None
+    error: str = ""
+
+    @property
+    def seconds(self) -> float:
+        return self.load_seconds + self.filter_seconds + self.analyze_seconds
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.entries / self.seconds if self.seconds > 0 else 0.0
+
+    def to_str(self) -> str:
+        if self.error:
+            return f"{self.path.name}: ERROR {self.error}"
+        report = self.report
+        filter_time = f" + filter {self.filter_seconds:.2f}s" if self.filter_report is not None else ""
+        return (
+            f"{self.path.name}: {self.entries} entries, "
+            f"{len(report.correlations)} correlations, {len(report.unresolved)} unresolved, "
+            f"load {self.load_seconds:.2f}s{filter_time} + analyze {self.analyze_seconds:.2f}s "
+            f"({self.entries_per_second:.0f} entries/s)"
+        )
+
+
+@dataclass
+class BatchSummary:
+    results: list[FileAnalysisResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    workers: int = 1
+
+    @property
+    def failed(self) -> list[FileAnalysisResult]:
+        return [r for r in self.results if r.error]
+
+    @property
+    def total_entries(self) -> int:
+        return sum(r.entries for r in self.results)
+
+    @property
+    def total_correlations(self) -> int:
+        return sum(len(r.report.correlations) for r in self.results if r.report)
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.total_entries / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_str(self) -> str:
+        lines = ["=" * 80, "BATCH ANALYSIS SUMMARY", "=" * 80]
+        lines.extend(result.to_str() for result in self.results)
+        lines.append("-" * 80)
+        lines.append(
+            f"Files: {len(self.results)} ({len(self.failed)} failed), workers: {self.workers}, "
+            f"entries: {self.total_entries}, correlations: {self.total_correlations}"
+        )
+        lines.append(f"Wall time: {self.wall_seconds:.2f}s, throughput: {self.entries_per_second:.0f} entries/s")
+        lines.append("=" * 80)
+        return "\n".join(lines)
+
+
+def collect_capture_paths(sources: str | Path | Iterable[str | Path]) -> list[Path]:
+    """Accepts directories, glob patterns and file paths (or a list of them)."""
+    if isinstance(sources, (str, Path)):
+        sources = [sources]
+
+    paths: list[Path] = []
+    for source in sources:
+        source_path = Path(source)
+        if source_path.is_dir():
+            candidates = sorted(source_path.iterdir())
+        elif source_path.exists():
+            candidates = [source_path]
+        else:
+            candidates = sorted(Path(p) for p in glob.glob(str(source), recursive=True))
+        paths.extend(p for p in candidates if p.is_file() and is_capture_file(p))
+
+    return list(dict.fromkeys(paths))
+
+
+def report_paths(paths: list[Path]) -> list[Path]:
+    """
+    Report file names for `paths`, relative to their common directory, so
+    same-named captures from different directories don't overwrite each other
+    (or `summary.log`); a numeric suffix resolves any remaining clash.
+    """
+    if not paths:
+        return []
+    resolved = [path.resolve() for path in paths]
+    root = Path(os.path.commonpath([path.parent for path in resolved]))
+    used = {Path(SUMMARY_FILE_NAME)}
+    names = []
+    for path in resolved:
+        relative = path.relative_to(root)
+        name = relative.with_name(f"{relative.name}.log")
+        suffix = 1
+        while name in used:
+            suffix += 1
+            name = relative.with_name(f"{relative.name}.{suffix}.log")
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def analyze_file(
+    path: Path,
+    analyzer: TrafficAnalyzer,
+    traffic_filter: Optional[TrafficFilter] = None
+) -> FileAnalysisResult:
+    result = FileAnalysisResult(path=path)
+    try:
+        started = time.perf_counter()
+        har = load_capture(path)
+        result.load_seconds = time.perf_counter() - started
+
+        if traffic_filter is not None:
+            started = time.perf_counter()
+            har, result.filter_report = filter_har(har, traffic_filter)
+            result.filter_seconds = time.perf_counter() - started
+        result.entries = len(har.log.entries)
+
+        started = time.perf_counter()
+        result.report = analyzer.analyze(har)
+        result.analyze_seconds = time.perf_counter() - started
+    except Exception as ex:
+        result.error = f"{type(ex).__name__}: {ex}"
+    return result
+
+
+def analyze_batch(
+    sources: str | Path | Iterable[str | Path],
+    analyzer: Optional[TrafficAnalyzer] = None,
+    traffic_filter: Optional[TrafficFilter] = None,
+    max_workers: Optional[int] = None,
+    output_dir: str | Path | None = None
+) -> BatchSummary:
+    """
+    Analyzes every capture in `sources` on a pool of at most `max_workers`
+    processes (`max_workers=1` runs in-process). Results keep the input order;
+    with `output_dir` each report is written to `<capture path>.log`, the path
+    taken relative to the common directory of the inputs (see `report_paths`).
+    """
+    analyzer = analyzer or TrafficAnalyzer()
+    paths = collect_capture_paths(sources)
+    started = time.perf_counter()
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(paths)))
+
+    if workers == 1:
+        results = [analyze_file(path, analyzer, traffic_filter) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                analyze_file, paths, [analyzer] * len(paths), [traffic_filter] * len(paths)
+            ))
+
+    summary = BatchSummary(results=results, wall_seconds=time.perf_counter() - started, workers=workers)
+
+    if output_dir is not None:
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for result, name in zip(results, report_paths(paths)):
+            if result.report is not None:
+                report_path = output_dir / name
+                report_path.parent.mkdir(parents=True, exist_ok=True)
+                report_path.write_text(result.report.to_str(), encoding='utf-8')
+        (output_dir / SUMMARY_FILE_NAME).write_text(summary.to_str(), encoding='utf-8')
+
+    return summary
@@ -0,0 +1,51 @@
+"""
+Bounded LRU cache of data points extracted from response bodies.
+
+Polling endpoints and repeated config requests return byte-identical bodies;
+keyed by (content hash, MIME type), such a body is parsed and flattened once
+and later responses get copies of its points.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Generic, Optional, TypeVar
+
+from .models import ContentCacheStats
+
+
+T = TypeVar("T")
+
+DEFAULT_CONTENT_CACHE_SIZE = 256
+
+
+def content_key(text: str, mime_type: str) -> tuple[bytes, str]:
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    return digest, mime_type
+
+
+class ContentCache(Generic[T]):
+
+    def __init__(self, max_entries: int = DEFAULT_CONTENT_CACHE_SIZE):
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        self.max_entries = max_entries
+        self.stats = ContentCacheStats()
+        self._entries: OrderedDict[tuple[bytes, str], T] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple[bytes, str]) -> Optional[T]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry
+
+    def put(self, key: tuple[bytes, str], entry: T) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
@@ -4,7 +4,8 @@ from collections import defaultdict
 from llm.models.correlation import CorrelationInput, TargetUsage, UsageType
 from traffic_analizator.extractors.json_extractor import JsonExtractorHint
 from traffic_analizator.models import AnalysisReport, Correlation, DataLocation, MatchType
-from traffic_builder.har_parsers.pydantic_models import HarFile
+from traffic_builder.har_parsers.har_index import HarIndex
+from traffic_builder.har_parsers.pydantic_models import Entry, HarFile
 
 
 LOCATION_TO_USAGE_TYPE = {
@@ -64,9 +65,12 @@ class GroupedCorrelation:
 
 class CorrelationGrouper:
     
-    def __init__(self, har: HarFile):
+    def __init__(self, har: HarFile | HarIndex):
         self.har = har
-        self.entries = har.log.entries
+        # HarIndex parses only the response entries the groups refer to.
+        self.entries = har if isinstance(har, HarIndex) else har.log.entries
+        # Several groups usually share one response; each entry is parsed once.
+        self._entry_cache: dict[int, Entry] = {}
     
     def group(self, report: AnalysisReport) -> list[CorrelationInput]:
         grouped = self._group_by_source(report.correlations)
@@ -122,6 +126,12 @@ class CorrelationGrouper:
         import re
         return re.sub(r'\[\d+\]', '[*]', path)
     
+    def _entry(self, index: int) -> Entry:
+        entry = self._entry_cache.get(index)
+        if entry is None:
+            entry = self._entry_cache[index] = self.entries[index]
+        return entry
+    
     def _build_correlation_input(
         self, 
         source_key: SourceKey, 
@@ -133,7 +143,7 @@ class CorrelationGrouper:
         first_corr = group.correlations[0]
         resp_point = first_corr.response_point
         
-        entry = self.entries[source_key.response_index]
+        entry = self._entry(source_key.response_index)
         response_body = ""
         if entry.response.content and entry.response.content.text:
             response_body = entry.response.content.text
@@ -205,6 +215,6 @@ class CorrelationGrouper:
         )
 
 
-def group_correlations(report: AnalysisReport, har: HarFile) -> list[CorrelationInput]:
+def group_correlations(report: AnalysisReport, har: HarFile | HarIndex) -> list[CorrelationInput]:
     grouper = CorrelationGrouper(har)
     return grouper.group(report)
\ No newline at end of file
@@ -1,20 +1,203 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable
+
+from llm.models.structure import StructureOutput
+from traffic_builder.har_parsers.pydantic_models import Entry
+
+from .aho_corasick import AhoCorasick
+from .encodings import decoded_forms
 from .models import (
     Correlation,
+    Encoding,
     MatchType,
     RequestDataPoint,
     ResponseDataPoint,
+    STATIC_VALUES,
+    SourcePolicy,
 )
 
 
+def entry_timestamp(entry: Entry) -> float:
+    """`startedDateTime` of `entry` in seconds; naive values are local time."""
+    value = entry.started_date_time
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value).timestamp()
+
+
+def transaction_floors(transactions: StructureOutput, transaction_window: int = 0) -> dict[int, int]:
+    """
+    Lowest response index searchable for each entry covered by a transaction:
+    the start of its transaction, or of the `transaction_window`-th one before.
+    """
+    ordered = sorted(transactions.transactions, key=lambda tx: tx.start_index)
+    floors: dict[int, int] = {}
+    for ordinal, tx in enumerate(ordered):
+        floor = ordered[max(0, ordinal - transaction_window)].start_index
+        for index in range(tx.start_index, tx.end_index + 1):
+            # Entries of overlapping transactions keep the wider scope.
+            floors[index] = min(floors.get(index, floor), floor)
+    return floors
+
+
+@dataclass
+class SourceCandidates:
+    """
+    Response points carrying one value, sorted by (response_index, position
+    in response_points), so the source for a request is found with bisect.
+    """
+    response_indexes: list[int] = field(default_factory=list)
+    positions: list[int] = field(default_factory=list)
+    points: list[ResponseDataPoint] = field(default_factory=list)
+
+    @classmethod
+    def from_positions(cls, positions: list[int], response_points: list[ResponseDataPoint]) -> "SourceCandidates":
+        points = [response_points[p] for p in positions]
+        response_indexes = [point.response_index for point in points]
+        # Extraction emits points in entry order, so the lists are normally sorted already.
+        if any(a > b for a, b in zip(response_indexes, response_indexes[1:])):
+            order = sorted(range(len(points)), key=lambda i: (response_indexes[i], positions[i]))
+            positions = [positions[i] for i in order]
+            points = [points[i] for i in order]
+            response_indexes = [response_indexes[i] for i in order]
+        return cls(response_indexes=response_indexes, positions=list(positions), points=points)
+
+    def select(self, req_index: int, min_index: int, policy: SourcePolicy) -> int | None:
+        """
+        Position in this list of the source for a request at `req_index`:
+        the earliest (FIRST) or latest (NEAREST) response in
+        [min_index, req_index); for NEAREST, the first point of that response.
+        """
+        indexes = self.response_indexes
+        if policy is SourcePolicy.NEAREST:
+            i = bisect_left(indexes, req_index) - 1
+            if i < 0 or indexes[i] < min_index:
+                return None
+            return bisect_left(indexes, indexes[i], 0, i)
+        
+        i = bisect_left(indexes, min_index)
+        if i == len(indexes) or indexes[i] >= req_index:
+            return None
+        return i
+
+
+class ResponseIndex:
+    """
+    Exact-value index over response points. Candidate lists are materialized
+    on first lookup, most values are never requested.
+    """
+
+    def __init__(self, response_points: list[ResponseDataPoint], min_value_length: int):
+        self._response_points = response_points
+        self._min_value_length = min_value_length
+        self._positions: dict[str, list[int]] = {}
+        self._candidates: dict[str, SourceCandidates] = {}
+        # Decoded form -> encoding -> positions of the values decoding to it; built on first lookup.
+        self._decoded_positions: dict[str, dict[Encoding, list[int]]] | None = None
+        self._decoded_candidates: dict[tuple[str, Encoding], SourceCandidates] = {}
+        
+        for position, point in enumerate(response_points):
+            if len(point.value) >= min_value_length:
+                self._positions.setdefault(point.value, []).append(position)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._positions
+
+    def __getitem__(self, value: str) -> SourceCandidates:
+        candidates = self._candidates.get(value)
+        if candidates is None:
+            candidates = SourceCandidates.from_positions(self._positions[value], self._response_points)
+            self._candidates[value] = candidates
+        return candidates
+
+    def encoded_candidates(self, value: str) -> list[tuple[Encoding, SourceCandidates]]:
+        """Candidates whose values decode to `value`, per encoding."""
+        if self._decoded_positions is None:
+            self._decoded_positions = {}
+            for indexed, positions in self._positions.items():
+                for encoding, decoded in decoded_forms(indexed, self._min_value_length):
+                    self._decoded_positions.setdefault(decoded, {}).setdefault(encoding, []).extend(positions)
+        
+        result: list[tuple[Encoding, SourceCandidates]] = []
+        for encoding, positions in self._decoded_positions.get(value, {}).items():
+            candidates = self._decoded_candidates.get((value, encoding))
+            if candidates is None:
+                candidates = SourceCandidates.from_positions(sorted(positions), self._response_points)
+                self._decoded_candidates[(value, encoding)] = candidates
+            result.append((encoding, candidates))
+        return result
+
+
+class ContainsIndex:
+    """
+    Aho–Corasick automaton over response values; candidates of a pattern
+    are materialized on first match.
+    """
+
+    def __init__(self, positions: dict[str, list[int]], response_points: list[ResponseDataPoint]):
+        self.matcher = AhoCorasick(positions)
+        self._positions = [positions[pattern] for pattern in self.matcher.patterns]
+        self._response_points = response_points
+        self._candidates: dict[int, SourceCandidates] = {}
+
+    def candidates(self, pattern_id: int) -> SourceCandidates:
+        candidates = self._candidates.get(pattern_id)
+        if candidates is None:
+            candidates = SourceCandidates.from_positions(self._positions[pattern_id], self._response_points)
+            self._candidates[pattern_id] = candidates
+        return candidates
+
+
 class TrafficCorrelator:
     
     def __init__(
         self,
         min_value_length: int = 4,
         search_window: int | None = None,
+        source_policy: SourcePolicy = SourcePolicy.FIRST,
+        time_window: float | None = None,
+        transactions: StructureOutput | None = None,
+        transaction_window: int = 0,
     ):
+        """
+        Sources are searched in the responses preceding the request, limited
+        by every window that is set: the last `search_window` entries, entries
+        started at most `time_window` seconds earlier (times are given with
+        `add_entry_times`), and the request's transaction plus
+        `transaction_window` transactions before it. Entries outside all
+        transactions are not limited by transactions.
+        """
         self.min_value_length = min_value_length
         self.search_window = search_window
+        self.source_policy = SourcePolicy(source_policy)
+        self.time_window = time_window
+        self.transaction_floors = (
+            transaction_floors(transactions, transaction_window) if transactions is not None else None
+        )
+        # Running maximum of entry start times, non-decreasing so it can be bisected;
+        # `_start_times[0]` belongs to entry `_times_offset` (see `_trim_entry_times`).
+        self._start_times: list[float] = []
+        self._times_offset = 0
+    
+    def add_entry_times(self, entries: Iterable[Entry]) -> None:
+        """Appends start times of the next entries, in entry order."""
+        times = self._start_times
+        for entry in entries:
+            timestamp = entry_timestamp(entry)
+            times.append(max(timestamp, times[-1]) if times else timestamp)
+    
+    def _trim_entry_times(self, min_index: int) -> None:
+        """
+        Forgets start times of entries before `min_index`, a window bound that
+        never decreases. The list is cut once at least half of it is stale, so
+        it holds at most twice the window.
+        """
+        stale = min_index - self._times_offset
+        if stale > 0 and stale * 2 >= len(self._start_times):
+            del self._start_times[:stale]
+            self._times_offset = min_index
     
     def find_correlations(
         self,
@@ -24,7 +207,12 @@ class TrafficCorrelator:
         correlations: list[Correlation] = []
         unresolved: list[RequestDataPoint] = []
         
+        if self.time_window is not None and request_points:
+            if max(p.request_index for p in request_points) >= self._times_offset + len(self._start_times):
+                raise ValueError("time_window requires start times of all entries, see add_entry_times")
+        
         response_index = self._build_response_index(response_points)
+        contains_index = self._build_contains_index(request_points, response_points)
         
         for req_point in request_points:
             if len(req_point.value) < self.min_value_length:
@@ -33,7 +221,7 @@ class TrafficCorrelator:
             if self._is_static_value(req_point):
                 continue
             
-            correlation = self._find_source(req_point, response_points, response_index)
+            correlation = self._find_source(req_point, response_points, response_index, contains_index)
             
             if correlation:
                 correlations.append(correlation)
@@ -45,39 +233,58 @@ class TrafficCorrelator:
     def _build_response_index(
         self, 
         response_points: list[ResponseDataPoint]
-    ) -> dict[str, list[ResponseDataPoint]]:
-        index: dict[str, list[ResponseDataPoint]] = {}
+    ) -> ResponseIndex:
+        return ResponseIndex(response_points, self.min_value_length)
+    
+    def _build_contains_index(
+        self,
+        request_points: list[RequestDataPoint],
+        response_points: list[ResponseDataPoint],
+    ) -> ContainsIndex:
+        # A CONTAINS source must be strictly shorter than the request value it is found in,
+        # and its first and last k-grams must occur in some request value.
+        k = max(self.min_value_length, 1)
+        max_length = max((len(p.value) for p in request_points), default=0) - 1
+        request_grams = {
+            p.value[i:i + k]
+            for p in request_points
+            for i in range(len(p.value) - k + 1)
+        }
         
-        for point in response_points:
+        positions: dict[str, list[int]] = {}
+        for position, point in enumerate(response_points):
             value = point.value
-            if len(value) < self.min_value_length:
+            if not self.min_value_length <= len(value) <= max_length:
                 continue
-            
-            if value not in index:
-                index[value] = []
-            index[value].append(point)
+            if value[:k] not in request_grams or value[-k:] not in request_grams:
+                continue
+            positions.setdefault(value, []).append(position)
         
-        return index
+        return ContainsIndex(positions, response_points)
     
     def _find_source(
         self,
         req_point: RequestDataPoint,
         response_points: list[ResponseDataPoint],
-        response_index: dict[str, list[ResponseDataPoint]],
+        response_index: ResponseIndex,
+        contains_index: ContainsIndex,
     ) -> Correlation | None:
         req_value = req_point.value
         req_index = req_point.request_index
         
         if req_value in response_index:
             candidates = response_index[req_value]
-            for resp_point in candidates:
-                if resp_point.response_index < req_index:
-                    if self._within_search_window(req_index, resp_point.response_index):
-                        return Correlation(
-                            request_point=req_point,
-                            response_point=resp_point,
-                            match_type=MatchType.EXACT,
-                        )
+            i = candidates.select(req_index, self._min_search_index(req_index), self.source_policy)
+            if i is not None:
+                return Correlation(
+                    request_point=req_point,
+                    response_point=candidates.points[i],
+                    match_type=MatchType.EXACT,
+                )
+        
+        correlation = self._find_encoded_source(req_point, response_index)
+        if correlation:
+            return correlation
         
         if ";" in req_value or "%3B" in req_value:
             correlation = self._find_composite_source(
@@ -86,22 +293,61 @@ class TrafficCorrelator:
             if correlation:
                 return correlation
         
-        correlation = self._find_contains_source(
-            req_point, response_points, response_index
-        )
+        correlation = self._find_contains_source(req_point, contains_index)
         if correlation:
             return correlation
         
         return None
     
+    def _find_encoded_source(
+        self,
+        req_point: RequestDataPoint,
+        response_index: ResponseIndex,
+    ) -> Correlation | None:
+        req_value = req_point.value
+        req_index = req_point.request_index
+        min_index = self._min_search_index(req_index)
+        nearest = self.source_policy is SourcePolicy.NEAREST
+        
+        # The request carries an encoded response value, or a response carries the request value encoded.
+        options = [
+            (encoding, response_index[decoded])
+            for encoding, decoded in decoded_forms(req_value, self.min_value_length)
+            if decoded in response_index
+        ]
+        options.extend(response_index.encoded_candidates(req_value))
+        
+        best_key: tuple[int, int] | None = None
+        best: tuple[Encoding, ResponseDataPoint] | None = None
+        for encoding, candidates in options:
+            i = candidates.select(req_index, min_index, self.source_policy)
+            if i is None:
+                continue
+            source_index = candidates.response_indexes[i]
+            key = (-source_index if nearest else source_index, candidates.positions[i])
+            if best_key is None or key < best_key:
+                best_key = key
+                best = encoding, candidates.points[i]
+        
+        if best is None:
+            return None
+        
+        return Correlation(
+            request_point=req_point,
+            response_point=best[1],
+            match_type=MatchType.EXACT,
+            encoding=best[0],
+        )
+    
     def _find_composite_source(
         self,
         req_point: RequestDataPoint,
         response_points: list[ResponseDataPoint],
-        response_index: dict[str, list[ResponseDataPoint]],
+        response_index: ResponseIndex,
     ) -> Correlation | None:
         req_value = req_point.value
         req_index = req_point.request_index
+        min_index = self._min_search_index(req_index)
         
         separator = ";" if ";" in req_value else "%3B"
         parts = req_value.split(separator)
@@ -118,11 +364,9 @@ class TrafficCorrelator:
         for part in valid_parts:
             if part in response_index:
                 candidates = response_index[part]
-                for resp_point in candidates:
-                    if resp_point.response_index < req_index:
-                        if self._within_search_window(req_index, resp_point.response_index):
-                            found_points.append(resp_point)
-                            break
+                i = candidates.select(req_index, min_index, self.source_policy)
+                if i is not None:
+                    found_points.append(candidates.points[i])
         
         if not found_points:
             return None
@@ -196,61 +440,60 @@ class TrafficCorrelator:
     def _find_contains_source(
         self,
         req_point: RequestDataPoint,
-        response_points: list[ResponseDataPoint],
-        response_index: dict[str, list[ResponseDataPoint]],
+        contains_index: ContainsIndex,
     ) -> Correlation | None:
         req_value = req_point.value
         req_index = req_point.request_index
+        min_index = self._min_search_index(req_index)
+        nearest = self.source_policy is SourcePolicy.NEAREST
         
-        min_search_index = 0
-        if self.search_window is not None:
-            min_search_index = max(0, req_index - self.search_window)
-        
-        for resp_point in response_points:
-            if resp_point.response_index >= req_index:
+        best_key: tuple[int, int] | None = None
+        best_point: ResponseDataPoint | None = None
+        for pattern_id in contains_index.matcher.find_all(req_value):
+            if len(contains_index.matcher.patterns[pattern_id]) == len(req_value):
                 continue
-            
-            if resp_point.response_index < min_search_index:
+            candidates = contains_index.candidates(pattern_id)
+            i = candidates.select(req_index, min_index, self.source_policy)
+            if i is None:
                 continue
-            
-            resp_value = resp_point.value
-            if len(resp_value) < self.min_value_length:
-                continue
-            
-            if resp_value in req_value and resp_value != req_value:
-                return Correlation(
-                    request_point=req_point,
-                    response_point=resp_point,
-                    match_type=MatchType.CONTAINS,
-                )
+            # FIRST: earliest response, NEAREST: latest response; ties go to response_points order.
+            response_index = candidates.response_indexes[i]
+            key = (-response_index if nearest else response_index, candidates.positions[i])
+            if best_key is None or key < best_key:
+                best_key = key
+                best_point = candidates.points[i]
+        
+        if best_point is None:
+            return None
         
-        return None
+        return Correlation(
+            request_point=req_point,
+            response_point=best_point,
+            match_type=MatchType.CONTAINS,
+        )
     
-    def _within_search_window(self, req_index: int, resp_index: int) -> bool:
-        if self.search_window is None:
-            return True
-        return (req_index - resp_index) <= self.search_window
+    def _min_search_index(self, req_index: int) -> int:
+        # Candidate lists are bisected from this bound, earlier responses are never visited.
+        min_index = self._min_window_index(req_index)
+        if self.transaction_floors is not None:
+            min_index = max(min_index, self.transaction_floors.get(req_index, 0))
+        return min_index
+    
+    def _min_window_index(self, req_index: int) -> int:
+        # Count and time bounds only; they never decrease with req_index.
+        min_index = 0
+        if self.search_window is not None:
+            min_index = max(0, req_index - self.search_window)
+        if self.time_window is not None:
+            times, offset = self._start_times, self._times_offset
+            min_index = max(min_index, offset + bisect_left(times, times[req_index - offset] - self.time_window))
+        return min_index
     
     def _is_static_value(self, req_point: RequestDataPoint) -> bool:
         value = req_point.value.lower()
         name = req_point.name.lower()
         
-        static_values = {
-            "true", "false", "null", "none", "undefined",
-            "yes", "no", "on", "off",
-            "get", "post", "put", "delete", "patch",
-            "application/json", "application/x-www-form-urlencoded",
-            "text/html", "text/plain", "multipart/form-data",
-            "utf-8", "utf8", "iso-8859-1",
-            "en", "en-us", "ru", "ru-ru",
-            "gzip", "deflate", "br",
-            "keep-alive", "close",
-            "no-cache", "no-store", "max-age=0",
-            "cors", "same-origin", "navigate",
-            "document", "empty", "script", "style",
-        }
-        
-        if value in static_values:
+        if value in STATIC_VALUES:
             return True
         
         if value.isdigit() and len(value) <= 2:
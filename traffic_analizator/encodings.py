@@ -0,0 +1,74 @@
+"""
+Decoded forms of values for encoding-aware correlation. A request value may
+carry a response value percent-encoded, HTML-escaped, JSON-escaped or
+Base64-wrapped, and the other way round; both sides are matched on their
+decoded forms.
+"""
+import binascii
+import html
+import json
+import re
+from typing import Callable, Optional
+from urllib.parse import unquote
+
+from .models import Encoding
+
+
+_BASE64 = re.compile(r"[A-Za-z0-9+/]+={0,2}|[A-Za-z0-9_-]+={0,2}")
+_BASE64_MIN_LENGTH = 8
+_URLSAFE_ALPHABET = str.maketrans("-_", "+/")
+
+
+def _url_decode(value: str) -> Optional[str]:
+    try:
+        return unquote(value, errors="strict")
+    except UnicodeDecodeError:
+        return None
+
+
+def _html_decode(value: str) -> Optional[str]:
+    return html.unescape(value)
+
+
+def _json_decode(value: str) -> Optional[str]:
+    try:
+        decoded = json.loads(f'"{value}"')
+    except ValueError:
+        return None
+    return decoded if isinstance(decoded, str) else None
+
+
+def _base64_decode(value: str) -> Optional[str]:
+    if len(value) < _BASE64_MIN_LENGTH or len(value) % 4 == 1 or not _BASE64.fullmatch(value):
+        return None
+    if "-" in value or "_" in value:
+        value = value.translate(_URLSAFE_ALPHABET)
+    try:
+        raw = binascii.a2b_base64(value + "=" * (-len(value) % 4))
+    except binascii.Error:
+        return None
+    # Random tokens that happen to be valid Base64 decode to binary, not to text;
+    # decoding with replacement avoids raising for each of them.
+    decoded = raw.decode("utf-8", "replace")
+    return decoded if "\ufffd" not in decoded and decoded.isprintable() else None
+
+
+# Each decoder with a character every value encoded that way contains, if there is one.
+DECODERS: tuple[tuple[Encoding, Optional[str], Callable[[str], Optional[str]]], ...] = (
+    (Encoding.URL, "%", _url_decode),
+    (Encoding.HTML_ENTITY, "&", _html_decode),
+    (Encoding.JSON_ESCAPE, "\\", _json_decode),
+    (Encoding.BASE64, None, _base64_decode),
+)
+
+
+def decoded_forms(value: str, min_length: int = 1) -> list[tuple[Encoding, str]]:
+    """Forms of `value` decoded by each encoding it is valid in, when they differ from it."""
+    forms: list[tuple[Encoding, str]] = []
+    for encoding, marker, decode in DECODERS:
+        if marker is not None and marker not in value:
+            continue
+        decoded = decode(value)
+        if decoded is not None and decoded != value and len(decoded) >= min_length:
+            forms.append((encoding, decoded))
+    return forms
@@ -1,15 +1,27 @@
+import copy
+import gc
 import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from sys import intern
+from typing import Iterator, Optional
 from urllib.parse import parse_qs, urlparse
 
-from traffic_builder.har_parsers.pydantic_models import Entry, HarFile
+from traffic_builder.har_parsers.pydantic_models import Content, Entry, HarFile
 
 from .models import (
+    ContentCacheStats,
     DataLocation,
+    PrefilterReport,
     RequestDataPoint,
     ResponseDataPoint,
 )
+from .content_cache import DEFAULT_CONTENT_CACHE_SIZE, ContentCache, content_key
+from .prefilter import ValuePrefilter
 from .extractors import (
+    ExtractorHint,
     JsonExtractorHint,
     RegexExtractorHint,
     HeaderExtractorHint,
@@ -18,29 +30,231 @@ from .extractors import (
 
 
 
+def iter_json_leaves(data) -> Iterator[tuple[tuple[str | int, ...], object]]:
+    """
+    (path, value) for every non-null scalar of a parsed JSON document in
+    document order. Walks an explicit stack, so depth is not limited by
+    recursion; keys are interned and shared between all paths that use them.
+    """
+    stack = [((), data)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        path, node = pop()
+        node_type = type(node)
+        if node_type is dict:
+            for key, value in reversed(node.items()):
+                push((path + (intern(key),), value))
+        elif node_type is list:
+            for i in range(len(node) - 1, -1, -1):
+                push((path + (i,), node[i]))
+        elif node is not None:
+            yield path, node
+
+
+def iter_json_paths(data) -> Iterator[tuple[str, str, object]]:
+    """
+    (JSONPath, name, value) for every non-null scalar, in the same order as
+    `iter_json_leaves`. The path string is extended one segment per node,
+    which costs about as much as building the tuple; the name is the last
+    key (list indexes skipped), `$` for the root.
+    """
+    stack = [("$", "$", data)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        path, name, node = pop()
+        node_type = type(node)
+        if node_type is dict:
+            for key, value in reversed(node.items()):
+                push((f"{path}.{key}", intern(key), value))
+        elif node_type is list:
+            for i in range(len(node) - 1, -1, -1):
+                push((f"{path}[{i}]", name, node[i]))
+        elif node is not None:
+            yield path, name, node
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Flattening allocates two objects per leaf, none of them cyclic; with the
+    collector on, large documents spend most of their time in GC passes.
+    Switches the collector off for the whole process, see `pause_gc`.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _leaf_name(path: tuple[str | int, ...]) -> str:
+    """Last key of the path (list indexes skipped), `$` for the root."""
+    for segment in reversed(path):
+        if type(segment) is str:
+            return segment
+    return "$"
+
+
+# One sweep over an HTML body: input/meta tags, script bodies and the
+# token-like data-attributes of any other tag.
+_HTML_SCAN = re.compile(
+    r'<(input|meta)\b([^>]*)>'
+    r'|<script\b[^>]*>(.*?)</script\s*>'
+    r'|\bdata-(token|csrf|requesttoken|session)=["\']([^"\']+)["\']',
+    re.IGNORECASE | re.DOTALL,
+)
+_TAG_ATTRIBUTE = re.compile(r'''([^\s"'=<>/]+)\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+_DATA_ATTRIBUTES = {"token", "csrf", "requesttoken", "session"}
+# `csrfToken: "..."`, `"session_id": "..."`, `window.nonce = '...'` inside <script>.
+_SCRIPT_TOKEN = re.compile(
+    r'''(["']?)(?P<name>[\w-]*(?:token|csrf|session|nonce)[\w-]*)\1\s*[:=]\s*(["'])(?P<value>[^"'\\\s]{4,})\3''',
+    re.IGNORECASE,
+)
+
+
+def _tag_attributes(attributes: str) -> dict[str, str]:
+    """Quoted attributes of a tag, names lowercased; the first occurrence wins."""
+    attrs: dict[str, str] = {}
+    for name, double_quoted, single_quoted in _TAG_ATTRIBUTE.findall(attributes):
+        attrs.setdefault(name.lower(), double_quoted or single_quoted)
+    return attrs
+
+
+# Points parsed from one response body, as (location, name, value, hint) templates
+# with hints of their own, and the prefilter counts they produced.
+_PointTemplate = tuple[DataLocation, str, str, ExtractorHint]
+_BodyEntry = tuple[list[_PointTemplate], Optional[PrefilterReport]]
+
+
+def _template(point: ResponseDataPoint) -> _PointTemplate:
+    # Hints are copied both ways: callers fill in `variable_name` per correlation.
+    return point.location, point.name, point.value, copy.copy(point.extractor_hint)
+
+
+def _restamp(template: _PointTemplate, index: int, url: str, status_code: int) -> ResponseDataPoint:
+    location, name, value, hint = template
+    return ResponseDataPoint(index, url, status_code, location, name, value, copy.copy(hint))
+
+
+# Entries per task sent to a worker process.
+PARALLEL_CHUNK_SIZE = 64
+
+_worker_extractor: "TrafficExtractor | None" = None
+
+
+def _init_worker(
+    entries: list[Entry],
+    ignore_cookies: bool,
+    prefilter: Optional[ValuePrefilter],
+    content_cache_size: int,
+    pause_gc: bool,
+) -> None:
+    # Entries are handed over once per worker (inherited as-is under fork), tasks carry only index ranges.
+    global _worker_extractor
+    _worker_extractor = TrafficExtractor(
+        ignore_cookies=ignore_cookies, prefilter=prefilter, content_cache_size=content_cache_size, pause_gc=pause_gc
+    )
+    _worker_extractor.entries = entries
+
+
+def _extract_range(
+    bounds: tuple[int, int]
+) -> tuple[list[RequestDataPoint], list[ResponseDataPoint], Optional[PrefilterReport], Optional[ContentCacheStats]]:
+    # Statistics are returned per task and summed up by the parent.
+    extractor = _worker_extractor
+    if extractor.prefilter is not None:
+        extractor.prefilter_report = PrefilterReport()
+    if extractor.content_cache is not None:
+        extractor.content_cache.stats = ContentCacheStats()
+    request_points, response_points = extractor.extract_range(*bounds)
+    cache_stats = extractor.content_cache.stats if extractor.content_cache is not None else None
+    return request_points, response_points, extractor.prefilter_report, cache_stats
+
 
 class TrafficExtractor:
     
-    def __init__(self, har: HarFile, ignore_cookies: bool = False):
+    def __init__(
+        self,
+        har: HarFile | None = None,
+        ignore_cookies: bool = False,
+        prefilter: Optional[ValuePrefilter] = None,
+        content_cache_size: int = DEFAULT_CONTENT_CACHE_SIZE,
+        pause_gc: bool = False,
+    ):
+        """
+        `content_cache_size=0` disables the response body cache.
+        `pause_gc=True` switches the cyclic garbage collector off while JSON
+        bodies are parsed and flattened, about twice as fast on large ones.
+        The switch is process-wide and not thread-safe: enable it only when
+        nothing else in the process relies on the collector meanwhile.
+        """
         self.har = har
-        self.entries = har.log.entries
+        self.entries = har.log.entries if har is not None else []
         self.ignore_cookies = ignore_cookies
+        self.prefilter = prefilter
+        self.prefilter_report = PrefilterReport() if prefilter is not None else None
+        self.content_cache_size = content_cache_size
+        self.pause_gc = pause_gc
+        self.content_cache: Optional[ContentCache[_BodyEntry]] = (
+            ContentCache(content_cache_size) if content_cache_size > 0 else None
+        )
+    
+    def extract_all(self, max_workers: int | None = 1) -> tuple[list[RequestDataPoint], list[ResponseDataPoint]]:
+        """
+        `max_workers` > 1 (or None for one per CPU) extracts entries on a
+        process pool; points come back in the same order as sequentially.
+        Sending the points back costs about as much as extracting them: with
+        few cores the pool is slower (4x with 2 workers on one CPU), so the
+        default stays sequential.
+        """
+        workers = max(1, min(max_workers or os.cpu_count() or 1, len(self.entries) // PARALLEL_CHUNK_SIZE))
+        if workers == 1:
+            return self.extract_range(0, len(self.entries))
+        
+        request_points: list[RequestDataPoint] = []
+        response_points: list[ResponseDataPoint] = []
+        bounds = [
+            (start, min(start + PARALLEL_CHUNK_SIZE, len(self.entries)))
+            for start in range(0, len(self.entries), PARALLEL_CHUNK_SIZE)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(self.entries, self.ignore_cookies, self.prefilter, self.content_cache_size, self.pause_gc),
+        ) as pool:
+            for chunk_requests, chunk_responses, chunk_report, chunk_cache_stats in pool.map(_extract_range, bounds):
+                request_points.extend(chunk_requests)
+                response_points.extend(chunk_responses)
+                if chunk_report is not None:
+                    self.prefilter_report.merge(chunk_report)
+                if chunk_cache_stats is not None:
+                    self.content_cache.stats.merge(chunk_cache_stats)
+        
+        return request_points, response_points
     
-    def extract_all(self) -> tuple[list[RequestDataPoint], list[ResponseDataPoint]]:
+    def extract_range(self, start: int, stop: int) -> tuple[list[RequestDataPoint], list[ResponseDataPoint]]:
         request_points: list[RequestDataPoint] = []
         response_points: list[ResponseDataPoint] = []
         
-        for index, entry in enumerate(self.entries):
+        for index in range(start, stop):
+            entry = self.entries[index]
             request_points.extend(self._extract_from_request(entry, index))
             response_points.extend(self._extract_from_response(entry, index))
         
         return request_points, response_points
     
+    def _gc_scope(self):
+        return _gc_paused() if self.pause_gc else nullcontext()
+    
+    def extract_entry(self, entry: Entry, index: int) -> tuple[list[RequestDataPoint], list[ResponseDataPoint]]:
+        return self._extract_from_request(entry, index), self._extract_from_response(entry, index)
+    
     def _extract_from_request(self, entry: Entry, index: int) -> list[RequestDataPoint]:
         points: list[RequestDataPoint] = []
         request = entry.request
-        url = request.url
-        method = request.method
+        url = intern(request.url)
+        method = intern(request.method)
         
         for header in request.headers:
             if self._is_skippable_header(header.name):
@@ -50,7 +264,7 @@ class TrafficExtractor:
                 url=url,
                 method=method,
                 location=DataLocation.HEADER,
-                name=header.name,
+                name=intern(header.name),
                 value=header.value,
             ))
         
@@ -60,7 +274,7 @@ class TrafficExtractor:
                 url=url,
                 method=method,
                 location=DataLocation.QUERY_PARAM,
-                name=param.name,
+                name=intern(param.name),
                 value=param.value,
             ))
         
@@ -71,7 +285,7 @@ class TrafficExtractor:
                     url=url,
                     method=method,
                     location=DataLocation.COOKIE,
-                    name=cookie.name,
+                    name=intern(cookie.name),
                     value=cookie.value,
                 ))
         
@@ -83,7 +297,7 @@ class TrafficExtractor:
                         url=url,
                         method=method,
                         location=DataLocation.FORM_PARAM,
-                        name=param.name,
+                        name=intern(param.name),
                         value=param.value,
                     ))
             
@@ -109,57 +323,90 @@ class TrafficExtractor:
     def _extract_from_response(self, entry: Entry, index: int) -> list[ResponseDataPoint]:
         points: list[ResponseDataPoint] = []
         response = entry.response
-        url = entry.request.url
+        url = intern(entry.request.url)
         status_code = response.status
         
         for header in response.headers:
-            if self._is_skippable_response_header(header.name):
+            if self._is_skippable_response_header(header.name) or not self._accepts(header.value):
                 continue
             points.append(ResponseDataPoint(
                 response_index=index,
                 url=url,
                 status_code=status_code,
                 location=DataLocation.RESPONSE_HEADER,
-                name=header.name,
+                name=intern(header.name),
                 value=header.value,
                 extractor_hint=HeaderExtractorHint(header_name=header.name),
             ))
         
         if not self.ignore_cookies:
             for cookie in response.cookies:
+                if not self._accepts(cookie.value):
+                    continue
                 points.append(ResponseDataPoint(
                     response_index=index,
                     url=url,
                     status_code=status_code,
                     location=DataLocation.SET_COOKIE,
-                    name=cookie.name,
+                    name=intern(cookie.name),
                     value=cookie.value,
                     extractor_hint=CookieExtractorHint(cookie_name=cookie.name),
                 ))
         
         if response.content and response.content.text:
-            content_type = response.content.mime_type.lower() if response.content.mime_type else ""
-            text = response.content.text
-            
-            if "json" in content_type or self._looks_like_json(text):
-                json_points = self._try_extract_json_response(text, index, url, status_code)
-                points.extend(json_points)
-            
-            elif "html" in content_type or text.strip().startswith("<"):
-                html_points = self._extract_from_html(text, index, url, status_code)
-                points.extend(html_points)
-            
-            else:
-                if len(text) < 10000:
-                    points.append(ResponseDataPoint(
-                        response_index=index,
-                        url=url,
-                        status_code=status_code,
-                        location=DataLocation.RESPONSE_RAW,
-                        name=None,
-                        value=text,
-                        extractor_hint=RegexExtractorHint(pattern="(.+)"),
-                    ))
+            points.extend(self._extract_from_body(response.content, index, url, status_code))
+        
+        return points
+    
+    def _extract_from_body(self, content: Content, index: int, url: str, status_code: int) -> list[ResponseDataPoint]:
+        cache = self.content_cache
+        if cache is None:
+            return self._parse_body(content, index, url, status_code)
+        
+        key = content_key(content.text, content.mime_type or "")
+        cached = cache.get(key)
+        if cached is not None:
+            template, prefilter_delta = cached
+            if prefilter_delta is not None:
+                self.prefilter_report.merge(prefilter_delta)
+            return [_restamp(point, index, url, status_code) for point in template]
+        
+        # Prefilter counts of this body are kept with the entry and replayed on every hit.
+        report = self.prefilter_report
+        if report is not None:
+            self.prefilter_report = PrefilterReport()
+        points = self._parse_body(content, index, url, status_code)
+        prefilter_delta = None
+        if report is not None:
+            prefilter_delta, self.prefilter_report = self.prefilter_report, report
+            report.merge(prefilter_delta)
+        cache.put(key, ([_template(point) for point in points], prefilter_delta))
+        return points
+    
+    def _parse_body(self, content: Content, index: int, url: str, status_code: int) -> list[ResponseDataPoint]:
+        points: list[ResponseDataPoint] = []
+        content_type = content.mime_type.lower() if content.mime_type else ""
+        text = content.text
+        
+        if "json" in content_type or self._looks_like_json(text):
+            json_points = self._try_extract_json_response(text, index, url, status_code)
+            points.extend(json_points)
+        
+        elif "html" in content_type or text.strip().startswith("<"):
+            html_points = self._extract_from_html(text, index, url, status_code)
+            points.extend(p for p in html_points if self._accepts(p.value))
+        
+        else:
+            if len(text) < 10000 and self._accepts(text):
+                points.append(ResponseDataPoint(
+                    response_index=index,
+                    url=url,
+                    status_code=status_code,
+                    location=DataLocation.RESPONSE_RAW,
+                    name=None,
+                    value=text,
+                    extractor_hint=RegexExtractorHint(pattern="(.+)"),
+                ))
         
         return points
     
@@ -171,43 +418,33 @@ class TrafficExtractor:
         method: str,
         is_request: bool
     ) -> list[RequestDataPoint]:
-        try:
-            data = json.loads(text)
-        except (json.JSONDecodeError, ValueError):
-            return []
-        
         points: list[RequestDataPoint] = []
-        self._flatten_json(data, "$", points, index, url, method)
+        with self._gc_scope():
+            try:
+                data = json.loads(text)
+            except (json.JSONDecodeError, ValueError):
+                return []
+            self._flatten_json(data, points, index, url, method)
         return points
     
     def _flatten_json(
         self,
         data,
-        path: str,
         points: list[RequestDataPoint],
         index: int,
         url: str,
         method: str
     ) -> None:
-        if isinstance(data, dict):
-            for key, value in data.items():
-                new_path = f"{path}.{key}"
-                self._flatten_json(value, new_path, points, index, url, method)
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                new_path = f"{path}[{i}]"
-                self._flatten_json(item, new_path, points, index, url, method)
-        else:
-            if data is not None:
-                points.append(RequestDataPoint(
-                    request_index=index,
-                    url=url,
-                    method=method,
-                    location=DataLocation.BODY_JSON,
-                    name=path.split(".")[-1].split("[")[0],
-                    value=str(data),
-                    json_path=path,
-                ))
+        for path, value in iter_json_leaves(data):
+            points.append(RequestDataPoint(
+                request_index=index,
+                url=url,
+                method=method,
+                location=DataLocation.BODY_JSON,
+                name=_leaf_name(path),
+                value=str(value),
+                path=path,
+            ))
     
     def _try_extract_json_response(
         self,
@@ -216,44 +453,37 @@ class TrafficExtractor:
         url: str,
         status_code: int
     ) -> list[ResponseDataPoint]:
-        try:
-            data = json.loads(text)
-        except (json.JSONDecodeError, ValueError):
-            return []
-        
         points: list[ResponseDataPoint] = []
-        self._flatten_json_response(data, "$", points, index, url, status_code)
+        with self._gc_scope():
+            try:
+                data = json.loads(text)
+            except (json.JSONDecodeError, ValueError):
+                return []
+            self._flatten_json_response(data, points, index, url, status_code)
         return points
     
     def _flatten_json_response(
         self,
         data,
-        path: str,
         points: list[ResponseDataPoint],
         index: int,
         url: str,
         status_code: int
     ) -> None:
-        if isinstance(data, dict):
-            for key, value in data.items():
-                new_path = f"{path}.{key}"
-                self._flatten_json_response(value, new_path, points, index, url, status_code)
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                new_path = f"{path}[{i}]"
-                self._flatten_json_response(item, new_path, points, index, url, status_code)
-        else:
-            if data is not None:
-                str_value = str(data)
-                points.append(ResponseDataPoint(
-                    response_index=index,
-                    url=url,
-                    status_code=status_code,
-                    location=DataLocation.RESPONSE_JSON,
-                    name=path.split(".")[-1].split("[")[0],
-                    value=str_value,
-                    extractor_hint=JsonExtractorHint(json_path=path),
-                ))
+        prefilter, report = self.prefilter, self.prefilter_report
+        for json_path, name, value in iter_json_paths(data):
+            value = str(value)
+            if prefilter is not None and not prefilter.accepts(value, report):
+                continue
+            points.append(ResponseDataPoint(
+                response_index=index,
+                url=url,
+                status_code=status_code,
+                location=DataLocation.RESPONSE_JSON,
+                name=name,
+                value=value,
+                extractor_hint=JsonExtractorHint(json_path=json_path),
+            ))
     
     def _extract_from_html(
         self,
@@ -263,82 +493,53 @@ class TrafficExtractor:
         status_code: int
     ) -> list[ResponseDataPoint]:
         points: list[ResponseDataPoint] = []
+        seen: set[tuple[str, str]] = set()
         
-        input_pattern = re.compile(
-            r'<input[^>]*name=["\']([^"\']+)["\'][^>]*value=["\']([^"\']*)["\'][^>]*/?>',
-            re.IGNORECASE
-        )
-        for match in input_pattern.finditer(text):
-            name, value = match.groups()
-            if value:
-                points.append(ResponseDataPoint(
-                    response_index=index,
-                    url=url,
-                    status_code=status_code,
-                    location=DataLocation.RESPONSE_HTML,
-                    name=name,
-                    value=value,
-                    extractor_hint=RegexExtractorHint(
-                        pattern=f'name="{name}"[^>]*value="([^"]*)"'
-                    ),
-                ))
-        
-        input_pattern_reverse = re.compile(
-            r'<input[^>]*value=["\']([^"\']+)["\'][^>]*name=["\']([^"\']+)["\'][^>]*/?>',
-            re.IGNORECASE
-        )
-        for match in input_pattern_reverse.finditer(text):
-            value, name = match.groups()
-            if value and not any(p.name == name and p.value == value for p in points):
-                points.append(ResponseDataPoint(
-                    response_index=index,
-                    url=url,
-                    status_code=status_code,
-                    location=DataLocation.RESPONSE_HTML,
-                    name=name,
-                    value=value,
-                    extractor_hint=RegexExtractorHint(
-                        pattern=f'name="{name}"[^>]*value="([^"]*)"'
-                    ),
-                ))
-        
-        meta_pattern = re.compile(
-            r'<meta[^>]*name=["\']([^"\']+)["\'][^>]*content=["\']([^"\']+)["\'][^>]*/?>',
-            re.IGNORECASE
-        )
-        for match in meta_pattern.finditer(text):
-            name, content = match.groups()
-            if "csrf" in name.lower() or "token" in name.lower():
-                points.append(ResponseDataPoint(
-                    response_index=index,
-                    url=url,
-                    status_code=status_code,
-                    location=DataLocation.RESPONSE_HTML,
-                    name=name,
-                    value=content,
-                    extractor_hint=RegexExtractorHint(
-                        pattern=f'<meta[^>]*name="{name}"[^>]*content="([^"]*)"'
-                    ),
-                ))
-        
-        data_attr_pattern = re.compile(
-            r'data-(token|csrf|requesttoken|session)=["\']([^"\']+)["\']',
-            re.IGNORECASE
-        )
-        for match in data_attr_pattern.finditer(text):
-            name, value = match.groups()
+        def add(name: str, value: str, pattern: str) -> None:
+            if (name, value) in seen:
+                return
+            seen.add((name, value))
             points.append(ResponseDataPoint(
                 response_index=index,
                 url=url,
                 status_code=status_code,
                 location=DataLocation.RESPONSE_HTML,
-                name=f"data-{name}",
+                name=intern(name),
                 value=value,
-                extractor_hint=RegexExtractorHint(pattern=f'data-{name}="([^"]*)"'),
+                extractor_hint=RegexExtractorHint(pattern=pattern),
             ))
         
+        for match in _HTML_SCAN.finditer(text):
+            tag, attributes, script, data_name, data_value = match.groups()
+            
+            if tag is not None:
+                attrs = _tag_attributes(attributes)
+                name = attrs.get("name")
+                if tag.lower() == "input":
+                    value = attrs.get("value")
+                    if name and value:
+                        add(name, value, f'name="{name}"[^>]*value="([^"]*)"')
+                else:
+                    content = attrs.get("content")
+                    if name and content and ("csrf" in name.lower() or "token" in name.lower()):
+                        add(name, content, f'<meta[^>]*name="{name}"[^>]*content="([^"]*)"')
+                for attr_name, value in attrs.items():
+                    if attr_name.startswith("data-") and attr_name[5:] in _DATA_ATTRIBUTES and value:
+                        add(attr_name, value, f'{attr_name}="([^"]*)"')
+            
+            elif script is not None:
+                for token in _SCRIPT_TOKEN.finditer(script):
+                    name, value = token.group("name"), token.group("value")
+                    add(name, value, f'{re.escape(name)}["\']?\\s*[:=]\\s*["\']([^"\']*)["\']')
+            
+            else:
+                add(f"data-{data_name}", data_value, f'data-{data_name}="([^"]*)"')
+        
         return points
     
+    def _accepts(self, value: str) -> bool:
+        return self.prefilter is None or self.prefilter.accepts(value, self.prefilter_report)
+    
     def _is_skippable_header(self, name: str) -> bool:
         skip = {
             "host", "connection", "accept", "accept-language", 
@@ -1,5 +1,5 @@
 from .base import ExtractorHint
-from .json_extractor import JsonExtractorHint
+from .json_extractor import JsonExtractorHint, render_json_path
 from .regex_extractor import RegexExtractorHint
 from .header_extractor import HeaderExtractorHint
 from .cookie_extractor import CookieExtractorHint
@@ -10,4 +10,5 @@ __all__ = [
     "RegexExtractorHint",
     "HeaderExtractorHint",
     "CookieExtractorHint",
+    "render_json_path",
 ]
\ No newline at end of file
@@ -8,6 +8,12 @@ from jmx_builder.models.tree import TreeElement
 class ExtractorHint(ABC):
     variable_name: str | None = None
     
+    def __copy__(self):
+        # Shallow copy without the generic reduce protocol: cached points copy their hints on every hit.
+        clone = object.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        return clone
+
     @abstractmethod
     def to_str(self) -> TreeElement:
         pass
\ No newline at end of file
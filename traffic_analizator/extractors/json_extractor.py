@@ -3,6 +3,10 @@ from dataclasses import dataclass
 from .base import ExtractorHint
 
 
+def render_json_path(path: tuple[str | int, ...]) -> str:
+    return "$" + "".join(f"[{segment}]" if type(segment) is int else f".{segment}" for segment in path)
+
+
 @dataclass
 class JsonExtractorHint(ExtractorHint):
     json_path: str = ""
@@ -10,4 +14,4 @@ class JsonExtractorHint(ExtractorHint):
     default_value: str = "NO_VALUE"
     
     def to_str(self) -> str:
-        return f"JSONPath: {self.json_path}"
\ No newline at end of file
+        return f"JSONPath: {self.json_path}"
@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 
 from traffic_analizator.extractors.base import ExtractorHint
+from traffic_analizator.extractors.json_extractor import render_json_path
 
 
 class DataLocation(Enum):
@@ -24,7 +25,38 @@ class MatchType(Enum):
     COMPOSITE = "composite"
 
 
-@dataclass
+class Encoding(Enum):
+    URL = "url"
+    HTML_ENTITY = "html_entity"
+    JSON_ESCAPE = "json_escape"
+    BASE64 = "base64"
+
+
+class SourcePolicy(Enum):
+    FIRST = "first"
+    NEAREST = "nearest"
+
+
+# Values too common to be correlation sources (lowercased); shared by the correlator and the prefilter.
+STATIC_VALUES = frozenset({
+    "true", "false", "null", "none", "undefined",
+    "yes", "no", "on", "off",
+    "get", "post", "put", "delete", "patch",
+    "application/json", "application/x-www-form-urlencoded",
+    "text/html", "text/plain", "multipart/form-data",
+    "utf-8", "utf8", "iso-8859-1",
+    "en", "en-us", "ru", "ru-ru",
+    "gzip", "deflate", "br",
+    "keep-alive", "close",
+    "no-cache", "no-store", "max-age=0",
+    "cors", "same-origin", "navigate",
+    "document", "empty", "script", "style",
+})
+
+
+# Captures produce millions of points: they are slotted, and the extractor
+# interns their URLs, methods and names so equal strings are stored once.
+@dataclass(slots=True)
 class RequestDataPoint:
     request_index: int
     url: str
@@ -32,10 +64,19 @@ class RequestDataPoint:
     location: DataLocation
     name: str
     value: str
-    json_path: str | None = None
+    # Segments of a JSON body value's path; `json_path` is rendered from them on access.
+    path: tuple[str | int, ...] | None = None
 
+    @property
+    def json_path(self) -> str | None:
+        return render_json_path(self.path) if self.path is not None else None
 
-@dataclass
+    def __reduce__(self):
+        # Positional rebuild; points are pickled in bulk by parallel extraction.
+        return self.__class__, tuple([getattr(self, name) for name in self.__slots__])
+
+
+@dataclass(slots=True)
 class ResponseDataPoint:
     response_index: int
     url: str
@@ -45,19 +86,28 @@ class ResponseDataPoint:
     value: str
     extractor_hint: ExtractorHint
 
+    def __reduce__(self):
+        # Positional rebuild; points are pickled in bulk by parallel extraction.
+        return self.__class__, tuple([getattr(self, name) for name in self.__slots__])
+
 
 @dataclass
 class Correlation:
     request_point: RequestDataPoint
     response_point: ResponseDataPoint
     match_type: MatchType
+    # Set when the request and response values differ by this encoding.
+    encoding: Encoding | None = None
 
     def to_str(self) -> str:
         req = self.request_point
         resp = self.response_point
+        tag = self.match_type.value.upper()
+        if self.encoding is not None:
+            tag += f"/{self.encoding.value}"
         
         lines = [
-            f"[{self.match_type.value.upper()}] {req.name}",
+            f"[{tag}] {req.name}",
             f"  Запрос #{req.request_index}: {req.method} {req.url}",
             f"    Расположение: {req.location.value}",
             f"    Значение: {req.value[:80]}{'...' if len(req.value) > 80 else ''}",
@@ -69,12 +119,70 @@ class Correlation:
         return "\n".join(lines)
 
 
+@dataclass
+class PrefilterReport:
+    total: int = 0
+    pruned: dict[str, int] = field(default_factory=dict)
+    total_chars: int = 0
+    kept_chars: int = 0
+
+    @property
+    def pruned_total(self) -> int:
+        return sum(self.pruned.values())
+
+    @property
+    def kept(self) -> int:
+        return self.total - self.pruned_total
+
+    def merge(self, other: "PrefilterReport") -> None:
+        self.total += other.total
+        self.total_chars += other.total_chars
+        self.kept_chars += other.kept_chars
+        for reason, count in other.pruned.items():
+            self.pruned[reason] = self.pruned.get(reason, 0) + count
+
+    def to_str(self) -> str:
+        reasons = ", ".join(f"{reason}={count}" for reason, count in sorted(self.pruned.items()))
+        share = self.kept_chars / self.total_chars if self.total_chars else 1.0
+        return (
+            f"Префильтр: сохранено {self.kept} из {self.total} значений ответов, отброшено {self.pruned_total} "
+            f"({reasons or 'нет'}); объём индекса {share:.0%}"
+        )
+
+
+@dataclass
+class ContentCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def merge(self, other: "ContentCacheStats") -> None:
+        self.hits += other.hits
+        self.misses += other.misses
+        self.evictions += other.evictions
+
+    def to_str(self) -> str:
+        return (
+            f"Кэш тел ответов: {self.hits} попаданий, {self.misses} промахов "
+            f"({self.hit_rate:.0%}), вытеснено {self.evictions}"
+        )
+
+
 @dataclass
 class AnalysisReport:
     request_data_points: list[RequestDataPoint] = field(default_factory=list)
     response_data_points: list[ResponseDataPoint] = field(default_factory=list)
     correlations: list[Correlation] = field(default_factory=list)
     unresolved: list[RequestDataPoint] = field(default_factory=list)
+    prefilter: PrefilterReport | None = None
+    content_cache: ContentCacheStats | None = None
+    extraction_seconds: float = 0.0
+    correlation_seconds: float = 0.0
 
     def to_str(self) -> str:
         lines = [
@@ -89,6 +197,15 @@ class AnalysisReport:
             "",
         ]
         
+        if self.content_cache is not None and self.content_cache.hits:
+            lines.append(self.content_cache.to_str())
+            lines.append("")
+        
+        if self.prefilter is not None:
+            lines.append(self.prefilter.to_str())
+            lines.append(f"Извлечение: {self.extraction_seconds:.2f}s, поиск корреляций: {self.correlation_seconds:.2f}s")
+            lines.append("")
+        
         if self.correlations:
             lines.append("-" * 80)
             lines.append("КОРРЕЛЯЦИИ (требуют параметризации)")
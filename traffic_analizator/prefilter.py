@@ -0,0 +1,113 @@
+"""
+Prefilter for response values: drops values that cannot be meaningful
+correlation sources (too short or long, static words, timestamps, repetitive
+strings) before data points are built for them, so they never reach the
+correlator's indexes. `PrefilterReport` counts what was pruned and why.
+"""
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from .models import STATIC_VALUES, PrefilterReport
+
+
+REASON_SHORT = "short"
+REASON_LONG = "long"
+REASON_STATIC = "static"
+REASON_TIMESTAMP = "timestamp"
+REASON_ENTROPY = "entropy"
+
+_TIMESTAMP = re.compile(
+    r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?"
+)
+
+# Used when the prefilter is applied on its own, outside an analyzer.
+DEFAULT_MIN_LENGTH = 4
+
+_STATIC_MAX_LENGTH = max(map(len, STATIC_VALUES))
+_VERDICT_CACHE_SIZE = 1 << 20
+
+
+def char_entropy(value: str) -> float:
+    """Shannon entropy of the characters of `value`, bits per character."""
+    length = len(value)
+    if not length:
+        return 0.0
+    return -sum(count / length * math.log2(count / length) for count in Counter(value).values())
+
+
+def _below_entropy(value: str, min_entropy: float) -> bool:
+    # Shannon entropy is at least the min-entropy -log2(p_max). With d distinct
+    # characters the top count is at most len - d + 1, so tokens and ids pass
+    # without counting anything.
+    length = len(value)
+    bound = length * 2 ** -min_entropy
+    if length - len(set(value)) + 1 <= bound:
+        return False
+    if max(map(value.count, set(value))) <= bound:
+        return False
+    return char_entropy(value) < min_entropy
+
+
+@dataclass
+class ValuePrefilter:
+    """
+    Scores response values before their data points are built.
+    `min_entropy` is in bits per character: repetitive values such as `0000`
+    or `aaaa` score below 1.0, tokens and ids score 3 or more.
+    `min_length=None` takes the analyzer's `min_value_length`.
+    """
+    min_length: Optional[int] = None
+    max_length: int = 4096
+    min_entropy: float = 1.0
+    skip_static: bool = True
+    skip_timestamps: bool = True
+
+    def __post_init__(self):
+        # Values repeat a lot across responses, each distinct one is scored once.
+        self._verdicts: dict[str, Optional[str]] = {}
+        self._min_length = self.min_length if self.min_length is not None else DEFAULT_MIN_LENGTH
+
+    def for_min_value_length(self, min_value_length: int) -> "ValuePrefilter":
+        """This prefilter, or a copy bound to `min_value_length` if `min_length` was left unset."""
+        if self.min_length is not None:
+            return self
+        return replace(self, min_length=min_value_length)
+
+    def rejection_reason(self, value: str) -> Optional[str]:
+        if len(value) < self._min_length:
+            return REASON_SHORT
+        if len(value) > self.max_length:
+            return REASON_LONG
+        if self.skip_static and len(value) <= _STATIC_MAX_LENGTH and value.lower() in STATIC_VALUES:
+            return REASON_STATIC
+        if self.skip_timestamps and value[:1].isdigit() and _TIMESTAMP.fullmatch(value):
+            return REASON_TIMESTAMP
+        if self.min_entropy > 0 and _below_entropy(value, self.min_entropy):
+            return REASON_ENTROPY
+        return None
+
+    def accepts(self, value: str, report: PrefilterReport) -> bool:
+        """Scores `value` and records the verdict in `report`."""
+        length = len(value)
+        report.total += 1
+        report.total_chars += length
+        if length < self._min_length:
+            reason = REASON_SHORT
+        else:
+            verdicts = self._verdicts
+            if value in verdicts:
+                reason = verdicts[value]
+            else:
+                if len(verdicts) >= _VERDICT_CACHE_SIZE:
+                    verdicts.clear()
+                reason = verdicts[value] = self.rejection_reason(value)
+
+        if reason is None:
+            report.kept_chars += length
+            return True
+        report.pruned[reason] = report.pruned.get(reason, 0) + 1
+        return False
+
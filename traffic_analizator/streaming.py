@@ -0,0 +1,249 @@
+"""
+Online correlation over an entry stream.
+
+Entries are consumed in order: the request of entry N is resolved against the
+responses of entries < N seen so far, then the response of entry N is added to
+the index. With `search_window` or `time_window` the index only keeps the
+responses inside the window, so memory stays bounded however long the capture
+is.
+"""
+from collections import Counter, deque
+from typing import Iterable, Iterator, Optional
+
+from llm.models.structure import StructureOutput
+from traffic_builder.har_parsers.pydantic_models import Entry
+
+from .correlator import SourceCandidates, TrafficCorrelator
+from .encodings import decoded_forms
+from .extractor import TrafficExtractor
+from .models import (
+    Correlation,
+    Encoding,
+    MatchType,
+    RequestDataPoint,
+    ResponseDataPoint,
+    SourcePolicy,
+)
+from .prefilter import ValuePrefilter
+
+
+def _drop_front(candidates: SourceCandidates, count: int) -> bool:
+    # Older responses were evicted first, so the evicted response's points lead every list.
+    del candidates.response_indexes[:count]
+    del candidates.positions[:count]
+    del candidates.points[:count]
+    return not candidates.points
+
+
+class StreamingResponseIndex:
+    """
+    Exact-value index that grows as responses arrive and forgets whole
+    responses from the front; values are also indexed by their decoded forms.
+    For CONTAINS lookups values are grouped by their first
+    `min_value_length` characters, so a request value is probed once per
+    position instead of once per position and indexed length.
+    """
+
+    def __init__(self, min_value_length: int):
+        self.min_value_length = min_value_length
+        self._candidates: dict[str, SourceCandidates] = {}
+        self._decoded: dict[str, dict[Encoding, SourceCandidates]] = {}
+        self._gram = max(min_value_length, 1)
+        self._by_prefix: dict[str, set[str]] = {}
+        self._added: deque[tuple[int, list[str], list[tuple[str, Encoding]]]] = deque()
+        self._position = 0
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._candidates
+
+    def __getitem__(self, value: str) -> SourceCandidates:
+        return self._candidates[value]
+
+    def encoded_candidates(self, value: str) -> list[tuple[Encoding, SourceCandidates]]:
+        return list(self._decoded.get(value, {}).items())
+
+    def add(self, response_index: int, points: list[ResponseDataPoint]) -> None:
+        values: list[str] = []
+        decoded_keys: list[tuple[str, Encoding]] = []
+        for point in points:
+            value = point.value
+            # Positions keep counting past short values, as in the batch response_points list.
+            position = self._position
+            self._position += 1
+            if len(value) < self.min_value_length:
+                continue
+            candidates = self._candidates.get(value)
+            if candidates is None:
+                candidates = self._candidates[value] = SourceCandidates()
+                self._by_prefix.setdefault(value[:self._gram], set()).add(value)
+            candidates.response_indexes.append(response_index)
+            candidates.positions.append(position)
+            candidates.points.append(point)
+            values.append(value)
+            for encoding, decoded in decoded_forms(value, self.min_value_length):
+                by_encoding = self._decoded.setdefault(decoded, {})
+                decoded_candidates = by_encoding.setdefault(encoding, SourceCandidates())
+                decoded_candidates.response_indexes.append(response_index)
+                decoded_candidates.positions.append(position)
+                decoded_candidates.points.append(point)
+                decoded_keys.append((decoded, encoding))
+        if values:
+            self._added.append((response_index, values, decoded_keys))
+
+    def evict_before(self, min_index: int) -> None:
+        while self._added and self._added[0][0] < min_index:
+            _, values, decoded_keys = self._added.popleft()
+            for value, count in Counter(values).items():
+                if _drop_front(self._candidates[value], count):
+                    del self._candidates[value]
+                    prefix = value[:self._gram]
+                    self._by_prefix[prefix].discard(value)
+                    if not self._by_prefix[prefix]:
+                        del self._by_prefix[prefix]
+            for (decoded, encoding), count in Counter(decoded_keys).items():
+                by_encoding = self._decoded[decoded]
+                if _drop_front(by_encoding[encoding], count):
+                    del by_encoding[encoding]
+                    if not by_encoding:
+                        del self._decoded[decoded]
+
+    def contained_values(self, text: str) -> set[str]:
+        """Indexed values occurring in `text` as a proper substring."""
+        found: set[str] = set()
+        by_prefix = self._by_prefix
+        gram = self._gram
+        text_length = len(text)
+        for start in range(text_length - gram + 1):
+            values = by_prefix.get(text[start:start + gram])
+            if values is None:
+                continue
+            for value in values:
+                if len(value) < text_length and text.startswith(value, start):
+                    found.add(value)
+        return found
+
+
+class StreamingCorrelator(TrafficCorrelator):
+    """
+    Same matching rules as `TrafficCorrelator`, applied entry by entry.
+    For any search window the results equal the batch ones. Memory is bounded
+    only with `search_window` or `time_window`: without them every response
+    value stays indexed until the end of the stream.
+    """
+
+    def __init__(
+        self,
+        min_value_length: int = 4,
+        search_window: int | None = None,
+        source_policy: SourcePolicy = SourcePolicy.FIRST,
+        ignore_cookies: bool = False,
+        prefilter: Optional[ValuePrefilter] = None,
+        time_window: float | None = None,
+        transactions: Optional[StructureOutput] = None,
+        transaction_window: int = 0,
+    ):
+        super().__init__(
+            min_value_length, search_window, source_policy, time_window, transactions, transaction_window
+        )
+        if prefilter is not None:
+            prefilter = prefilter.for_min_value_length(min_value_length)
+        self.extractor = TrafficExtractor(ignore_cookies=ignore_cookies, prefilter=prefilter)
+        self.index = StreamingResponseIndex(min_value_length)
+        self.entries_seen = 0
+        self.unresolved_count = 0
+
+    def feed(self, entry: Entry) -> tuple[list[Correlation], list[RequestDataPoint]]:
+        """Resolves the request of `entry`, then indexes its response."""
+        index = self.entries_seen
+        self.entries_seen += 1
+        if self.time_window is not None:
+            self.add_entry_times([entry])
+        # Transaction bounds can go back down (entries outside transactions), they are applied per lookup.
+        min_index = self._min_window_index(index)
+        self.index.evict_before(min_index)
+        self._trim_entry_times(min_index)
+
+        request_points, response_points = self.extractor.extract_entry(entry, index)
+        correlations: list[Correlation] = []
+        unresolved: list[RequestDataPoint] = []
+        for req_point in request_points:
+            if len(req_point.value) < self.min_value_length:
+                continue
+            if self._is_static_value(req_point):
+                continue
+            correlation = self._find_source(req_point, [], self.index, self.index)
+            if correlation:
+                correlations.append(correlation)
+            else:
+                unresolved.append(req_point)
+
+        self.index.add(index, response_points)
+        self.unresolved_count += len(unresolved)
+        return correlations, unresolved
+
+    def iter_correlations(self, entries: Iterable[Entry]) -> Iterator[Correlation]:
+        for entry in entries:
+            correlations, _ = self.feed(entry)
+            yield from correlations
+
+    def _find_contains_source(
+        self,
+        req_point: RequestDataPoint,
+        contains_index: StreamingResponseIndex,
+    ) -> Correlation | None:
+        req_index = req_point.request_index
+        min_index = self._min_search_index(req_index)
+        nearest = self.source_policy is SourcePolicy.NEAREST
+
+        best_key: tuple[int, int] | None = None
+        best_point: ResponseDataPoint | None = None
+        for value in contains_index.contained_values(req_point.value):
+            candidates = contains_index[value]
+            i = candidates.select(req_index, min_index, self.source_policy)
+            if i is None:
+                continue
+            response_index = candidates.response_indexes[i]
+            key = (-response_index if nearest else response_index, candidates.positions[i])
+            if best_key is None or key < best_key:
+                best_key = key
+                best_point = candidates.points[i]
+
+        if best_point is None:
+            return None
+
+        return Correlation(
+            request_point=req_point,
+            response_point=best_point,
+            match_type=MatchType.CONTAINS,
+        )
+
+
+def iter_correlations(
+    entries: Iterable[Entry],
+    min_value_length: int = 4,
+    search_window: int | None = None,
+    ignore_cookies: bool = True,
+    source_policy: SourcePolicy = SourcePolicy.FIRST,
+    prefilter: Optional[ValuePrefilter] = None,
+    time_window: float | None = None,
+    transactions: Optional[StructureOutput] = None,
+    transaction_window: int = 0,
+) -> Iterator[Correlation]:
+    """
+    Yields correlations as soon as their request is read. `entries` can be
+    any iterable: `HarFile.log.entries`, a `HarIndex`, a `HarBinaryReader`.
+    """
+    correlator = StreamingCorrelator(
+        min_value_length=min_value_length,
+        search_window=search_window,
+        source_policy=source_policy,
+        ignore_cookies=ignore_cookies,
+        prefilter=prefilter,
+        time_window=time_window,
+        transactions=transactions,
+        transaction_window=transaction_window,
+    )
+    return correlator.iter_correlations(entries)
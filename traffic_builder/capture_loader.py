@@ -0,0 +1,40 @@
+"""
+Loads any supported capture (HAR, binary HAR, SAZ, XML/CSV JTL) as a HarFile.
+"""
+from pathlib import Path
+
+from traffic_builder.converters_to_har.jtl_to_har_conterter import convert_jtl_to_har
+from traffic_builder.converters_to_har.saz_to_har_converter import convert_saz_to_har
+from traffic_builder.har_parsers.har_binary import is_har_binary, parse_har_binary
+from traffic_builder.har_parsers.har_parser import parse_har
+from traffic_builder.har_parsers.pydantic_models import HarFile
+from traffic_builder.jtl_parser.csv_jtl_parser import load_csv_jtl
+from traffic_builder.jtl_parser.jtl_parser import is_xml_jtl, parse_jtl
+from traffic_builder.saz_parser.saz_parser import parse_saz
+
+
+HAR_SUFFIXES = {".har"}
+HAR_BINARY_SUFFIXES = {".harb"}
+SAZ_SUFFIXES = {".saz"}
+JTL_SUFFIXES = {".jtl", ".csv"}
+CAPTURE_SUFFIXES = HAR_SUFFIXES | HAR_BINARY_SUFFIXES | SAZ_SUFFIXES | JTL_SUFFIXES
+
+
+def is_capture_file(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in CAPTURE_SUFFIXES
+
+
+def load_capture(path: str | Path) -> HarFile:
+    suffix = Path(path).suffix.lower()
+
+    if suffix in HAR_BINARY_SUFFIXES or (suffix in HAR_SUFFIXES and is_har_binary(path)):
+        return parse_har_binary(path)
+    if suffix in HAR_SUFFIXES:
+        return parse_har(path)
+    if suffix in SAZ_SUFFIXES:
+        return convert_saz_to_har(parse_saz(path))
+    if suffix in JTL_SUFFIXES:
+        results = parse_jtl(path) if is_xml_jtl(path) else load_csv_jtl(path).to_test_results()
+        return convert_jtl_to_har(results)
+
+    raise ValueError(f"Unsupported capture format: {path}")
@@ -0,0 +1,12 @@
+"""
+`startedDateTime` parsing shared by the HAR -> SAZ/JTL converters.
+"""
+from datetime import datetime
+
+
+def parse_started_date_time(value: str) -> datetime:
+    # The HAR converters write local time with a "Z" suffix (see saz_to_har_converter and
+    # jtl_to_har_conterter); keep it naive so HAR -> SAZ/JTL round trips are lossless.
+    if value.endswith('Z'):
+        value = value[:-1]
+    return datetime.fromisoformat(value)
@@ -0,0 +1,54 @@
+"""
+Converter from HAR entries to JMeter JTL (CSV) results.
+"""
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from traffic_builder.jtl_parser.csv_jtl_parser import write_csv_jtl
+from traffic_builder.jtl_parser.models import HttpSample
+from traffic_builder.converters_from_har.har_time import parse_started_date_time
+from traffic_builder.har_parsers.pydantic_models import Entry, Record
+
+
+def _format_headers(headers: list[Record]) -> str:
+    return ''.join(f"{h.name}: {h.value}\n" for h in headers if h.name)
+
+
+def convert_entry_to_sample(entry: Entry) -> HttpSample:
+    request = entry.request
+    response = entry.response
+    content = response.content
+    timings = entry.timings
+
+    status_line = f"{response.http_version or 'HTTP/1.1'} {response.status} {response.status_text}\n"
+
+    return HttpSample(
+        timestamp=int(parse_started_date_time(entry.started_date_time).timestamp() * 1000),
+        elapsed=int(round(entry.time)),
+        latency=int(round(max(timings.wait, 0))),
+        connect_time=int(round(max(timings.connect, 0))),
+        label=request.url,
+        response_code=str(response.status),
+        response_message=response.status_text,
+        success=200 <= response.status < 400,
+        data_type=content.mime_type if content else "",
+        data_encoding=content.encoding if content else "",
+        bytes_received=response.body_size if response.body_size >= 0 else (content.size if content else 0),
+        sent_bytes=max(request.headers_size, 0),
+        url=request.url,
+        method=request.method,
+        request_header=_format_headers(request.headers),
+        response_header=status_line + _format_headers(response.headers),
+        response_data=content.text if content else "",
+        sampler_data=request.post_data.text if request.post_data else "",
+        redirect_location=response.redirect_url,
+    )
+
+
+def iter_jtl_samples(entries: Iterable[Entry]) -> Iterator[HttpSample]:
+    for entry in entries:
+        yield convert_entry_to_sample(entry)
+
+
+def convert_entries_to_jtl(entries: Iterable[Entry], output_path: str | Path) -> int:
+    return write_csv_jtl(iter_jtl_samples(entries), output_path)
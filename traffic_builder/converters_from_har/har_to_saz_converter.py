@@ -0,0 +1,104 @@
+"""
+Converter from HAR entries to a Fiddler SAZ archive.
+"""
+import base64
+import zipfile
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterable
+from xml.sax.saxutils import quoteattr
+
+from traffic_builder.converters_from_har.har_time import parse_started_date_time
+from traffic_builder.har_parsers.pydantic_models import Entry, Record
+
+
+# Bodies are written decoded, so transport headers of the original message no longer apply.
+_DROPPED_RESPONSE_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+
+
+def _format_headers(headers: list[Record]) -> str:
+    return ''.join(f"{h.name}: {h.value}\r\n" for h in headers if h.name)
+
+
+def _request_bytes(entry: Entry) -> bytes:
+    request = entry.request
+    body = request.post_data.text.encode('utf-8') if request.post_data else b''
+    head = f"{request.method} {request.url} {request.http_version or 'HTTP/1.1'}\r\n"
+    return (head + _format_headers(request.headers) + "\r\n").encode('utf-8') + body
+
+
+def _response_bytes(entry: Entry) -> bytes:
+    response = entry.response
+    content = response.content
+    body = b''
+    if content is not None and content.text:
+        if content.encoding == 'base64':
+            body = base64.b64decode(content.text)
+        else:
+            body = content.text.encode('utf-8')
+
+    headers = [h for h in response.headers if (h.name or '').lower() not in _DROPPED_RESPONSE_HEADERS]
+    head = f"{response.http_version or 'HTTP/1.1'} {response.status} {response.status_text}\r\n"
+    return (head + _format_headers(headers) + f"Content-Length: {len(body)}\r\n\r\n").encode('utf-8') + body
+
+
+def _metadata_xml(entry: Entry, sid: int) -> str:
+    timings = entry.timings
+
+    def ms(value: float) -> timedelta:
+        return timedelta(milliseconds=max(value, 0))
+
+    client_begin_request = parse_started_date_time(entry.started_date_time)
+    fiddler_begin_request = client_begin_request + ms(timings.blocked)
+    server_got_request = fiddler_begin_request + ms(timings.send)
+    server_begin_response = server_got_request + ms(timings.wait)
+    client_done_response = server_begin_response + ms(timings.receive)
+
+    timers = {
+        'ClientConnected': client_begin_request,
+        'ClientBeginRequest': client_begin_request,
+        'GotRequestHeaders': client_begin_request,
+        'ClientDoneRequest': client_begin_request,
+        'ServerConnected': fiddler_begin_request,
+        'FiddlerBeginRequest': fiddler_begin_request,
+        'ServerGotRequest': server_got_request,
+        'ServerBeginResponse': server_begin_response,
+        'GotResponseHeaders': server_begin_response,
+        'ServerDoneResponse': client_done_response,
+        'ClientBeginResponse': server_begin_response,
+        'ClientDoneResponse': client_done_response,
+    }
+    attrs = ' '.join(f'{name}="{value.isoformat()}"' for name, value in timers.items())
+    attrs += (
+        f' GatewayTime="0" DNSTime="{int(max(timings.dns, 0))}"'
+        f' TCPConnectTime="{int(max(timings.connect, 0))}"'
+        f' HTTPSHandshakeTime="{int(max(timings.ssl, 0))}"'
+    )
+    flags = ''
+    if entry.server_ip_address:
+        flags = f'<SessionFlag N="x-hostip" V={quoteattr(entry.server_ip_address)} />'
+
+    return (
+        f'<?xml version="1.0" encoding="utf-8"?>\r\n'
+        f'<Session SID="{sid}" BitFlags="0"><SessionTimers {attrs} />'
+        f'<PipeInfo CltReuse="false" Reused="false" /><SessionFlags>{flags}</SessionFlags></Session>'
+    )
+
+
+def convert_entries_to_saz(entries: Iterable[Entry], output_path: str | Path) -> int:
+    """
+    Writes HAR entries as SAZ sessions 1..N. Session numbers are zero-padded
+    to a common width (known up front for sized inputs) so readers that sort
+    the archive listing keep the capture order.
+    """
+    width = max(3, len(str(len(entries)))) if hasattr(entries, '__len__') else 6
+    count = 0
+
+    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for count, entry in enumerate(entries, 1):
+            prefix = f"raw/{count:0{width}d}"
+            zf.writestr(f"{prefix}_c.txt", _request_bytes(entry))
+            zf.writestr(f"{prefix}_s.txt", _response_bytes(entry))
+            zf.writestr(f"{prefix}_m.xml", _metadata_xml(entry, count))
+
+    return count
@@ -2,13 +2,17 @@
 Converter from JMeter JTL format to HAR (HTTP Archive) format.
 """
 from datetime import datetime
-from urllib.parse import urlparse, parse_qs
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, Iterator
 
+from traffic_builder.jtl_parser.csv_jtl_parser import iter_csv_jtl
+from traffic_builder.jtl_parser.jtl_parser import is_xml_jtl, iter_jtl
 from traffic_builder.jtl_parser.models import TestResults, HttpSample
+from traffic_builder.har_parsers.har_writer import HarWriter
+from traffic_builder.http_utils import parse_cookies_from_headers, parse_query_string
 from traffic_builder.har_parsers.pydantic_models import (
     HarFile, Log, Entry, Request, Response, Content,
-    Cache, Timings, Creator, Browser, Record, Cookie
+    Cache, Timings, Creator, Browser, Record
 )
 
 
@@ -27,71 +31,20 @@ def _parse_headers(header_text: str) -> list[Record]:
     return headers
 
 
-def _parse_cookies_from_headers(headers: list[Record]) -> list[Cookie]:
-    cookies = []
-    
-    for header in headers:
-        if header.name.lower() == 'set-cookie':
-            cookie_parts = header.value.split(';')
-            if cookie_parts:
-                name_value = cookie_parts[0].strip()
-                if '=' in name_value:
-                    name, value = name_value.split('=', 1)
-                    
-                    cookie_attrs = {
-                        'name': name.strip(),
-                        'value': value.strip(),
-                        'path': '/',
-                        'domain': '',
-                        'http_only': False,
-                        'secure': False
-                    }
-                    
-                    for part in cookie_parts[1:]:
-                        part = part.strip().lower()
-                        if part == 'httponly':
-                            cookie_attrs['http_only'] = True
-                        elif part == 'secure':
-                            cookie_attrs['secure'] = True
-                        elif part.startswith('path='):
-                            cookie_attrs['path'] = part.split('=', 1)[1]
-                        elif part.startswith('domain='):
-                            cookie_attrs['domain'] = part.split('=', 1)[1]
-                    
-                    cookies.append(Cookie(**cookie_attrs))
-    
-    return cookies
-
-
-def _parse_query_string(url: str) -> list[Record]:
-    parsed = urlparse(url)
-    if not parsed.query:
-        return []
-    
-    query_params = parse_qs(parsed.query)
-    records = []
-    
-    for name, values in query_params.items():
-        for value in values:
-            records.append(Record(name=name, value=value))
-    
-    return records
-
-
 def _convert_sample_to_entry(sample: HttpSample, index: int) -> Entry:
     url = sample.url or sample.label
     
     request_headers = _parse_headers(sample.request_header)
     response_headers = _parse_headers(sample.response_header)
     
-    response_cookies = _parse_cookies_from_headers(response_headers)
+    response_cookies = parse_cookies_from_headers(response_headers)
     
     request = Request(
         method=sample.method or "GET",
         url=url,
         http_version="HTTP/1.1",
         headers=request_headers,
-        query_string=_parse_query_string(url),
+        query_string=parse_query_string(url),
         cookies=[],
         headers_size=sample.sent_bytes,
         body_size=0
@@ -146,29 +99,33 @@ def _convert_sample_to_entry(sample: HttpSample, index: int) -> Entry:
     return entry
 
 
-def convert_jtl_to_har(
-    test_results: TestResults,
-    creator_name: str = "JMeter",
-    creator_version: str = "5.6",
+def iter_har_entries(
+    samples: Iterable[HttpSample],
     include_sub_samples: bool = False
-) -> HarFile:
-    entries = []
+) -> Iterator[Entry]:
+    index = 0
     
-    def process_sample(sample: HttpSample, index: int) -> int:
-        """Process a sample and its sub-samples recursively."""
-        entry = _convert_sample_to_entry(sample, index)
-        entries.append(entry)
-        current_index = index + 1
+    def process_sample(sample: HttpSample) -> Iterator[Entry]:
+        """Convert a sample and, optionally, its sub-samples in document order."""
+        nonlocal index
+        yield _convert_sample_to_entry(sample, index)
+        index += 1
         
         if include_sub_samples:
             for sub_sample in sample.http_sample:
-                current_index = process_sample(sub_sample, current_index)
-        
-        return current_index
+                yield from process_sample(sub_sample)
     
-    index = 0
-    for sample in test_results.http_sample:
-        index = process_sample(sample, index)
+    for sample in samples:
+        yield from process_sample(sample)
+
+
+def convert_jtl_to_har(
+    test_results: TestResults,
+    creator_name: str = "JMeter",
+    creator_version: str = "5.6",
+    include_sub_samples: bool = False
+) -> HarFile:
+    entries = list(iter_har_entries(test_results.http_sample, include_sub_samples))
     
     creator = Creator(name=creator_name, version=creator_version)
     browser = Browser(name="JMeter", version=creator_version)
@@ -186,6 +143,31 @@ def convert_jtl_to_har(
     return har_file
 
 
+def convert_jtl_file_to_har(
+    jtl_path: str | Path,
+    output_path: str | Path,
+    creator_name: str = "JMeter",
+    creator_version: str = "5.6",
+    include_sub_samples: bool = False,
+    include_response_data: bool = False
+) -> int:
+    """
+    Streaming JTL -> HAR conversion: samples are read with iterparse, converted
+    and written one by one, so memory does not grow with the size of the JTL.
+    Returns the number of written entries.
+    """
+    if is_xml_jtl(jtl_path):
+        samples = iter_jtl(jtl_path, include_response_data=include_response_data)
+    else:
+        samples = iter_csv_jtl(jtl_path)
+    
+    creator = Creator(name=creator_name, version=creator_version)
+    browser = Browser(name="JMeter", version=creator_version)
+    
+    with HarWriter(output_path, creator, browser) as writer:
+        return writer.write_all(iter_har_entries(samples, include_sub_samples))
+
+
 def save_har(har_file: HarFile, output_path: str):
     import json
     
@@ -1,64 +1,18 @@
 import json
-from datetime import datetime
-from urllib.parse import urlparse, parse_qs
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
-from traffic_builder.saz_parser.models import SazArchive, SazSession
+from traffic_builder.saz_parser.models import SazArchive, SazSession, SessionFilter
+from traffic_builder.saz_parser.http_message import decode_body
+from traffic_builder.saz_parser.saz_parser import iter_saz
+from traffic_builder.har_parsers.har_writer import HarWriter
+from traffic_builder.http_utils import parse_cookies_from_headers, parse_query_string
 from traffic_builder.har_parsers.pydantic_models import (
     HarFile, Log, Entry, Request, Response, Content,
-    Cache, Timings, Creator, Browser, Record, Cookie
+    Cache, Timings, Creator, Browser, Record
 )
 
 
-def _parse_cookies_from_headers(headers: list) -> list[Cookie]:
-    cookies = []
-    for header in headers:
-        if header.name.lower() == 'set-cookie':
-            cookie_parts = header.value.split(';')
-            if cookie_parts:
-                name_value = cookie_parts[0].strip()
-                if '=' in name_value:
-                    name, value = name_value.split('=', 1)
-                    
-                    cookie_attrs = {
-                        'name': name.strip(),
-                        'value': value.strip(),
-                        'path': '/',
-                        'domain': '',
-                        'http_only': False,
-                        'secure': False
-                    }
-                    
-                    for part in cookie_parts[1:]:
-                        part = part.strip().lower()
-                        if part == 'httponly':
-                            cookie_attrs['http_only'] = True
-                        elif part == 'secure':
-                            cookie_attrs['secure'] = True
-                        elif part.startswith('path='):
-                            cookie_attrs['path'] = part.split('=', 1)[1]
-                        elif part.startswith('domain='):
-                            cookie_attrs['domain'] = part.split('=', 1)[1]
-                    
-                    cookies.append(Cookie(**cookie_attrs))
-    return cookies
-
-
-def _parse_query_string(url: str) -> list[Record]:
-    parsed = urlparse(url)
-    if not parsed.query:
-        return []
-    
-    query_params = parse_qs(parsed.query)
-    records = []
-    
-    for name, values in query_params.items():
-        for value in values:
-            records.append(Record(name=name, value=value))
-    
-    return records
-
-
 def _convert_headers(saz_headers: list) -> list[Record]:
     return [Record(name=h.name, value=h.value) for h in saz_headers]
 
@@ -91,14 +45,14 @@ def _convert_session_to_entry(session: SazSession) -> Entry:
     request_headers = _convert_headers(session.request.headers)
     response_headers = _convert_headers(session.response.headers)
     
-    response_cookies = _parse_cookies_from_headers(session.response.headers)
+    response_cookies = parse_cookies_from_headers(session.response.headers)
     
     request = Request(
         method=session.request.request_line.method,
         url=url,
         http_version=session.request.request_line.http_version,
         headers=request_headers,
-        query_string=_parse_query_string(url),
+        query_string=parse_query_string(url),
         cookies=[],
         headers_size=-1,
         body_size=len(session.request.body)
@@ -110,10 +64,15 @@ def _convert_session_to_entry(session: SazSession) -> Entry:
             content_type = header.value
             break
     
+    response_body, encoded_length = decode_body(
+        session.response.headers, session.response.body, f"Session {session.session_id}: response body"
+    )
+    
     content = Content(
-        size=len(session.response.body),
+        size=len(response_body),
         mime_type=content_type,
-        text=session.response.body.decode('utf-8', errors='ignore'),
+        compression=len(response_body) - encoded_length,
+        text=str(response_body, 'utf-8', 'ignore'),
         encoding=""
     )
     
@@ -152,6 +111,11 @@ def _convert_session_to_entry(session: SazSession) -> Entry:
     return entry
 
 
+def iter_har_entries(sessions: Iterable[SazSession]) -> Iterator[Entry]:
+    for session in sessions:
+        yield _convert_session_to_entry(session)
+
+
 def convert_saz_to_har(
     archive: SazArchive,
     creator_name: str = "Fiddler",
@@ -179,6 +143,25 @@ def convert_saz_to_har(
     return har_file
 
 
+def convert_saz_file_to_har(
+    saz_path: str | Path,
+    output_path: str | Path,
+    creator_name: str = "Fiddler",
+    creator_version: str = "5.0",
+    filter: Optional[SessionFilter] = None
+) -> int:
+    """
+    Streaming SAZ -> HAR conversion: sessions are read from the zip one at a
+    time, converted and written to the output file immediately.
+    Returns the number of written entries.
+    """
+    creator = Creator(name=creator_name, version=creator_version)
+    browser = Browser(name="Firefox", version="146.0")
+    
+    with HarWriter(output_path, creator, browser) as writer:
+        return writer.write_all(iter_har_entries(iter_saz(saz_path, filter)))
+
+
 def save_har(har_file: HarFile, output_path: str):
     with open(output_path, 'w', encoding='utf-8') as f:
         json.dump(har_file.model_dump(by_alias=True, exclude_none=True), f, indent=2)
\ No newline at end of file
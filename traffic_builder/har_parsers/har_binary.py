@@ -0,0 +1,286 @@
+"""
+Binary HAR-equivalent capture format (.harb).
+
+Layout:
+
+    b"HARB" <u16 format version> <u32 header length> <header JSON>
+    record*         <u32 meta length> <u32 request body length> <u32 response body length>
+                    <entry JSON without bodies> <request body> <response body>
+    index           <u64 record offset> * count
+    footer          <u64 index offset> <u64 count> b"HARBIDX\\0"
+
+The header holds the HAR log without entries. Each record is the compact JSON
+of one entry with `request.postData.text` and `response.content.text` moved to
+raw UTF-8 body segments, so entry N is read with one seek via the index, and
+bodies can be skipped entirely when only metadata is needed.
+"""
+import json
+import struct
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from traffic_builder.converters_from_har.har_to_jtl_converter import convert_entries_to_jtl
+from traffic_builder.converters_from_har.har_to_saz_converter import convert_entries_to_saz
+from traffic_builder.converters_to_har.jtl_to_har_conterter import iter_har_entries as jtl_entries
+from traffic_builder.converters_to_har.saz_to_har_converter import iter_har_entries as saz_entries
+from traffic_builder.har_parsers.har_parser import parse_har
+from traffic_builder.har_parsers.har_writer import HarWriter
+from traffic_builder.har_parsers.pydantic_models import Browser, Creator, Entry, HarFile, Log, Page
+from traffic_builder.jtl_parser.csv_jtl_parser import iter_csv_jtl
+from traffic_builder.jtl_parser.jtl_parser import is_xml_jtl, iter_jtl
+from traffic_builder.saz_parser.models import SessionFilter
+from traffic_builder.saz_parser.saz_parser import iter_saz
+
+
+MAGIC = b"HARB"
+FORMAT_VERSION = 1
+FOOTER_MAGIC = b"HARBIDX\0"
+
+_PREAMBLE = struct.Struct("<4sHI")
+_RECORD = struct.Struct("<III")
+_FOOTER = struct.Struct("<QQ8s")
+
+
+def _split_bodies(entry: Entry) -> tuple[dict, bytes, bytes]:
+    data = entry.model_dump(by_alias=True, exclude_none=True)
+    request_body = data["request"].get("postData", {}).pop("text", "")
+    response_body = data["response"].get("content", {}).pop("text", "")
+    return data, request_body.encode("utf-8"), response_body.encode("utf-8")
+
+
+def _join_bodies(data: dict, request_body: Optional[bytes], response_body: Optional[bytes]) -> Entry:
+    if request_body is not None and "postData" in data["request"]:
+        data["request"]["postData"]["text"] = request_body.decode("utf-8")
+    if response_body is not None and "content" in data["response"]:
+        data["response"]["content"]["text"] = response_body.decode("utf-8")
+    return Entry.model_validate(data)
+
+
+class HarBinaryWriter:
+    """
+    Streaming .harb writer with the same interface as `HarWriter`:
+    entries are written as they come, the offset index is appended on exit.
+    """
+
+    def __init__(
+        self,
+        output_path: str | Path,
+        creator: Creator,
+        browser: Browser | None = None,
+        version: str = "1.2",
+        pages: list[Page] | None = None,
+        comment: str = ""
+    ):
+        self.output_path = output_path
+        self.creator = creator
+        self.browser = browser
+        self.version = version
+        self.pages = pages or []
+        self.comment = comment
+        self.count = 0
+        self._offsets = array("Q")
+        self._file: BinaryIO | None = None
+
+    def __enter__(self) -> "HarBinaryWriter":
+        self._file = open(self.output_path, 'wb')
+        log = Log(
+            version=self.version,
+            creator=self.creator,
+            browser=self.browser,
+            entries=[],
+            pages=self.pages,
+            comment=self.comment,
+        ).model_dump(by_alias=True, exclude_none=True)
+        del log["entries"]
+
+        header = json.dumps(log, separators=(",", ":")).encode("utf-8")
+        self._file.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        self._file.write(header)
+        return self
+
+    def write(self, entry: Entry) -> None:
+        data, request_body, response_body = _split_bodies(entry)
+        meta = json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+        self._offsets.append(self._file.tell())
+        self._file.write(_RECORD.pack(len(meta), len(request_body), len(response_body)))
+        self._file.write(meta)
+        self._file.write(request_body)
+        self._file.write(response_body)
+        self.count += 1
+
+    def write_all(self, entries: Iterable[Entry]) -> int:
+        for entry in entries:
+            self.write(entry)
+        return self.count
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            # Without the footer a reader would reject the file anyway; don't leave a partial capture behind.
+            self._file.close()
+            self._file = None
+            Path(self.output_path).unlink(missing_ok=True)
+            return
+        index_offset = self._file.tell()
+        self._file.write(self._offsets.tobytes())
+        self._file.write(_FOOTER.pack(index_offset, self.count, FOOTER_MAGIC))
+        self._file.close()
+        self._file = None
+
+
+class HarBinaryReader:
+    """
+    Random-access .harb reader. Only the header and the offset index are
+    loaded on open; `reader[n]` seeks straight to the n-th record.
+    """
+
+    def __init__(self, filepath: str | Path):
+        self.filepath = filepath
+        self._file: BinaryIO = open(filepath, 'rb')
+
+        magic, format_version, header_length = _PREAMBLE.unpack(self._file.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            self._file.close()
+            raise ValueError(f"Not a binary HAR file: {filepath}")
+        if format_version != FORMAT_VERSION:
+            self._file.close()
+            raise ValueError(f"Unsupported binary HAR version {format_version}: {filepath}")
+        self.log_info: dict = json.loads(self._file.read(header_length))
+
+        self._file.seek(-_FOOTER.size, 2)
+        index_offset, count, footer_magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+        if footer_magic != FOOTER_MAGIC:
+            self._file.close()
+            raise ValueError(f"Binary HAR file is truncated (no index): {filepath}")
+
+        self._file.seek(index_offset)
+        self._offsets = array("Q")
+        self._offsets.frombytes(self._file.read(count * self._offsets.itemsize))
+
+    def __enter__(self) -> "HarBinaryReader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def entry(self, index: int, include_bodies: bool = True) -> Entry:
+        if index < 0:
+            index += len(self._offsets)
+        if not 0 <= index < len(self._offsets):
+            raise IndexError(f"Entry index {index} out of range (0..{len(self._offsets) - 1})")
+
+        self._file.seek(self._offsets[index])
+        meta_length, request_length, response_length = _RECORD.unpack(self._file.read(_RECORD.size))
+        data = json.loads(self._file.read(meta_length))
+
+        if not include_bodies:
+            return _join_bodies(data, None, None)
+        request_body = self._file.read(request_length)
+        response_body = self._file.read(response_length)
+        return _join_bodies(data, request_body, response_body)
+
+    def __getitem__(self, index: int) -> Entry:
+        return self.entry(index)
+
+    def __iter__(self) -> Iterator[Entry]:
+        return self.iter_entries()
+
+    def iter_entries(self, include_bodies: bool = True) -> Iterator[Entry]:
+        for index in range(len(self._offsets)):
+            yield self.entry(index, include_bodies)
+
+    def creator(self) -> Creator:
+        return Creator.model_validate(self.log_info["creator"])
+
+    def browser(self) -> Browser | None:
+        browser = self.log_info.get("browser")
+        return Browser.model_validate(browser) if browser is not None else None
+
+    def pages(self) -> list[Page]:
+        return [Page.model_validate(page) for page in self.log_info.get("pages", [])]
+
+    def to_har_file(self) -> HarFile:
+        har_file = HarFile.model_validate({"log": {**self.log_info, "entries": []}})
+        har_file.log.entries = list(self)
+        return har_file
+
+
+def is_har_binary(filepath: str | Path) -> bool:
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save_har_binary(har_file: HarFile, output_path: str | Path) -> int:
+    log = har_file.log
+    with HarBinaryWriter(output_path, log.creator, log.browser, log.version, log.pages, log.comment) as writer:
+        return writer.write_all(log.entries)
+
+
+def parse_har_binary(filepath: str | Path) -> HarFile:
+    with HarBinaryReader(filepath) as reader:
+        return reader.to_har_file()
+
+
+def har_to_binary(har_path: str | Path, output_path: str | Path) -> int:
+    return save_har_binary(parse_har(har_path), output_path)
+
+
+def binary_to_har(binary_path: str | Path, output_path: str | Path, indent: int | None = 2) -> int:
+    with HarBinaryReader(binary_path) as reader:
+        with HarWriter(
+            output_path,
+            reader.creator(),
+            reader.browser(),
+            reader.log_info["version"],
+            indent,
+            reader.pages(),
+            reader.log_info.get("comment", ""),
+        ) as writer:
+            return writer.write_all(reader)
+
+
+def saz_to_binary(
+    saz_path: str | Path,
+    output_path: str | Path,
+    filter: Optional[SessionFilter] = None,
+    creator_name: str = "Fiddler",
+    creator_version: str = "5.0"
+) -> int:
+    creator = Creator(name=creator_name, version=creator_version)
+    with HarBinaryWriter(output_path, creator) as writer:
+        return writer.write_all(saz_entries(iter_saz(saz_path, filter)))
+
+
+def jtl_to_binary(
+    jtl_path: str | Path,
+    output_path: str | Path,
+    include_sub_samples: bool = False,
+    include_response_data: bool = False,
+    creator_name: str = "JMeter",
+    creator_version: str = "5.6"
+) -> int:
+    if is_xml_jtl(jtl_path):
+        samples = iter_jtl(jtl_path, include_response_data=include_response_data)
+    else:
+        samples = iter_csv_jtl(jtl_path)
+
+    creator = Creator(name=creator_name, version=creator_version)
+    with HarBinaryWriter(output_path, creator) as writer:
+        return writer.write_all(jtl_entries(samples, include_sub_samples))
+
+
+def binary_to_saz(binary_path: str | Path, output_path: str | Path) -> int:
+    with HarBinaryReader(binary_path) as reader:
+        return convert_entries_to_saz(reader, output_path)
+
+
+def binary_to_jtl(binary_path: str | Path, output_path: str | Path) -> int:
+    with HarBinaryReader(binary_path) as reader:
+        return convert_entries_to_jtl(reader, output_path)
@@ -0,0 +1,194 @@
+"""
+Random-access index over a JSON HAR file.
+
+A one-time scan records the byte span of every `log.entries[i]` object; the
+spans are persisted next to the HAR (`capture.har.idx`) together with the
+HAR size and mtime, so later runs reuse them until the file changes.
+`HarIndex[i]` then reads and validates only that entry.
+"""
+import json
+import mmap
+import os
+import re
+import struct
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+
+from traffic_builder.har_parsers.pydantic_models import Entry
+
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"HARIDX1\0"
+
+_INDEX_HEADER = struct.Struct("<8sQQQ")
+# A whole JSON string (escapes included) or a structural bracket.
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]')
+# Everything up to the next bracket outside strings (unrolled, so failing matches do not backtrack), then the bracket.
+_NEXT_BRACKET = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*([\[\]{}])', re.DOTALL)
+_OPENING = frozenset(b"{[")
+_WHITESPACE = b" \t\r\n"
+_KEY_MAX_LENGTH = 64
+
+
+def default_index_path(har_path: str | Path) -> Path:
+    har_path = Path(har_path)
+    return har_path.with_name(har_path.name + INDEX_SUFFIX)
+
+
+def _container_key(data, position: int, last_string: Optional[bytes]) -> Optional[bytes]:
+    # A container opened right after `"key":` belongs to that key.
+    position -= 1
+    while position >= 0 and data[position] in _WHITESPACE:
+        position -= 1
+    return last_string if position >= 0 and data[position] == ord(':') else None
+
+
+def _find_entries_array(data) -> int:
+    """Byte offset just past the `[` of `log.entries`."""
+    stack: list[Optional[bytes]] = []
+    last_string: Optional[bytes] = None
+
+    for match in _TOKEN.finditer(data):
+        start = match.start()
+        char = data[start]
+
+        if char == ord('"'):
+            end = match.end()
+            last_string = data[start + 1:end - 1] if end - start <= _KEY_MAX_LENGTH else None
+            continue
+        if char == ord('{') or char == ord('['):
+            key = _container_key(data, start, last_string)
+            if char == ord('[') and len(stack) == 2 and stack[1] == b"log" and key == b"entries":
+                return start + 1
+            stack.append(key)
+        elif stack:
+            stack.pop()
+        last_string = None
+
+    raise ValueError("HAR file has no log.entries array")
+
+
+def scan_entry_spans(data) -> array:
+    """
+    Returns a flat array of (start, end) byte offsets for every object in
+    `log.entries`. `data` is any bytes-like object (an mmap in practice).
+
+    The buffer is never decoded or copied: the regex runs over the bytes
+    directly and steps from one structural bracket to the next, consuming
+    strings (escapes included) whole, so only bracket depth is tracked here.
+    """
+    spans = array("Q")
+    position = _find_entries_array(data)
+    depth = 0
+    entry_start = 0
+
+    for match in _NEXT_BRACKET.finditer(data, position):
+        # A gap means the remainder did not match from `position`: an unterminated string.
+        if match.start() != position:
+            break
+        bracket = match.start(1)
+        position = match.end()
+
+        if data[bracket] in _OPENING:
+            if depth == 0:
+                entry_start = bracket
+            depth += 1
+        elif depth == 0:
+            return spans
+        else:
+            depth -= 1
+            if depth == 0:
+                spans.append(entry_start)
+                spans.append(position)
+
+    raise ValueError("HAR file is truncated inside log.entries")
+
+
+def _source_stat(har_path: Path) -> tuple[int, int]:
+    stat = os.stat(har_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _load_spans(har_path: Path, index_path: Path) -> Optional[array]:
+    if not index_path.exists():
+        return None
+    with open(index_path, 'rb') as f:
+        magic, size, mtime_ns, count = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+        if magic != INDEX_MAGIC or (size, mtime_ns) != _source_stat(har_path):
+            return None
+        spans = array("Q")
+        spans.frombytes(f.read(count * 2 * spans.itemsize))
+    return spans if len(spans) == count * 2 else None
+
+
+def _save_spans(har_path: Path, index_path: Path, spans: array) -> None:
+    size, mtime_ns = _source_stat(har_path)
+    with open(index_path, 'wb') as f:
+        f.write(_INDEX_HEADER.pack(INDEX_MAGIC, size, mtime_ns, len(spans) // 2))
+        f.write(spans.tobytes())
+
+
+def _build_spans(har_path: Path) -> array:
+    with open(har_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"HAR file is empty: {har_path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return scan_entry_spans(data)
+
+
+class HarIndex:
+    """
+    Lazily parsed view of the entries of a HAR file: supports `len`,
+    indexing (also negative) and iteration, each entry is parsed on access.
+    """
+
+    def __init__(self, har_path: str | Path, index_path: str | Path | None = None, persist: bool = True):
+        self.har_path = Path(har_path)
+        self.index_path = Path(index_path) if index_path is not None else default_index_path(har_path)
+
+        spans = _load_spans(self.har_path, self.index_path)
+        if spans is None:
+            spans = _build_spans(self.har_path)
+            if persist:
+                _save_spans(self.har_path, self.index_path, spans)
+
+        self._spans = spans
+        self._file: BinaryIO = open(self.har_path, 'rb')
+
+    def __enter__(self) -> "HarIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._spans) // 2
+
+    def raw(self, index: int) -> bytes:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError(f"Entry index {index} out of range (0..{count - 1})")
+
+        start, end = self._spans[2 * index], self._spans[2 * index + 1]
+        self._file.seek(start)
+        return self._file.read(end - start)
+
+    def __getitem__(self, index: int) -> Entry:
+        return Entry.model_validate(json.loads(self.raw(index)))
+
+    def __iter__(self) -> Iterator[Entry]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+def build_har_index(har_path: str | Path, index_path: str | Path | None = None) -> HarIndex:
+    """Rebuilds and persists the index even if an up-to-date one exists."""
+    index_path = Path(index_path) if index_path is not None else default_index_path(har_path)
+    _save_spans(Path(har_path), index_path, _build_spans(Path(har_path)))
+    return HarIndex(har_path, index_path)
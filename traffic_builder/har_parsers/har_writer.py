@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+from typing import Iterable, TextIO
+
+from traffic_builder.har_parsers.pydantic_models import Browser, Creator, Entry, Log, Page
+
+
+class HarWriter:
+    """
+    Incremental HAR writer: the log header is written on open, every entry is
+    serialized as soon as it is added, and the JSON is closed on exit. Only one
+    entry is held in memory at a time.
+    """
+
+    def __init__(
+        self,
+        output_path: str | Path,
+        creator: Creator,
+        browser: Browser | None = None,
+        version: str = "1.2",
+        indent: int | None = 2,
+        pages: list[Page] | None = None,
+        comment: str = ""
+    ):
+        self.output_path = output_path
+        self.creator = creator
+        self.browser = browser
+        self.version = version
+        self.indent = indent
+        self.pages = pages or []
+        self.comment = comment
+        self.count = 0
+        self._file: TextIO | None = None
+
+    def __enter__(self) -> "HarWriter":
+        self._file = open(self.output_path, 'w', encoding='utf-8')
+        log = Log(
+            version=self.version,
+            creator=self.creator,
+            browser=self.browser,
+            entries=[],
+            pages=self.pages,
+            comment=self.comment,
+        ).model_dump(by_alias=True, exclude_none=True)
+        del log["entries"]
+
+        header = json.dumps({"log": log}, indent=self.indent)
+        # Re-open the closing braces so entries can be appended to the log object.
+        self._file.write(header[:header.rindex("}", 0, header.rindex("}"))].rstrip())
+        self._file.write(self._separator(",") + self._quoted_key("entries") + "[")
+        return self
+
+    def _pad(self, level: int) -> str:
+        return "\n" + " " * (self.indent * level) if self.indent is not None else ""
+
+    def _separator(self, char: str) -> str:
+        return char + (self._pad(2) if self.indent is not None else " ")
+
+    def _quoted_key(self, key: str) -> str:
+        return json.dumps(key) + ": "
+
+    def write(self, entry: Entry) -> None:
+        data = json.dumps(entry.model_dump(by_alias=True, exclude_none=True), indent=self.indent)
+        if self.indent is not None:
+            data = data.replace("\n", self._pad(3))
+        self._file.write(("," if self.count else "") + self._pad(3) + data)
+        self.count += 1
+
+    def write_all(self, entries: Iterable[Entry]) -> int:
+        for entry in entries:
+            self.write(entry)
+        return self.count
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            # A closed-up JSON would pass for a complete capture; don't leave a partial one behind.
+            self._file.close()
+            self._file = None
+            Path(self.output_path).unlink(missing_ok=True)
+            return
+        if self.count and self.indent is not None:
+            self._file.write(self._pad(2))
+        self._file.write("]" + self._pad(1) + "}" + self._pad(0) + "}\n")
+        self._file.close()
+        self._file = None
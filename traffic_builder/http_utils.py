@@ -0,0 +1,94 @@
+"""
+Shared HTTP parsing helpers for the HAR converters.
+
+Captures repeat the same URLs and Set-Cookie headers thousands of times, so
+the string work (urlparse/parse_qs, cookie attribute splitting) is memoized in
+bounded LRU caches keyed by the raw value. Caches hold immutable tuples; every
+call builds fresh `Record`/`Cookie` models so entries never share instances.
+See benchmarks/bench_http_utils.py.
+"""
+from functools import lru_cache
+from typing import Iterable
+from urllib.parse import parse_qs, urlparse
+
+from traffic_builder.har_parsers.pydantic_models import Cookie, Record
+
+
+QUERY_CACHE_SIZE = 8192
+COOKIE_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _parse_query_pairs(url: str) -> tuple[tuple[str, str], ...]:
+    query = urlparse(url).query
+    if not query:
+        return ()
+
+    return tuple(
+        (name, value)
+        for name, values in parse_qs(query).items()
+        for value in values
+    )
+
+
+@lru_cache(maxsize=COOKIE_CACHE_SIZE)
+def _parse_set_cookie_attrs(header_value: str) -> tuple[tuple[str, str | bool], ...] | None:
+    cookie_parts = header_value.split(';')
+    name, sep, value = cookie_parts[0].strip().partition('=')
+    if not sep:
+        return None
+
+    cookie_attrs = {
+        'name': name.strip(),
+        'value': value.strip(),
+        'path': '/',
+        'domain': '',
+        'http_only': False,
+        'secure': False
+    }
+
+    for part in cookie_parts[1:]:
+        part = part.strip().lower()
+        if part == 'httponly':
+            cookie_attrs['http_only'] = True
+        elif part == 'secure':
+            cookie_attrs['secure'] = True
+        elif part.startswith('path='):
+            cookie_attrs['path'] = part.split('=', 1)[1]
+        elif part.startswith('domain='):
+            cookie_attrs['domain'] = part.split('=', 1)[1]
+
+    return tuple(cookie_attrs.items())
+
+
+def parse_query_string(url: str) -> list[Record]:
+    return [Record(name=name, value=value) for name, value in _parse_query_pairs(url)]
+
+
+def parse_set_cookie(header_value: str) -> Cookie | None:
+    attrs = _parse_set_cookie_attrs(header_value)
+    if attrs is None:
+        return None
+    return Cookie(**dict(attrs))
+
+
+def parse_cookies_from_headers(headers: Iterable) -> list[Cookie]:
+    cookies = []
+    for header in headers:
+        if header.name.lower() == 'set-cookie':
+            cookie = parse_set_cookie(header.value)
+            if cookie is not None:
+                cookies.append(cookie)
+    return cookies
+
+
+def cache_info() -> dict[str, object]:
+    return {
+        "query_string": _parse_query_pairs.cache_info(),
+        "set_cookie": _parse_set_cookie_attrs.cache_info(),
+    }
+
+
+def clear_caches() -> None:
+    _parse_query_pairs.cache_clear()
+    _parse_set_cookie_attrs.cache_clear()
@@ -0,0 +1,319 @@
+"""
+Columnar loader for CSV JTL files (JMeter's default result format).
+
+Rows are read in chunks and stored as NumPy arrays, or as `array.array` when
+NumPy is not installed. String columns are dictionary-encoded: each row keeps
+an integer code into a table of distinct values, so repeated labels, response
+codes and URLs are stored once. `HttpSample` objects are only built on demand.
+"""
+import array
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from itertools import islice, zip_longest
+from typing import Any, Callable, Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from traffic_builder.jtl_parser.models import AssertionResult, HttpSample, TestResults
+
+
+DEFAULT_HEADER = [
+    'timeStamp', 'elapsed', 'label', 'responseCode', 'responseMessage',
+    'threadName', 'dataType', 'success', 'failureMessage', 'bytes',
+    'sentBytes', 'grpThreads', 'allThreads', 'URL', 'Latency',
+    'IdleTime', 'Connect',
+]
+
+INT_COLUMNS = {
+    'timestamp': 'timeStamp',
+    'elapsed': 'elapsed',
+    'latency': 'Latency',
+    'connect_time': 'Connect',
+    'idle_time': 'IdleTime',
+    'bytes_received': 'bytes',
+    'sent_bytes': 'sentBytes',
+    'group_threads': 'grpThreads',
+    'all_threads': 'allThreads',
+}
+
+STRING_COLUMNS = {
+    'label': 'label',
+    'response_code': 'responseCode',
+    'response_message': 'responseMessage',
+    'thread_name': 'threadName',
+    'data_type': 'dataType',
+    'failure_message': 'failureMessage',
+    'url': 'URL',
+    'hostname': 'Hostname',
+}
+
+
+def _to_int(value: str) -> int:
+    if not value:
+        return 0
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _to_timestamp(value: str) -> int:
+    if not value or value.isdigit():
+        return _to_int(value)
+    dt = datetime.fromisoformat(value.replace('/', '-'))
+    return int(dt.timestamp() * 1000)
+
+
+def _int_array(values: Iterable[int], count: int) -> Any:
+    if np is not None:
+        return np.fromiter(values, dtype=np.int64, count=count)
+    return array.array('q', values)
+
+
+def _parse_int_column(values: tuple[str, ...], convert: Callable[[str], int]) -> Any:
+    try:
+        if np is not None:
+            return np.array(values, dtype=np.int64)
+        return array.array('q', map(int, values))
+    except ValueError:
+        return _int_array(map(convert, values), len(values))
+
+
+def _concat(chunks: list) -> Any:
+    if np is not None:
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+    result = array.array('q')
+    for chunk in chunks:
+        result.extend(chunk)
+    return result
+
+
+@dataclass
+class DictionaryColumn:
+    codes: Any
+    values: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[self.codes[index]]
+
+
+@dataclass
+class CsvJtlResults:
+    timestamp: Any
+    elapsed: Any
+    latency: Any
+    connect_time: Any
+    idle_time: Any
+    bytes_received: Any
+    sent_bytes: Any
+    group_threads: Any
+    all_threads: Any
+    success: Any
+    label: DictionaryColumn
+    response_code: DictionaryColumn
+    response_message: DictionaryColumn
+    thread_name: DictionaryColumn
+    data_type: DictionaryColumn
+    failure_message: DictionaryColumn
+    url: DictionaryColumn
+    hostname: DictionaryColumn
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __iter__(self) -> Iterator[HttpSample]:
+        for i in range(len(self)):
+            yield self.sample(i)
+
+    def sample(self, index: int) -> HttpSample:
+        failure_message = self.failure_message[index]
+        success = bool(self.success[index])
+
+        assertion_results = []
+        if failure_message:
+            assertion_results.append(AssertionResult(failure=True, failure_message=failure_message))
+
+        return HttpSample(
+            timestamp=int(self.timestamp[index]),
+            elapsed=int(self.elapsed[index]),
+            latency=int(self.latency[index]),
+            connect_time=int(self.connect_time[index]),
+            idle_time=int(self.idle_time[index]),
+            label=self.label[index],
+            thread_name=self.thread_name[index],
+            response_code=self.response_code[index],
+            response_message=self.response_message[index],
+            success=success,
+            data_type=self.data_type[index],
+            bytes_received=int(self.bytes_received[index]),
+            sent_bytes=int(self.sent_bytes[index]),
+            group_threads=int(self.group_threads[index]),
+            all_threads=int(self.all_threads[index]),
+            hostname=self.hostname[index],
+            error_count=0 if success else 1,
+            url=self.url[index] or None,
+            assertion_results=assertion_results,
+        )
+
+    def to_test_results(self) -> TestResults:
+        return TestResults(http_sample=list(self))
+
+
+class _CsvColumnBuilder:
+
+    def __init__(self, header: list[str]):
+        self.positions = {name: i for i, name in enumerate(header)}
+        self.width = len(header)
+        self.int_chunks: dict[str, list] = {name: [] for name in INT_COLUMNS}
+        self.success_chunks: list = []
+        self.code_chunks: dict[str, list] = {name: [] for name in STRING_COLUMNS}
+        self.dictionaries: dict[str, dict[str, int]] = {name: {'': 0} for name in STRING_COLUMNS}
+
+    def add_chunk(self, rows: list[list[str]]) -> None:
+        if not rows:
+            return
+
+        columns = list(zip_longest(*rows, fillvalue=''))
+        missing = ('',) * len(rows)
+
+        def column_values(name: str) -> tuple[str, ...] | None:
+            position = self.positions.get(name)
+            if position is None or position >= len(columns):
+                return None
+            return columns[position]
+
+        for attr, name in INT_COLUMNS.items():
+            values = column_values(name)
+            if values is None:
+                self.int_chunks[attr].append(_int_array((0,) * len(rows), len(rows)))
+                continue
+            convert = _to_timestamp if attr == 'timestamp' else _to_int
+            self.int_chunks[attr].append(_parse_int_column(values, convert))
+
+        values = column_values('success')
+        if values is None:
+            self.success_chunks.append(_int_array((1,) * len(rows), len(rows)))
+        else:
+            self.success_chunks.append(_int_array(map('true'.__eq__, values), len(rows)))
+
+        for attr, name in STRING_COLUMNS.items():
+            values = column_values(name) or missing
+            index = self.dictionaries[attr]
+            for value in sorted(set(values).difference(index)):
+                index[value] = len(index)
+            self.code_chunks[attr].append(_int_array(map(index.__getitem__, values), len(rows)))
+
+    def build(self) -> CsvJtlResults:
+        columns = {attr: _concat(chunks) for attr, chunks in self.int_chunks.items()}
+        success = _concat(self.success_chunks)
+        if np is not None:
+            success = success.astype(bool)
+
+        for attr in STRING_COLUMNS:
+            columns[attr] = DictionaryColumn(
+                codes=_concat(self.code_chunks[attr]),
+                values=list(self.dictionaries[attr]),
+            )
+
+        return CsvJtlResults(success=success, **columns)
+
+
+def _is_header(row: list[str]) -> bool:
+    return bool(row) and not row[0].strip().isdigit() and 'elapsed' in row
+
+
+def _iter_row_chunks(
+    filepath: str | Path,
+    chunk_size: int,
+    delimiter: str
+) -> Iterator[tuple[list[str], list[list[str]]]]:
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+
+        first_row = next(reader, None)
+        if first_row is None:
+            return
+
+        if _is_header(first_row):
+            header = first_row
+            rows = list(islice(reader, chunk_size))
+        else:
+            header = DEFAULT_HEADER
+            rows = [first_row] + list(islice(reader, chunk_size - 1))
+
+        while rows:
+            yield header, rows
+            rows = list(islice(reader, chunk_size))
+
+
+def load_csv_jtl(
+    filepath: str | Path,
+    chunk_size: int = 10_000,
+    delimiter: str = ','
+) -> CsvJtlResults:
+    builder = None
+    for header, rows in _iter_row_chunks(filepath, chunk_size, delimiter):
+        if builder is None:
+            builder = _CsvColumnBuilder(header)
+        builder.add_chunk(rows)
+
+    if builder is None:
+        builder = _CsvColumnBuilder(DEFAULT_HEADER)
+    return builder.build()
+
+
+def iter_csv_jtl_chunks(
+    filepath: str | Path,
+    chunk_size: int = 10_000,
+    delimiter: str = ','
+) -> Iterator[CsvJtlResults]:
+    for header, rows in _iter_row_chunks(filepath, chunk_size, delimiter):
+        builder = _CsvColumnBuilder(header)
+        builder.add_chunk(rows)
+        yield builder.build()
+
+
+def iter_csv_jtl(
+    filepath: str | Path,
+    chunk_size: int = 10_000,
+    delimiter: str = ','
+) -> Iterator[HttpSample]:
+    for chunk in iter_csv_jtl_chunks(filepath, chunk_size, delimiter):
+        yield from chunk
+
+
+def _failure_message(sample: HttpSample) -> str:
+    for assertion in sample.assertion_results:
+        if assertion.failure or assertion.error:
+            return assertion.failure_message
+    return ''
+
+
+def write_csv_jtl(
+    samples: Iterable[HttpSample],
+    output_path: str | Path,
+    delimiter: str = ','
+) -> int:
+    count = 0
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(DEFAULT_HEADER + ['Hostname'])
+        for sample in samples:
+            writer.writerow([
+                sample.timestamp, sample.elapsed, sample.label, sample.response_code,
+                sample.response_message, sample.thread_name, sample.data_type,
+                'true' if sample.success else 'false', _failure_message(sample),
+                sample.bytes_received, sample.sent_bytes, sample.group_threads,
+                sample.all_threads, sample.url or '', sample.latency,
+                sample.idle_time, sample.connect_time, sample.hostname,
+            ])
+            count += 1
+    return count
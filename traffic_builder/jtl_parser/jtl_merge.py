@@ -0,0 +1,82 @@
+"""
+Time-ordered merge of JTL files written by several load generators.
+
+Every file is streamed (`iter_jtl` for XML, `iter_csv_jtl` for CSV) and the
+streams are combined with a heap-based k-way merge on the sample timestamp,
+so memory holds one pending sample per file plus the reorder buffer.
+
+JMeter writes a sample when it completes, so inside one file start timestamps
+are out of order by up to the longest response time. Each file is reordered
+through a buffer of `reorder_window_ms` (`DEFAULT_REORDER_WINDOW_MS` by
+default); the merged stream is time-ordered only if no response took longer
+than the window. `reorder_window_ms=0` trusts the files to be sorted already.
+"""
+import heapq
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from traffic_builder.jtl_parser.csv_jtl_parser import iter_csv_jtl, write_csv_jtl
+from traffic_builder.jtl_parser.jtl_parser import is_xml_jtl, iter_jtl
+from traffic_builder.jtl_parser.models import HttpSample
+
+
+DEFAULT_REORDER_WINDOW_MS = 60_000
+
+
+def iter_jtl_file(filepath: str | Path) -> Iterator[HttpSample]:
+    if is_xml_jtl(filepath):
+        return iter_jtl(filepath)
+    return iter_csv_jtl(filepath)
+
+
+def _tag_hostname(samples: Iterable[HttpSample], hostname: str, override: bool) -> Iterator[HttpSample]:
+    """An explicit hostname replaces `hn`; the file-stem default only fills samples without one."""
+    for sample in samples:
+        if override or not sample.hostname:
+            sample.hostname = hostname
+        yield sample
+
+
+def _reorder(samples: Iterable[HttpSample], window_ms: int) -> Iterator[HttpSample]:
+    """
+    JMeter writes a sample when it completes, so start timestamps inside one
+    file are only ordered up to the longest response time. Samples are held in
+    a small heap until the stream has advanced `window_ms` past them.
+    """
+    buffer: list[tuple[int, int, HttpSample]] = []
+    for seq, sample in enumerate(samples):
+        heapq.heappush(buffer, (sample.timestamp, seq, sample))
+        while buffer[0][0] <= sample.timestamp - window_ms:
+            yield heapq.heappop(buffer)[2]
+    while buffer:
+        yield heapq.heappop(buffer)[2]
+
+
+def merge_jtl(
+    paths: list[str | Path],
+    hostnames: list[str] | None = None,
+    reorder_window_ms: int = DEFAULT_REORDER_WINDOW_MS
+) -> Iterator[HttpSample]:
+    if hostnames is not None and len(hostnames) != len(paths):
+        raise ValueError(f"Expected {len(paths)} hostnames, got {len(hostnames)}")
+
+    streams = []
+    for i, path in enumerate(paths):
+        if hostnames is not None:
+            stream = _tag_hostname(iter_jtl_file(path), hostnames[i], override=True)
+        else:
+            stream = _tag_hostname(iter_jtl_file(path), Path(path).stem, override=False)
+        if reorder_window_ms > 0:
+            stream = _reorder(stream, reorder_window_ms)
+        streams.append(stream)
+
+    return heapq.merge(*streams, key=lambda sample: sample.timestamp)
+
+
+def merge_jtl_to_file(
+    paths: list[str | Path],
+    output_path: str | Path,
+    hostnames: list[str] | None = None,
+    reorder_window_ms: int = DEFAULT_REORDER_WINDOW_MS
+) -> int:
+    return write_csv_jtl(merge_jtl(paths, hostnames, reorder_window_ms), output_path)
@@ -1,7 +1,6 @@
-import re
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Iterator
 
 from traffic_builder.jtl_parser.models import TestResults, HttpSample, AssertionResult
 
@@ -41,25 +40,119 @@ def _parse_assertion_result(element: ET.Element) -> AssertionResult:
     return AssertionResult.model_validate(data)
 
 
+class _ResponseDataStripper:
+    """
+    Binary file wrapper that drops the contents of <responseData> elements
+    before they reach the XML tokenizer. Only a marker-sized tail is buffered
+    between reads, so memory does not depend on the size of response bodies.
+    """
+    CHUNK_SIZE = 1024 * 1024
+    OPEN_MARKER = b'<responseData'
+    CLOSE_MARKER = b'</responseData>'
+
+    def __init__(self, source: BinaryIO):
+        self.source = source
+        self.pending = b''
+        self.output = bytearray()
+        self.inside = False
+        self.eof = False
+
+    def read(self, size: int = -1) -> bytes:
+        while not self.eof and (size < 0 or len(self.output) < size):
+            chunk = self.source.read(self.CHUNK_SIZE)
+            if not chunk:
+                self.eof = True
+                if not self.inside:
+                    self.output += self.pending
+                self.pending = b''
+                break
+            self.pending += chunk
+            self._process()
+
+        if size < 0 or size >= len(self.output):
+            data = bytes(self.output)
+            self.output.clear()
+        else:
+            data = bytes(self.output[:size])
+            del self.output[:size]
+        return data
+
+    def _process(self):
+        pending = self.pending
+        while True:
+            if self.inside:
+                end = pending.find(self.CLOSE_MARKER)
+                if end == -1:
+                    pending = pending[-(len(self.CLOSE_MARKER) - 1):]
+                    break
+                pending = pending[end:]
+                self.inside = False
+                continue
+
+            start = pending.find(self.OPEN_MARKER)
+            if start == -1:
+                keep = len(self.OPEN_MARKER) - 1
+                self.output += pending[:-keep]
+                pending = pending[-keep:]
+                break
+
+            tag_end = pending.find(b'>', start)
+            if tag_end == -1:
+                self.output += pending[:start]
+                pending = pending[start:]
+                break
+
+            next_char = pending[start + len(self.OPEN_MARKER):start + len(self.OPEN_MARKER) + 1]
+            self.output += pending[:tag_end + 1]
+            if next_char in (b'>', b' ', b'\t', b'\r', b'\n') and pending[tag_end - 1:tag_end] != b'/':
+                self.inside = True
+            pending = pending[tag_end + 1:]
+
+        self.pending = pending
+
+
+def _open_jtl_source(f: BinaryIO, include_response_data: bool) -> BinaryIO | _ResponseDataStripper:
+    return f if include_response_data else _ResponseDataStripper(f)
+
+
+def is_xml_jtl(filepath: str | Path) -> bool:
+    with open(filepath, 'rb') as f:
+        return f.read(256).lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'<')
+
+
+def _read_jtl_version(filepath: str | Path) -> str:
+    with open(filepath, 'rb') as f:
+        for _, element in ET.iterparse(f, events=("start",)):
+            return element.attrib.get("version", "1.2")
+    return "1.2"
+
+
+def iter_jtl(filepath: str | Path, include_response_data: bool = False) -> Iterator[HttpSample]:
+    with open(filepath, 'rb') as f:
+        source = _open_jtl_source(f, include_response_data)
+        root = None
+        depth = 0
+        
+        for event, element in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = element
+                depth += 1
+                continue
+            
+            depth -= 1
+            if depth == 1:
+                if element.tag == "httpSample":
+                    yield _parse_http_sample(element)
+                root.clear()
+
+
 def parse_jtl(filepath: str | Path) -> TestResults:
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    content = re.sub(r'<responseData[^>]*>.*?</responseData>', 
-                     '<responseData class="java.lang.String"></responseData>', 
-                     content, flags=re.DOTALL)
-    
-    root = ET.fromstring(content)
-    
     data = {
-        "version": root.attrib.get("version", "1.2"),
-        "httpSample": []
+        "version": _read_jtl_version(filepath),
+        "httpSample": list(iter_jtl(filepath))
     }
     
-    for child in root:
-        if child.tag == "httpSample":
-            data["httpSample"].append(_parse_http_sample(child))
-    
     return TestResults.model_validate(data)
 
 
@@ -0,0 +1,278 @@
+"""
+Mergeable quantile sketches for latency analysis over unbounded JTL streams.
+
+`QuantileSketch` is a log-bucketed histogram (HDR-histogram / DDSketch style):
+a positive value v falls into bucket ceil(log_gamma(v)) with
+gamma = (1 + a) / (1 - a), so every reported quantile is within relative error
+`a` of the exact nearest-rank value. Buckets are plain counters, which makes
+sketches from different load generators mergeable by addition and trivially
+serializable to JSON.
+"""
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from traffic_builder.jtl_parser.csv_jtl_parser import iter_csv_jtl_chunks
+from traffic_builder.jtl_parser.jtl_parser import is_xml_jtl, iter_jtl
+from traffic_builder.jtl_parser.models import HttpSample
+
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_WINDOW_MS = 60_000
+
+
+class QuantileSketch:
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _bucket_index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _bucket_value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value < 0:
+            raise ValueError(f"QuantileSketch accepts non-negative values, got {value}")
+        if value == 0:
+            self.zero_count += count
+        else:
+            index = self._bucket_index(value)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def add_many(self, values: Iterable[float]) -> None:
+        if np is None:
+            for value in values:
+                self.add(value)
+            return
+
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        if values.min() < 0:
+            raise ValueError("QuantileSketch accepts non-negative values")
+
+        positive = values[values > 0]
+        indexes, counts = np.unique(np.ceil(np.log(positive) / self._log_gamma).astype(np.int64), return_counts=True)
+        for index, count in zip(indexes.tolist(), counts.tolist()):
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+        self.zero_count += len(values) - len(positive)
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                f"Cannot merge sketches with different accuracy: "
+                f"{self.relative_accuracy} and {other.relative_accuracy}"
+            )
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be in [0, 1], got {q}")
+        if self.count == 0:
+            return math.nan
+
+        rank = max(1, math.ceil(q * self.count))
+        if rank <= self.zero_count:
+            return 0.0
+
+        seen = self.zero_count
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+
+        return self.max
+
+    def percentiles(self, percentiles: Iterable[int] = (50, 90, 95, 99)) -> dict[int, float]:
+        return {p: self.quantile(p / 100.0) for p in percentiles}
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "buckets": {str(index): count for index, count in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(relative_accuracy=data["relative_accuracy"])
+        sketch.buckets = {int(index): count for index, count in data["buckets"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        sketch.min = data["min"] if data["min"] is not None else math.inf
+        sketch.max = data["max"] if data["max"] is not None else -math.inf
+        return sketch
+
+
+@dataclass
+class LatencySketches:
+    """
+    Elapsed-time sketches per (label, time window) for a JTL stream.
+    Per-node instances are merged with `merge` or `merge_files`.
+    """
+    window_ms: int = DEFAULT_WINDOW_MS
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+    sketches: dict[tuple[str, int], QuantileSketch] = field(default_factory=dict)
+
+    def _window_start(self, timestamp: int) -> int:
+        return timestamp - timestamp % self.window_ms
+
+    def _sketch(self, label: str, window_start: int) -> QuantileSketch:
+        key = (label, window_start)
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            sketch = QuantileSketch(self.relative_accuracy)
+            self.sketches[key] = sketch
+        return sketch
+
+    def add(self, sample: HttpSample) -> None:
+        self._sketch(sample.label, self._window_start(sample.timestamp)).add(sample.elapsed)
+
+    def add_samples(self, samples: Iterable[HttpSample]) -> None:
+        for sample in samples:
+            self.add(sample)
+
+    def add_columns(self, timestamps: Any, elapsed: Any, label_codes: Any, labels: list[str]) -> None:
+        if np is None:
+            for ts, value, code in zip(timestamps, elapsed, label_codes):
+                self._sketch(labels[code], self._window_start(ts)).add(value)
+            return
+
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        elapsed = np.asarray(elapsed, dtype=np.int64)
+        label_codes = np.asarray(label_codes, dtype=np.int64)
+        windows = timestamps - timestamps % self.window_ms
+
+        keys = np.stack([label_codes, windows], axis=1)
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        order = np.argsort(inverse, kind="stable")
+        starts = np.searchsorted(inverse[order], np.arange(len(unique_keys)))
+        ends = np.r_[starts[1:], len(order)]
+
+        for (code, window_start), start, end in zip(unique_keys.tolist(), starts, ends):
+            self._sketch(labels[code], window_start).add_many(elapsed[order[start:end]])
+
+    def merge(self, other: "LatencySketches") -> None:
+        if other.window_ms != self.window_ms:
+            raise ValueError(f"Cannot merge sketches with windows {self.window_ms} and {other.window_ms}")
+        for (label, window_start), sketch in other.sketches.items():
+            self._sketch(label, window_start).merge(sketch)
+
+    def labels(self) -> list[str]:
+        return sorted({label for label, _ in self.sketches})
+
+    def by_label(self) -> dict[str, QuantileSketch]:
+        result: dict[str, QuantileSketch] = {}
+        for (label, _), sketch in self.sketches.items():
+            if label not in result:
+                result[label] = QuantileSketch(self.relative_accuracy)
+            result[label].merge(sketch)
+        return result
+
+    def by_window(self, label: str) -> dict[int, QuantileSketch]:
+        return {
+            window_start: sketch
+            for (sketch_label, window_start), sketch in sorted(self.sketches.items())
+            if sketch_label == label
+        }
+
+    def total(self) -> QuantileSketch:
+        result = QuantileSketch(self.relative_accuracy)
+        for sketch in self.sketches.values():
+            result.merge(sketch)
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "window_ms": self.window_ms,
+            "relative_accuracy": self.relative_accuracy,
+            "sketches": [
+                {"label": label, "window_start": window_start, "sketch": sketch.to_dict()}
+                for (label, window_start), sketch in sorted(self.sketches.items())
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencySketches":
+        result = cls(window_ms=data["window_ms"], relative_accuracy=data["relative_accuracy"])
+        for item in data["sketches"]:
+            result.sketches[(item["label"], item["window_start"])] = QuantileSketch.from_dict(item["sketch"])
+        return result
+
+    def save(self, output_path: str | Path) -> None:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, filepath: str | Path) -> "LatencySketches":
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def merge_files(cls, filepaths: Iterable[str | Path]) -> "LatencySketches":
+        result = None
+        for filepath in filepaths:
+            sketches = cls.load(filepath)
+            if result is None:
+                result = sketches
+            else:
+                result.merge(sketches)
+        return result if result is not None else cls()
+
+
+def sketch_jtl(
+    filepath: str | Path,
+    window_ms: int = DEFAULT_WINDOW_MS,
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+) -> LatencySketches:
+    sketches = LatencySketches(window_ms=window_ms, relative_accuracy=relative_accuracy)
+    if is_xml_jtl(filepath):
+        sketches.add_samples(iter_jtl(filepath))
+    else:
+        for chunk in iter_csv_jtl_chunks(filepath, chunk_size=100_000):
+            sketches.add_columns(chunk.timestamp, chunk.elapsed, chunk.label.codes, chunk.label.values)
+    return sketches
@@ -0,0 +1,245 @@
+"""
+Columnar in-memory store of JTL results with JMeter Aggregate Report statistics.
+
+All samples are kept as flat NumPy columns plus an integer label code per row.
+Aggregation sorts once by (label, elapsed) and then derives every per-label
+figure (count, error %, mean, min/max, percentiles, throughput) with
+vectorized reductions over the label segments.
+"""
+import array
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from traffic_builder.jtl_parser.csv_jtl_parser import CsvJtlResults, load_csv_jtl
+from traffic_builder.jtl_parser.jtl_parser import is_xml_jtl, iter_jtl
+from traffic_builder.jtl_parser.models import HttpSample
+
+
+TOTAL_LABEL = "TOTAL"
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class LabelStatistics:
+    label: str
+    count: int
+    error_count: int
+    error_percent: float
+    mean: float
+    min: int
+    max: int
+    std_dev: float
+    percentiles: dict[int, float]
+    throughput: float
+    received_kb_per_sec: float
+    sent_kb_per_sec: float
+
+    @property
+    def median(self) -> float:
+        return self.percentiles.get(50, math.nan)
+
+    def to_str(self) -> str:
+        percentiles = " ".join(f"p{p}={v:.0f}" for p, v in self.percentiles.items())
+        return (
+            f"{self.label}: n={self.count} err={self.error_percent:.2f}% "
+            f"mean={self.mean:.1f} min={self.min} max={self.max} {percentiles} "
+            f"tput={self.throughput:.2f}/s"
+        )
+
+
+@dataclass
+class ThroughputSeries:
+    window_ms: int
+    start_timestamp: int
+    labels: list[str]
+    counts: Any
+    errors: Any
+
+    def window_starts(self) -> Any:
+        return self.start_timestamp + np.arange(self.counts.shape[1], dtype=np.int64) * self.window_ms
+
+
+@dataclass
+class ResultStore:
+    timestamp: Any
+    elapsed: Any
+    latency: Any
+    connect_time: Any
+    bytes_received: Any
+    sent_bytes: Any
+    success: Any
+    label_codes: Any
+    labels: list[str]
+
+    def __post_init__(self):
+        if np is None:
+            raise ImportError("ResultStore requires numpy")
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def from_csv(cls, results: CsvJtlResults) -> "ResultStore":
+        # The dictionary column may hold values no row uses (it always seeds ''); keep only
+        # the labels that occur, numbered by first occurrence like `from_samples`.
+        codes = np.asarray(results.label.codes, dtype=np.int64)
+        used, first_rows = np.unique(codes, return_index=True)
+        used = used[np.argsort(first_rows)]
+        remap = np.zeros(len(results.label.values), dtype=np.int64)
+        remap[used] = np.arange(len(used))
+
+        return cls(
+            timestamp=np.asarray(results.timestamp, dtype=np.int64),
+            elapsed=np.asarray(results.elapsed, dtype=np.int64),
+            latency=np.asarray(results.latency, dtype=np.int64),
+            connect_time=np.asarray(results.connect_time, dtype=np.int64),
+            bytes_received=np.asarray(results.bytes_received, dtype=np.int64),
+            sent_bytes=np.asarray(results.sent_bytes, dtype=np.int64),
+            success=np.asarray(results.success, dtype=bool),
+            label_codes=remap[codes],
+            labels=[results.label.values[code] for code in used],
+        )
+
+    @classmethod
+    def from_samples(cls, samples: Iterable[HttpSample]) -> "ResultStore":
+        columns = {name: array.array('q') for name in (
+            "timestamp", "elapsed", "latency", "connect_time",
+            "bytes_received", "sent_bytes", "success", "label_codes",
+        )}
+        label_index: dict[str, int] = {}
+
+        for sample in samples:
+            columns["timestamp"].append(sample.timestamp)
+            columns["elapsed"].append(sample.elapsed)
+            columns["latency"].append(sample.latency)
+            columns["connect_time"].append(sample.connect_time)
+            columns["bytes_received"].append(sample.bytes_received)
+            columns["sent_bytes"].append(sample.sent_bytes)
+            columns["success"].append(sample.success)
+            columns["label_codes"].append(label_index.setdefault(sample.label, len(label_index)))
+
+        arrays = {name: np.frombuffer(column, dtype=np.int64).copy() for name, column in columns.items()}
+        arrays["success"] = arrays["success"].astype(bool)
+
+        return cls(labels=list(label_index), **arrays)
+
+    def select(self, label: str) -> "ResultStore":
+        if label not in self.labels:
+            return ResultStore.from_samples([])
+        mask = self.label_codes == self.labels.index(label)
+        return ResultStore(
+            timestamp=self.timestamp[mask],
+            elapsed=self.elapsed[mask],
+            latency=self.latency[mask],
+            connect_time=self.connect_time[mask],
+            bytes_received=self.bytes_received[mask],
+            sent_bytes=self.sent_bytes[mask],
+            success=self.success[mask],
+            label_codes=np.zeros(int(mask.sum()), dtype=np.int64),
+            labels=[label],
+        )
+
+    def aggregate(
+        self,
+        percentiles: tuple[int, ...] = DEFAULT_PERCENTILES,
+        include_total: bool = True
+    ) -> list[LabelStatistics]:
+        if len(self) == 0:
+            return []
+
+        result = self._aggregate_groups(self.label_codes, self.labels, percentiles)
+        result.sort(key=lambda s: s.label)
+
+        if include_total:
+            total_codes = np.zeros(len(self), dtype=np.int64)
+            result.extend(self._aggregate_groups(total_codes, [TOTAL_LABEL], percentiles))
+
+        return result
+
+    def _aggregate_groups(
+        self,
+        codes: Any,
+        labels: list[str],
+        percentiles: tuple[int, ...]
+    ) -> list[LabelStatistics]:
+        order = np.lexsort((self.elapsed, codes))
+        sorted_codes = codes[order]
+        elapsed = self.elapsed[order]
+
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+        counts = ends - starts
+
+        errors = np.add.reduceat((~self.success[order]).astype(np.int64), starts)
+        sums = np.add.reduceat(elapsed.astype(np.float64), starts)
+        squares = np.add.reduceat(elapsed.astype(np.float64) ** 2, starts)
+        means = sums / counts
+        std_devs = np.sqrt(np.maximum(squares / counts - means ** 2, 0.0))
+
+        first_start = np.minimum.reduceat(self.timestamp[order], starts)
+        last_end = np.maximum.reduceat((self.timestamp + self.elapsed)[order], starts)
+        durations = (last_end - first_start) / 1000.0
+        safe_durations = np.where(durations > 0, durations, np.inf)
+
+        received = np.add.reduceat(self.bytes_received[order], starts) / 1024.0 / safe_durations
+        sent = np.add.reduceat(self.sent_bytes[order], starts) / 1024.0 / safe_durations
+        throughput = counts / safe_durations
+
+        percentile_values = {
+            p: elapsed[starts + np.clip(np.ceil(counts * p / 100.0).astype(np.int64) - 1, 0, counts - 1)]
+            for p in percentiles
+        }
+
+        return [
+            LabelStatistics(
+                label=labels[sorted_codes[start]],
+                count=int(counts[i]),
+                error_count=int(errors[i]),
+                error_percent=float(errors[i]) * 100.0 / counts[i],
+                mean=float(means[i]),
+                min=int(elapsed[start]),
+                max=int(elapsed[ends[i] - 1]),
+                std_dev=float(std_devs[i]),
+                percentiles={p: float(values[i]) for p, values in percentile_values.items()},
+                throughput=float(throughput[i]),
+                received_kb_per_sec=float(received[i]),
+                sent_kb_per_sec=float(sent[i]),
+            )
+            for i, start in enumerate(starts)
+        ]
+
+    def throughput_windows(self, window_ms: int = 1000) -> ThroughputSeries:
+        if len(self) == 0:
+            empty = np.zeros((len(self.labels), 0), dtype=np.int64)
+            return ThroughputSeries(window_ms, 0, list(self.labels), empty, empty)
+
+        start = int(self.timestamp.min())
+        buckets = (self.timestamp - start) // window_ms
+        bucket_count = int(buckets.max()) + 1
+        flat = self.label_codes * bucket_count + buckets
+        size = len(self.labels) * bucket_count
+
+        counts = np.bincount(flat, minlength=size).reshape(len(self.labels), bucket_count)
+        errors = np.bincount(flat[~self.success], minlength=size).reshape(len(self.labels), bucket_count)
+
+        return ThroughputSeries(window_ms, start, list(self.labels), counts, errors)
+
+
+def load_result_store(filepath: str | Path) -> ResultStore:
+    if is_xml_jtl(filepath):
+        return ResultStore.from_samples(iter_jtl(filepath))
+    return ResultStore.from_csv(load_csv_jtl(filepath))
+
+
+def aggregate_report_to_str(statistics: list[LabelStatistics]) -> str:
+    lines = ["=" * 80, "AGGREGATE REPORT", "=" * 80]
+    lines.extend(stat.to_str() for stat in statistics)
+    lines.append("=" * 80)
+    return "\n".join(lines)
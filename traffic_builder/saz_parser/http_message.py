@@ -0,0 +1,185 @@
+"""
+Bytes-level HTTP/1.x message parser for raw SAZ session files.
+
+The message is never decoded as a whole: the header terminator is located
+with a single search, only the head is turned into text, and the body is kept
+as a zero-copy memoryview slice of the original buffer. Transfer and content
+encodings are removed on demand by `decode_body`.
+"""
+import gzip
+import logging
+import zlib
+
+from traffic_builder.saz_parser.models import (
+    Request, Response, RequestLine, StatusLine, Header
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+# Raised by `dechunk`/`decompress` on bodies they cannot decode.
+BODY_DECODE_ERRORS: tuple[type[Exception], ...] = (ValueError, OSError, EOFError, zlib.error)
+if brotli is not None:
+    BODY_DECODE_ERRORS += (brotli.error,)
+
+
+HEADER_TERMINATOR = b'\r\n\r\n'
+BARE_HEADER_TERMINATOR = b'\n\n'
+
+
+def _split_message(content: bytes) -> tuple[memoryview, memoryview]:
+    view = memoryview(content)
+
+    head_end = content.find(HEADER_TERMINATOR)
+    if head_end != -1:
+        return view[:head_end], view[head_end + len(HEADER_TERMINATOR):]
+
+    head_end = content.find(BARE_HEADER_TERMINATOR)
+    if head_end != -1:
+        return view[:head_end], view[head_end + len(BARE_HEADER_TERMINATOR):]
+
+    return view, view[len(content):]
+
+
+def _parse_head(head: memoryview) -> tuple[str, list[Header]]:
+    text = str(head, 'utf-8', 'ignore')
+    lines = text.split('\n')
+
+    headers = []
+    for line in lines[1:]:
+        name, sep, value = line.partition(':')
+        if sep:
+            headers.append(Header(name=name.strip(), value=value.strip()))
+
+    return lines[0].strip(), headers
+
+
+def find_header(headers: list[Header], name: str) -> str | None:
+    name = name.lower()
+    for header in headers:
+        if header.name.lower() == name:
+            return header.value
+    return None
+
+
+def parse_request_line(line: str) -> RequestLine:
+    request_line_parts = line.strip().split(' ', 2)
+    return RequestLine(
+        method=request_line_parts[0],
+        url=request_line_parts[1] if len(request_line_parts) > 1 else '',
+        http_version=request_line_parts[2] if len(request_line_parts) > 2 else 'HTTP/1.1'
+    )
+
+
+def parse_status_line(line: str) -> StatusLine:
+    status_line_parts = line.strip().split(' ', 2)
+    return StatusLine(
+        http_version=status_line_parts[0],
+        status_code=int(status_line_parts[1]),
+        status_text=status_line_parts[2] if len(status_line_parts) > 2 else ''
+    )
+
+
+def parse_request(content: bytes) -> Request:
+    head, body = _split_message(content)
+    start_line, headers = _parse_head(head)
+
+    return Request(
+        request_line=parse_request_line(start_line),
+        headers=headers,
+        body=body
+    )
+
+
+def parse_response(content: bytes) -> Response:
+    head, body = _split_message(content)
+    start_line, headers = _parse_head(head)
+
+    return Response(
+        status_line=parse_status_line(start_line),
+        headers=headers,
+        body=body
+    )
+
+
+def dechunk(body: bytes | memoryview) -> bytes:
+    data = bytes(body) if isinstance(body, memoryview) else body
+    view = memoryview(data)
+    chunks = []
+    pos = 0
+
+    while pos < len(data):
+        line_end = data.find(b'\r\n', pos)
+        if line_end == -1:
+            raise ValueError(f"Malformed chunk size line at offset {pos}")
+
+        size_field = data[pos:line_end].split(b';', 1)[0].strip()
+        size = int(size_field, 16)
+        if size == 0:
+            break
+
+        chunk_start = line_end + 2
+        chunk_end = chunk_start + size
+        if chunk_end > len(data):
+            raise ValueError(f"Chunk at offset {pos} exceeds message body")
+
+        chunks.append(view[chunk_start:chunk_end])
+        pos = chunk_end + 2
+
+    return b''.join(chunks)
+
+
+def decompress(body: bytes | memoryview, content_encoding: str) -> bytes | memoryview:
+    for encoding in reversed([e.strip().lower() for e in content_encoding.split(',')]):
+        if encoding in ('', 'identity'):
+            continue
+        if encoding in ('gzip', 'x-gzip'):
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            try:
+                body = zlib.decompress(body)
+            except zlib.error:
+                body = zlib.decompress(body, -zlib.MAX_WBITS)
+        elif encoding == 'br':
+            if brotli is None:
+                raise ValueError("Content-Encoding 'br' requires the 'brotli' package")
+            body = brotli.decompress(bytes(body))
+        else:
+            raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+    return body
+
+
+def is_chunked(headers: list[Header]) -> bool:
+    return 'chunked' in (find_header(headers, 'Transfer-Encoding') or '').lower()
+
+
+def decode_body(
+    headers: list[Header],
+    body: bytes | memoryview,
+    source: str = "Message body"
+) -> tuple[bytes | memoryview, int]:
+    """
+    Body without transfer and content encodings, and its length before content
+    decoding. A body that cannot be decoded (unknown encoding, `br` without the
+    `brotli` package, corrupt data) is logged under `source` and kept as it is.
+    """
+    if is_chunked(headers):
+        try:
+            body = dechunk(body)
+        except BODY_DECODE_ERRORS as error:
+            logger.warning("%s kept undecoded: %s", source, error)
+            return body, len(body)
+
+    encoded_length = len(body)
+    content_encoding = find_header(headers, 'Content-Encoding')
+    if content_encoding:
+        try:
+            body = decompress(body, content_encoding)
+        except BODY_DECODE_ERRORS as error:
+            logger.warning("%s kept undecoded: %s", source, error)
+    return body, encoded_length
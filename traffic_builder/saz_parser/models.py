@@ -65,7 +65,7 @@ class Header:
 class Request:
     request_line: RequestLine
     headers: list[Header] = field(default_factory=list)
-    body: bytes = b""
+    body: bytes | memoryview = b""
 
 
 @dataclass
@@ -79,7 +79,7 @@ class StatusLine:
 class Response:
     status_line: StatusLine
     headers: list[Header] = field(default_factory=list)
-    body: bytes = b""
+    body: bytes | memoryview = b""
 
 
 @dataclass
@@ -92,4 +92,30 @@ class SazSession:
 
 @dataclass
 class SazArchive:
-    sessions: list[SazSession] = field(default_factory=list)
\ No newline at end of file
+    sessions: list[SazSession] = field(default_factory=list)
+
+
+@dataclass
+class SessionFilter:
+    methods: list[str] | None = None
+    status_codes: list[int] | None = None
+    flags: dict[str, Optional[str]] = field(default_factory=dict)
+
+    def matches_metadata(self, metadata: SessionMetadata) -> bool:
+        for flag_name, flag_value in self.flags.items():
+            if not any(
+                flag.name == flag_name and (flag_value is None or flag.value == flag_value)
+                for flag in metadata.flags
+            ):
+                return False
+        return True
+
+    def matches_request_line(self, request_line: RequestLine) -> bool:
+        if self.methods is None:
+            return True
+        return request_line.method.upper() in {m.upper() for m in self.methods}
+
+    def matches_status_line(self, status_line: StatusLine) -> bool:
+        if self.status_codes is None:
+            return True
+        return status_line.status_code in self.status_codes
\ No newline at end of file
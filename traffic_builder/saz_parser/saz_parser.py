@@ -2,12 +2,14 @@ import zipfile
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, Optional
 
 from traffic_builder.saz_parser.models import (
     SazArchive, SazSession, SessionMetadata, SessionTimers,
-    PipeInfo, SessionFlag, Request, Response, RequestLine,
-    StatusLine, Header
+    PipeInfo, SessionFlag, SessionFilter, Request, Response
+)
+from traffic_builder.saz_parser.http_message import (
+    parse_request, parse_response, parse_request_line, parse_status_line
 )
 
 
@@ -65,120 +67,67 @@ def _parse_metadata(xml_content: str) -> SessionMetadata:
     )
 
 
-def _parse_http_headers(lines: list[str]) -> list[Header]:
-    headers = []
-    for line in lines:
-        if ':' in line:
-            name, value = line.split(':', 1)
-            headers.append(Header(name=name.strip(), value=value.strip()))
-    return headers
-
-
 def _parse_request(content: bytes) -> Request:
-    text = content.decode('utf-8', errors='ignore')
-    lines = text.split('\n')
-    
-    request_line_parts = lines[0].strip().split(' ', 2)
-    request_line = RequestLine(
-        method=request_line_parts[0],
-        url=request_line_parts[1],
-        http_version=request_line_parts[2] if len(request_line_parts) > 2 else 'HTTP/1.1'
-    )
-    
-    header_end = 0
-    for i, line in enumerate(lines[1:], 1):
-        if line.strip() == '':
-            header_end = i
-            break
-    
-    headers = _parse_http_headers(lines[1:header_end])
-    
-    body = b''
-    if header_end < len(lines) - 1:
-        body_text = '\n'.join(lines[header_end + 1:])
-        body = body_text.encode('utf-8')
-    
-    return Request(
-        request_line=request_line,
-        headers=headers,
-        body=body
-    )
+    return parse_request(content)
 
 
 def _parse_response(content: bytes) -> Response:
-    text = content.decode('utf-8', errors='ignore')
-    lines = text.split('\n')
-    
-    status_line_parts = lines[0].strip().split(' ', 2)
-    status_line = StatusLine(
-        http_version=status_line_parts[0],
-        status_code=int(status_line_parts[1]),
-        status_text=status_line_parts[2] if len(status_line_parts) > 2 else ''
-    )
-    
-    header_end = 0
-    for i, line in enumerate(lines[1:], 1):
-        if line.strip() == '':
-            header_end = i
-            break
-    
-    headers = _parse_http_headers(lines[1:header_end])
-    
-    body = b''
-    if header_end < len(lines) - 1:
-        body_text = '\n'.join(lines[header_end + 1:])
-        body = body_text.encode('utf-8')
-    
-    return Response(
-        status_line=status_line,
-        headers=headers,
-        body=body
-    )
+    return parse_response(content)
 
 
-def parse_saz(filepath: str | Path) -> SazArchive:
-    archive = SazArchive()
-    
+def _list_session_numbers(file_list: list[str]) -> list[str]:
+    session_numbers = set()
+    for name in file_list:
+        if name.startswith('raw/') and '_m.xml' in name:
+            num = name.split('/')[-1].split('_')[0]
+            session_numbers.add(num)
+    return sorted(session_numbers)
+
+
+def _read_start_line(zf: zipfile.ZipFile, name: str) -> str:
+    with zf.open(name) as f:
+        return f.readline().decode('utf-8', errors='ignore')
+
+
+def iter_saz(
+    filepath: str | Path,
+    filter: Optional[SessionFilter] = None
+) -> Iterator[SazSession]:
     with zipfile.ZipFile(filepath, 'r') as zf:
-        file_list = zf.namelist()
-        
-        session_numbers = set()
-        for name in file_list:
-            if name.startswith('raw/') and '_m.xml' in name:
-                num = name.split('/')[-1].split('_')[0]
-                session_numbers.add(num)
+        file_list = set(zf.namelist())
         
-        for num in sorted(session_numbers):
+        for num in _list_session_numbers(file_list):
             metadata_file = f'raw/{num}_m.xml'
             request_file = f'raw/{num}_c.txt'
             response_file = f'raw/{num}_s.txt'
             
-            metadata = None
-            request = None
-            response = None
-            
-            if metadata_file in file_list:
-                xml_content = zf.read(metadata_file).decode('utf-8')
-                metadata = _parse_metadata(xml_content)
+            if request_file not in file_list or response_file not in file_list:
+                continue
             
-            if request_file in file_list:
-                request_content = zf.read(request_file)
-                request = _parse_request(request_content)
+            xml_content = zf.read(metadata_file).decode('utf-8')
+            metadata = _parse_metadata(xml_content)
             
-            if response_file in file_list:
-                response_content = zf.read(response_file)
-                response = _parse_response(response_content)
+            if filter is not None:
+                if not filter.matches_metadata(metadata):
+                    continue
+                # Start lines are read only when the filter looks at them.
+                if filter.methods is not None and \
+                        not filter.matches_request_line(parse_request_line(_read_start_line(zf, request_file))):
+                    continue
+                if filter.status_codes is not None and \
+                        not filter.matches_status_line(parse_status_line(_read_start_line(zf, response_file))):
+                    continue
             
-            if metadata and request and response:
-                session = SazSession(
-                    session_id=metadata.sid,
-                    metadata=metadata,
-                    request=request,
-                    response=response
-                )
-                archive.sessions.append(session)
-    
-    return archive
+            yield SazSession(
+                session_id=metadata.sid,
+                metadata=metadata,
+                request=_parse_request(zf.read(request_file)),
+                response=_parse_response(zf.read(response_file))
+            )
+
+
+def parse_saz(filepath: str | Path, filter: Optional[SessionFilter] = None) -> SazArchive:
+    return SazArchive(sessions=list(iter_saz(filepath, filter)))
 
 
 def get_sessions(archive: SazArchive) -> list[SazSession]:
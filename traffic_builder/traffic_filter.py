@@ -0,0 +1,136 @@
+"""
+Pre-analysis traffic filter: drops static resources, unwanted hosts and exact
+duplicate requests before HAR entries reach TrafficExtractor/TrafficCorrelator
+or JMX injection.
+
+The filter returns a new HarFile, so entry indexes in a later AnalysisReport
+refer to the filtered capture; `FilterReport.source_indexes` maps them back.
+"""
+import hashlib
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from posixpath import splitext
+from typing import Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+from traffic_builder.har_parsers.pydantic_models import Entry, HarFile
+
+
+STATIC_MIME_TYPES = [
+    "image/", "font/", "audio/", "video/",
+    "text/css", "text/javascript", "application/javascript", "application/x-javascript",
+    "application/font-woff", "application/vnd.ms-fontobject",
+]
+
+STATIC_EXTENSIONS = [
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp", ".bmp",
+    ".css", ".js", ".map",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot",
+    ".mp4", ".webm", ".mp3", ".wav",
+]
+
+REASON_MIME_TYPE = "mime_type"
+REASON_EXTENSION = "extension"
+REASON_HOST = "host"
+REASON_DUPLICATE = "duplicate"
+
+
+@dataclass
+class TrafficFilter:
+    """
+    `mime_types` are prefixes of the response Content-Type, `extensions` are
+    matched against the URL path. Host lists accept fnmatch patterns
+    (`*.example.com`); an empty `allow_hosts` allows every host.
+    """
+    mime_types: list[str] = field(default_factory=lambda: list(STATIC_MIME_TYPES))
+    extensions: list[str] = field(default_factory=lambda: list(STATIC_EXTENSIONS))
+    allow_hosts: list[str] = field(default_factory=list)
+    deny_hosts: list[str] = field(default_factory=list)
+    deduplicate: bool = True
+
+    def __post_init__(self):
+        self._mime_types = tuple(m.lower() for m in self.mime_types)
+        self._extensions = frozenset(e.lower() for e in self.extensions)
+
+    def _host_rejected(self, host: str) -> bool:
+        if self.allow_hosts and not any(fnmatch(host, pattern) for pattern in self.allow_hosts):
+            return True
+        return any(fnmatch(host, pattern) for pattern in self.deny_hosts)
+
+    def rejection_reason(self, entry: Entry) -> Optional[str]:
+        content = entry.response.content
+        if content is not None and content.mime_type:
+            mime_type = content.mime_type.split(";", 1)[0].strip().lower()
+            if mime_type.startswith(self._mime_types):
+                return REASON_MIME_TYPE
+
+        parts = urlsplit(entry.request.url)
+        if splitext(parts.path)[1].lower() in self._extensions:
+            return REASON_EXTENSION
+        if self._host_rejected((parts.hostname or "").lower()):
+            return REASON_HOST
+        return None
+
+
+@dataclass
+class FilterReport:
+    total: int = 0
+    removed: dict[str, int] = field(default_factory=dict)
+    source_indexes: list[int] = field(default_factory=list)
+
+    @property
+    def kept(self) -> int:
+        return len(self.source_indexes)
+
+    @property
+    def removed_total(self) -> int:
+        return sum(self.removed.values())
+
+    def to_str(self) -> str:
+        reasons = ", ".join(f"{reason}={count}" for reason, count in sorted(self.removed.items()))
+        return f"Traffic filter: kept {self.kept} of {self.total} entries, removed {self.removed_total} ({reasons or 'none'})"
+
+
+def request_fingerprint(entry: Entry) -> bytes:
+    request = entry.request
+    body = request.post_data.text if request.post_data else ""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (request.method.upper(), request.url, body):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.digest()
+
+
+def iter_filtered_entries(
+    entries: Iterable[Entry],
+    traffic_filter: Optional[TrafficFilter] = None,
+    report: Optional[FilterReport] = None
+) -> Iterator[Entry]:
+    """Streaming filter; counts are accumulated into `report` as entries pass."""
+    traffic_filter = traffic_filter or TrafficFilter()
+    report = report if report is not None else FilterReport()
+    seen: set[bytes] = set()
+
+    for index, entry in enumerate(entries):
+        report.total += 1
+        reason = traffic_filter.rejection_reason(entry)
+
+        if reason is None and traffic_filter.deduplicate:
+            fingerprint = request_fingerprint(entry)
+            if fingerprint in seen:
+                reason = REASON_DUPLICATE
+            else:
+                seen.add(fingerprint)
+
+        if reason is not None:
+            report.removed[reason] = report.removed.get(reason, 0) + 1
+            continue
+
+        report.source_indexes.append(index)
+        yield entry
+
+
+def filter_har(har: HarFile, traffic_filter: Optional[TrafficFilter] = None) -> tuple[HarFile, FilterReport]:
+    report = FilterReport()
+    entries = list(iter_filtered_entries(har.log.entries, traffic_filter, report))
+    return HarFile(log=har.log.model_copy(update={"entries": entries})), report